@@ -0,0 +1,91 @@
+"""
+在线热备份对写入的影响
+
+在临时数据库中填充约 --size-mb 的数据，一个线程通过写线程（data_writer）持续写入，
+分别测量以下阶段的写入延迟：
+    idle:   没有备份；
+    stepped: data_backup.backup 分步备份（PAGES_PER_STEP 页一步）；
+    single: 一步完成的备份（pages=-1）。
+同时输出备份本身的耗时、步数、重来次数和单步持有源库锁的最长时间。
+
+用法:
+    python -m benchmark.bench_backup --size-mb 50 --rate 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from my_model.db_sqlite import data_backup, data_connect, data_writer
+
+
+def fill(database_path, size_mb: int):
+    with data_connect.transaction(database_path) as conn:
+        conn.execute("CREATE TABLE bench_fill (id INTEGER PRIMARY KEY, payload TEXT)")
+        conn.execute("CREATE TABLE bench_write (id INTEGER PRIMARY KEY, value INTEGER)")
+        conn.executemany("INSERT INTO bench_fill (payload) VALUES (?)",
+                         (("x" * 1000,) for _ in range(size_mb * 1000)))
+
+
+def measure(database_path, rate: float, action) -> dict:
+    """在 action 执行期间以 rate 次/秒写入，返回写入延迟统计和 action 的结果"""
+    latencies = []
+    done = threading.Event()
+
+    def writer():
+        while not done.is_set():
+            started = time.perf_counter()
+            data_writer.run(database_path, lambda conn: conn.execute("INSERT INTO bench_write (value) VALUES (1)"))
+            latencies.append(time.perf_counter() - started)
+            time.sleep(1 / rate)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    time.sleep(0.2)
+    result = action()
+    done.set()
+    thread.join()
+
+    latencies.sort()
+    return {
+        "writes": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "result": result,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在线热备份对写入的影响")
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=200, help="每秒写入次数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "bench.db")
+        backup_dir = os.path.join(directory, "backups")
+        fill(database_path, args.size_mb)
+
+        phases = {
+            "idle": lambda: time.sleep(1),
+            "stepped": lambda: data_backup.backup(database_path, backup_dir),
+            "single": lambda: data_backup.backup(database_path, backup_dir, pages=-1),
+        }
+        for name, action in phases.items():
+            stats = measure(database_path, args.rate, action)
+            print(f"{name:>8}: 写入 {stats['writes']:>5} 次  p50 {stats['p50_ms']:6.2f} ms  "
+                  f"p99 {stats['p99_ms']:6.2f} ms  最长 {stats['max_ms']:7.2f} ms")
+            result = stats["result"]
+            if result:
+                print(f"          备份 {result['size'] / 1e6:.1f} MB 耗时 {result['seconds']:.2f} 秒，"
+                      f"{result['steps']} 步，重来 {result['restarts']} 次，一步完成 {result['single_step']}，"
+                      f"单步最长 {result['max_step_ms']:.1f} ms")
+        data_writer.stop_all()
+        data_connect.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+登录密码校验吞吐量基准
+
+在不同并发数下模拟登录高峰：每个并发线程代表一个 Streamlit 脚本线程，
+调用 credential.verify_password(...).result() 等待校验结果，
+统计每秒登录数和单次登录延迟。
+
+用法:
+    python -m benchmark.bench_credential --logins 200 --concurrency 1 4 16 64
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from my_model.all_user import credential
+
+
+def run(logins: int, concurrency: int, stored: str) -> dict:
+    def login(_):
+        start = time.perf_counter()
+        assert credential.verify_password("12345", stored).result()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as sessions:
+        latencies = sorted(sessions.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "logins": logins,
+        "logins_per_second": logins / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="登录密码校验吞吐量基准")
+    parser.add_argument("--logins", type=int, default=200, help="每个并发级别的登录次数")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    stored = credential.make_hash("12345")
+    print(f"哈希线程池大小: {credential.MAX_WORKERS}")
+    for concurrency in args.concurrency:
+        result = run(args.logins, concurrency, stored)
+        print(f"并发 {result['concurrency']:>3}: {result['logins_per_second']:8.1f} 次/秒  "
+              f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
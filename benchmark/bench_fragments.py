@@ -0,0 +1,242 @@
+"""
+首页标签页 fragment 化的收益：一次控件交互触发整页重跑与只重跑所在标签页的对比
+
+首页的四个标签页（登录、注册、号码查询、修改信息）各自是一个 st.fragment。浏览器中操作某个
+标签页的控件时，Streamlit 只重跑该 fragment；改为 fragment 之前，每次交互都会重跑整个首页
+（侧边栏、四个标签页和首页图片）。
+
+AppTest 的 run() 总是重跑整个脚本，这里对同一组交互分别测量：
+    full      整页重跑（即 fragment 化之前每次交互的开销）；
+    fragment  以该标签页的 fragment id 发起的局部重跑（与浏览器中的行为一致）。
+同时记录两种重跑渲染的元素个数，并开启查询追踪（data_trace）记录各执行了多少条 SQL。
+交互均不写库：号码查询输入姓名、注册时两次密码不一致、登录密码错误、修改信息时姓名为空。
+
+AppTest 没有发起 fragment 重跑的公开接口，fragment_scope 和 fragment_ids 依赖 AppTest 的内部实现，
+只在 STREAMLIT_VERSIONS 范围内运行。
+
+用法:
+    python -m benchmark.bench_fragments --scale small --runs 20
+"""
+import argparse
+import contextlib
+import functools
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from benchmark import synthetic
+from benchmark.pages import LINKED, ROOT
+
+RUNS = 20
+TIMEOUT = 120
+# fragment_scope 和 fragment_ids 验证过的 Streamlit 版本范围（主版本, 次版本），两端都包含；
+# 1.64 之前的 AppTest 每次运行都新建 fragment 存储，无法发起 fragment 重跑
+STREAMLIT_VERSIONS = ((1, 64), (1, 65))
+
+
+def check_streamlit():
+    """
+    检查当前 Streamlit 版本是否在 STREAMLIT_VERSIONS 范围内
+
+    异常:
+        RuntimeError: 版本不在范围内，fragment_scope 和 fragment_ids 使用的内部实现可能已经改变
+    """
+    import streamlit
+
+    version = tuple(int(part) for part in streamlit.__version__.split(".")[:2])
+    low, high = STREAMLIT_VERSIONS
+    if not low <= version <= high:
+        raise RuntimeError(f"fragment 重跑依赖 AppTest 内部实现，只支持 Streamlit {'.'.join(map(str, low))} 至 "
+                           f"{'.'.join(map(str, high))}，当前为 {streamlit.__version__}")
+
+
+@contextlib.contextmanager
+def fragment_scope(fragment_id):
+    """让 AppTest 的下一次 run() 只重跑 fragment_id（与浏览器中 fragment 内控件触发的重跑相同）"""
+    from streamlit.runtime.scriptrunner import RerunData
+    from streamlit.testing.v1 import local_script_runner
+
+    local_script_runner.RerunData = functools.partial(RerunData, fragment_id_queue=[fragment_id])
+    try:
+        yield
+    finally:
+        local_script_runner.RerunData = RerunData
+
+
+def fragment_ids(at) -> dict:
+    """首页各标签页函数名 -> fragment id（首页完整运行一次后才有）"""
+    ids = {}
+    for fragment_id, fragment in at._fragment_storage._fragments.items():
+        for cell in fragment.__closure__ or ():
+            name = getattr(cell.cell_contents, "__name__", None)
+            if name in ("login", "enroll", "find", "change"):
+                ids[name] = fragment_id
+    return ids
+
+
+def _text_input(at, label, key=None):
+    return next(widget for widget in at.text_input if widget.label == label and widget.key == key)
+
+
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def interactions(staff) -> dict:
+    """用例名 -> (所在标签页, 设置控件的函数 prepare(at, i))"""
+    number, name = staff
+
+    def find(at, i):
+        _text_input(at, "请输入您的姓名：").input(name if i % 2 else name[:2])
+
+    def enroll(at, i):
+        at.text_input(key="name").input(f"基准{i}")
+        at.number_input(key="number").set_value(number)
+        at.text_input(key="password").input("1")
+        at.text_input(key="confirm_password").input("2")
+        _button(at, "注册").click()
+
+    def login(at, i):
+        _text_input(at, "员工号").input(str(number))
+        _text_input(at, "密码").input("2")
+        _button(at, "登录").click()
+
+    def change(at, i):
+        at.text_input(key="name1").input("")
+        _button(at, "确认修改").click()
+
+    return {
+        "号码查询.输入姓名": ("find", find),
+        "用户注册.密码不一致": ("enroll", enroll),
+        "用户登录.密码错误": ("login", login),
+        "修改信息.姓名为空": ("change", change),
+    }
+
+
+def element_count(at) -> int:
+    """上一次运行渲染的元素个数（主区域和侧边栏，不含容器本身）"""
+    from streamlit.testing.v1.element_tree import Block
+
+    return sum(not isinstance(node, Block) for root in (at.main, at.sidebar) for node in root)
+
+
+def _timed(at, prepare, runs, scope=None) -> list:
+    timings = []
+    for i in range(runs):
+        prepare(at, i)
+        with scope() if scope else contextlib.nullcontext():
+            started = time.perf_counter()
+            at.run()
+            timings.append((time.perf_counter() - started) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return timings
+
+
+def _queries(at, prepare, scope=None) -> int:
+    """开启查询追踪执行一次，返回本次重跑执行的 SQL 条数"""
+    from my_model.db_sqlite import data_trace
+
+    data_trace.clear()
+    data_trace.enable()
+    try:
+        prepare(at, 0)
+        with scope() if scope else contextlib.nullcontext():
+            at.run()
+    finally:
+        data_trace.disable()
+    return sum(span.summary()["queries"] for span in data_trace.spans())
+
+
+def measure(session, staff, runs: int = RUNS) -> dict:
+    """
+    返回 {用例名: {"tab", "full_ms", "fragment_ms", "speedup", "full_queries", "fragment_queries",
+                   "full_elements", "fragment_elements"}}
+    """
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for case, (tab, prepare) in interactions(staff).items():
+        at = AppTest.from_file(os.path.abspath("main.py"), default_timeout=TIMEOUT)
+        if tab == "change":
+            at.session_state["my_info"] = session
+        at.run()
+        scope = functools.partial(fragment_scope, fragment_ids(at)[tab])
+
+        full = _timed(at, prepare, runs)
+        full_elements = element_count(at)
+        full_queries = _queries(at, prepare)
+        at.run()  # 局部重跑之前先整页运行一次，保证元素树完整
+        fragment = _timed(at, prepare, runs, scope)
+        fragment_elements = element_count(at)
+        fragment_queries = _queries(at, prepare, scope)
+        results[case] = {
+            "tab": tab,
+            "full_ms": statistics.median(full),
+            "fragment_ms": statistics.median(fragment),
+            "speedup": statistics.median(full) / statistics.median(fragment),
+            "full_queries": full_queries,
+            "fragment_queries": fragment_queries,
+            "full_elements": full_elements,
+            "fragment_elements": fragment_elements,
+        }
+    return results
+
+
+def run(scale: str = "small", seed: int = 0, runs: int = RUNS) -> dict:
+    check_streamlit()  # 同时完成 streamlit 的导入，日志过滤要在 streamlit 配置好日志之后添加
+
+    from my_model.all_user.session import StaffSession
+    from my_model.db_sqlite import data_connect, data_staff, data_writer
+
+    # 在 Streamlit 运行时之外访问会话状态时每次都会输出警告，测试中屏蔽它们
+    for name in ("streamlit.runtime.scriptrunner_utils.script_run_context",
+                 "streamlit.runtime.state.session_state_proxy"):
+        logging.getLogger(name).addFilter(lambda record: record.levelno >= logging.ERROR)
+
+    path = synthetic.dataset(scale, seed)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        for name in LINKED:
+            os.symlink(os.path.join(ROOT, name), os.path.join(directory, name))
+        os.rename(synthetic.working_copy(path, directory), os.path.join(directory, "doctor_info.db"))
+        os.chdir(directory)
+        try:
+            with data_connect.connection("doctor_info.db") as conn:
+                staff = conn.execute(
+                    "SELECT number, name FROM doctor_info WHERE number BETWEEN 10000 AND 99999 ORDER BY id LIMIT 1"
+                ).fetchone()
+            session = StaffSession.from_row(data_staff.directory("doctor_info.db").by_number(staff[0]))
+            return measure(session, staff, runs)
+        finally:
+            data_writer.stop_all()
+            data_connect.close_all()
+            os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="首页标签页整页重跑与 fragment 局部重跑对比")
+    parser.add_argument("--scale", choices=synthetic.SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--output", help="结果 JSON 文件路径，不指定时只打印")
+    args = parser.parse_args()
+
+    results = run(args.scale, args.seed, args.runs)
+    print(f"{'用例':<16}{'整页 ms':>10}{'局部 ms':>10}{'倍数':>8}{'整页 SQL':>10}{'局部 SQL':>10}"
+          f"{'整页元素':>10}{'局部元素':>10}")
+    for case, result in results.items():
+        print(f"{case:<16}{result['full_ms']:>10.1f}{result['fragment_ms']:>10.1f}{result['speedup']:>8.1f}"
+              f"{result['full_queries']:>10}{result['fragment_queries']:>10}"
+              f"{result['full_elements']:>10}{result['fragment_elements']:>10}")
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+员工表与会话信息的内存占用测量
+
+    1. 员工表：通用 object/int64 列的 DataFrame 与 data_staff.compact 后的表示对比；
+    2. 每个会话：登录后保存的 pandas.Series 行与 StaffSession 对比（tracemalloc）；
+    3. 进程 RSS：在子进程中模拟 N 个并发会话各自保存登录信息后的常驻内存。
+
+数据库会先复制到临时目录，不修改原文件。
+
+用法:
+    python -m benchmark.bench_memory --database doctor_info.db --sessions 500
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RSS_SCRIPT = """
+import sys
+from my_model.db_sqlite import data_staff
+from my_model.all_user.session import StaffSession
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+database_path, mode, sessions = sys.argv[1], sys.argv[2], int(sys.argv[3])
+staff = data_staff.directory(database_path)
+numbers = staff.frame()["number"].tolist()
+before = rss_kb()
+session_states = []
+for i in range(sessions):
+    row = staff.by_number(numbers[i % len(numbers)])
+    session_states.append({"my_info": row if mode == "series" else StaffSession.from_row(row)})
+print(before, rss_kb())
+"""
+
+
+def table_memory(database_path) -> dict:
+    from my_model.db_sqlite import data_connect, data_staff
+    with data_connect.connection(database_path) as conn:
+        raw = pd.read_sql_query("SELECT * FROM doctor_info ORDER BY id", conn)
+    compact = data_staff.compact(raw.copy())
+    return {
+        "rows": len(raw),
+        "generic_bytes": int(raw.memory_usage(deep=True).sum()),
+        "compact_bytes": int(compact.memory_usage(deep=True).sum()),
+        "compact_dtypes": {column: str(dtype) for column, dtype in compact.dtypes.items()},
+    }
+
+
+def session_memory(database_path, sessions: int) -> dict:
+    from my_model.db_sqlite import data_staff
+    from my_model.all_user.session import StaffSession
+
+    staff = data_staff.directory(database_path)
+    numbers = staff.frame()["number"].tolist()
+    rows = [staff.by_number(numbers[i % len(numbers)]) for i in range(sessions)]
+
+    result = {}
+    for mode, make in (("series", lambda row: row.copy()), ("dataclass", StaffSession.from_row)):
+        tracemalloc.start()
+        kept = [make(row) for row in rows]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result[f"{mode}_bytes_per_session"] = size / len(kept)
+    return result
+
+
+def process_rss(database_path, sessions: int) -> dict:
+    result = {}
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    for mode in ("series", "dataclass"):
+        output = subprocess.run([sys.executable, "-c", RSS_SCRIPT, database_path, mode, str(sessions)],
+                                env=env, capture_output=True, text=True, check=True).stdout
+        before, after = map(int, output.split())
+        result[f"{mode}_rss_mb"] = after / 1024
+        result[f"{mode}_sessions_delta_mb"] = (after - before) / 1024
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="员工表与会话信息的内存占用测量")
+    parser.add_argument("--database", default=os.path.join(ROOT, "doctor_info.db"))
+    parser.add_argument("--sessions", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "doctor_info.db")
+        shutil.copyfile(args.database, database_path)
+        result = {
+            "staff_table": table_memory(database_path),
+            "per_session": session_memory(database_path, args.sessions),
+            "process": process_rss(database_path, args.sessions),
+        }
+    print(json.dumps(result, ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
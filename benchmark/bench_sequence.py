@@ -0,0 +1,75 @@
+"""
+index_id 流水号生成吞吐量与正确性基准
+
+多个写线程并发插入 doctor_forms，对比：
+    sequence: data_insert.insert_form，在插入事务中用 sequences 计数器原子分配流水号；
+    legacy:   读取最后一行的 index_id 加一后再插入（旧的 index_main 做法）。
+统计每秒插入数以及重复的流水号个数。数据库为临时文件，不影响 doctor_info.db。
+
+用法:
+    python -m benchmark.bench_sequence --writers 1 8 32 --inserts 50
+"""
+import argparse
+import datetime
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from my_model.db_sqlite import data_connect, data_get, data_insert
+
+FORM = {"patient_name": "测试", "department": "外科一病区", "doctor": "测试医生", "risk_level": "三级手术"}
+
+
+def insert_sequence(database_path):
+    return data_insert.insert_form(database_path, FORM)[1]
+
+
+def insert_legacy(database_path):
+    date_str = datetime.date.today().strftime("%Y%m%d")
+    last = data_get.get_last_row(database_path, "doctor_forms")
+    if last is not None and str(last["index_id"][0]).startswith(date_str):
+        index_id = str(int(last["index_id"][0]) + 1)
+    else:
+        index_id = date_str + "001"
+    data_insert.insert_into_table(database_path, "doctor_forms", {**FORM, "index_id": index_id})
+    return index_id
+
+
+def run(method, writers: int, inserts: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "bench.db")
+        insert = insert_sequence if method == "sequence" else insert_legacy
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            index_ids = list(pool.map(lambda _: insert(database_path), range(writers * inserts)))
+        elapsed = time.perf_counter() - start
+        data_connect.close_all()
+
+    duplicates = sum(count - 1 for count in Counter(index_ids).values())
+    return {
+        "method": method,
+        "writers": writers,
+        "inserts": len(index_ids),
+        "inserts_per_second": len(index_ids) / elapsed,
+        "duplicates": duplicates,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="index_id 流水号生成基准")
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--inserts", type=int, default=50, help="每个写线程的插入次数")
+    args = parser.parse_args()
+
+    for writers in args.writers:
+        for method in ("sequence", "legacy"):
+            result = run(method, writers, args.inserts)
+            print(f"{result['method']:>8}  写线程 {writers:>3}: {result['inserts_per_second']:8.1f} 次/秒  "
+                  f"重复流水号 {result['duplicates']}")
+
+
+if __name__ == "__main__":
+    main()
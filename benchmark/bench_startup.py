@@ -0,0 +1,80 @@
+"""
+首页启动开销剖析：导入耗时与首次渲染耗时
+
+每项测量都在新的子进程中进行，以反映冷启动的真实开销：
+    1. python -X importtime 导入 main.py 的累计耗时，以及是否提前导入了 pandas / PIL；
+    2. 用 streamlit.testing 的 AppTest 执行首页脚本，记录首次渲染和再次重跑的耗时。
+
+用法（在仓库根目录执行）:
+    python -m benchmark.bench_startup --output benchmark/results/startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_PAINT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file("main.py", default_timeout=60).run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+print(json.dumps({
+    "first_paint_ms": first * 1000,
+    "rerun_ms": rerun * 1000,
+    "pandas_loaded": "pandas" in sys.modules,
+    "pil_loaded": "PIL.Image" in sys.modules,
+    "exception": bool(at.exception),
+}))
+"""
+
+
+def _run(args) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def import_profile() -> dict:
+    """解析 -X importtime 输出：import time: self [us] | cumulative | imported package"""
+    stderr = _run(["-X", "importtime", "-c", "import main"]).stderr
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return {
+        "import_main_ms": cumulative.get("main", 0) / 1000,
+        "import_streamlit_ms": cumulative.get("streamlit", 0) / 1000,
+        "pandas_imported": "pandas" in cumulative,
+        "pil_imported": "PIL" in cumulative,
+    }
+
+
+def first_paint() -> dict:
+    return json.loads(_run(["-c", FIRST_PAINT]).stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="首页启动开销剖析")
+    parser.add_argument("--output", help="结果 JSON 文件路径，不指定时只打印")
+    args = parser.parse_args()
+
+    result = {"imports": import_profile(), "first_paint": first_paint()}
+    text = json.dumps(result, ensure_ascii=False, indent=4)
+    print(text)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+并发会话压力测试：模拟多名医护人员同时使用同一个数据库
+
+每个虚拟用户在自己的子进程中用 streamlit.testing 的 AppTest 依次执行脚本化的操作：
+    home    打开首页
+    find    号码查询（完整姓名或姓名前两个字）
+    login   登录（合成数据的密码均为 1）
+    enroll  注册新员工（员工号已用完时走“此账号已注册”分支）
+    change  提交修改信息表单（页面提交成功后固定等待 3 秒，该等待不计入耗时，见 CHANGE_SLEEP）
+    page99  以管理员身份打开系统维护页面并重跑一次（之后每轮重跑两次）
+整个测试在本机离线完成。
+
+AppTest 每次运行都会重设进程级的 Runtime 单例，同一进程中不能同时运行多个 AppTest，因此每个会话
+使用一个单独的进程，只使用 AppTest 的公开接口。各会话有各自的连接池、写线程和缓存，
+对 SQLite 的并发写入要经过文件锁，比一个 streamlit run 进程内由写线程排队更容易出现锁等待。
+
+按 --sessions 给出的各并发数依次测试，输出每种操作耗时的 p50/p95/p99、吞吐量（操作/秒）、
+失败次数，以及 SQLite 锁错误（页面异常、辅助函数打印的错误和写线程错误中的
+database is locked / busy）。数据库为合成数据集的临时副本。
+
+用法:
+    python -m benchmark.load_test --sessions 1,5,10,20 --iterations 3
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from benchmark import synthetic
+from benchmark.pages import LINKED, ROOT, page_script, script_name
+
+ACTIONS = ("home", "find", "login", "enroll", "change", "page99")
+# 修改信息成功后页面中固定的等待（秒，见 my_page/main.py），从 change 的耗时中扣除
+CHANGE_SLEEP = 3.0
+ITERATIONS = 3
+TIMEOUT = 300
+# 管理员页面在导航中的 URL 路径，及 run() 在临时目录中为其写入的入口脚本
+ADMIN_PAGE = "管理员的系统维护"
+ADMIN_SCRIPT = script_name(ADMIN_PAGE)
+LOCK_MESSAGES = ("database is locked", "database is busy")
+
+
+def percentile(timings, q: float) -> float:
+    """已排序耗时列表的 q 分位数（最近秩）"""
+    return timings[min(int(len(timings) * q), len(timings) - 1)]
+
+
+def is_lock_error(message: str) -> bool:
+    return any(text in message for text in LOCK_MESSAGES)
+
+
+class _Output(io.TextIOBase):
+    """替换 sys.stdout：辅助函数出错时只打印不抛出，这里统计打印出的错误信息"""
+
+    def __init__(self):
+        self.messages = Counter()
+
+    def write(self, text):
+        text = text.strip()
+        if text:
+            self.messages[text[:200]] += 1
+        return len(text)
+
+
+def _quiet():
+    """在 Streamlit 运行时之外访问会话状态时每次都会输出警告，测试中屏蔽它们"""
+    import streamlit  # noqa: F401  日志级别要在 streamlit 配置好日志之后设置
+
+    # AppTest 运行时会重设日志级别，这里用过滤器而不是 setLevel
+    for name in ("streamlit.runtime.scriptrunner_utils.script_run_context",
+                 "streamlit.runtime.state.session_state_proxy"):
+        logging.getLogger(name).addFilter(lambda record: record.levelno >= logging.ERROR)
+
+
+class VirtualUser:
+    """一个虚拟用户（浏览器会话）：首页的操作共用一个 AppTest，会话状态在操作之间保持"""
+
+    def __init__(self, index, staff, admin, numbers, records, rng):
+        self.index = index
+        self.number, self.name = staff
+        self.admin = admin
+        self.numbers = numbers
+        self.records = records
+        self.rng = rng
+        self.reopen()
+
+    def _run(self, action, at, check, pause: float = 0.0):
+        """运行一次并记录耗时；pause 为页面成功时固定等待的秒数，从耗时中扣除"""
+        started = time.perf_counter()
+        try:
+            at.run()
+        except Exception as e:
+            # AppTest 自身的错误（超时、读取上次运行的控件状态失败等），不是页面抛出的异常；
+            # 该会话已无法继续操作，像用户刷新浏览器一样重新打开
+            ms = (time.perf_counter() - started) * 1000
+            self.records.append((action, ms, False, [f"AppTest {type(e).__name__}: {e}"]))
+            self.reopen()
+            return
+        ms = (time.perf_counter() - started) * 1000
+        exceptions = [exception.message for exception in at.exception]
+        ok = not exceptions and check(at)
+        if ok:
+            ms -= pause * 1000
+        self.records.append((action, ms, ok, exceptions))
+
+    def reopen(self):
+        from streamlit.testing.v1 import AppTest
+
+        self.home_app = AppTest.from_file(os.path.abspath("main.py"), default_timeout=TIMEOUT)
+        self.admin_app = None
+        self.opened = False
+
+    @staticmethod
+    def _button(at, label):
+        return next(button for button in at.button if button.label == label)
+
+    @staticmethod
+    def _messages(elements) -> str:
+        return " ".join(str(element.value) for element in elements)
+
+    def home(self):
+        self.opened = True
+        self._run("home", self.home_app, lambda at: len(at.tabs) == 4)
+
+    def find(self):
+        at = self.home_app
+        query = self.name if self.rng.random() < 0.5 else self.name[:2]
+        next(widget for widget in at.text_input if widget.label == "请输入您的姓名：").input(query)
+        self._run("find", at, lambda at: bool(at.info) or bool(at.warning))
+
+    def login(self):
+        at = self.home_app
+        next(widget for widget in at.text_input if widget.label == "员工号").input(str(self.number))
+        next(widget for widget in at.text_input if widget.label == "密码" and widget.key is None).input("1")
+        self._button(at, "登录").click()
+        self._run("login", at, lambda at: "登录成功" in self._messages(at.success))
+
+    def enroll(self):
+        at = self.home_app
+        number = self.numbers.pop() if self.numbers else self.number
+        at.text_input(key="name").input(f"压测{self.index}{number}")
+        at.number_input(key="number").set_value(number)
+        at.text_input(key="password").input("1")
+        at.text_input(key="confirm_password").input("1")
+        self._button(at, "注册").click()
+        self._run("enroll", at, lambda at: bool(at.success) or "已注册" in self._messages(at.warning))
+
+    def change(self):
+        at = self.home_app
+        if "my_info" not in at.session_state:
+            return
+        self._button(at, "确认修改").click()
+        # 修改成功后页面等待 CHANGE_SLEEP 秒再清空会话并重跑，以退出登录且没有报错作为成功
+        self._run("change", at, lambda at: "my_info" not in at.session_state and not at.error, CHANGE_SLEEP)
+
+    def page99(self):
+        from streamlit.testing.v1 import AppTest
+
+        # 管理员页面的入口脚本见 benchmark.pages.page_script，由 run() 预先写入临时目录
+        for _ in range(2):
+            if self.admin_app is None:
+                self.admin_app = AppTest.from_file(os.path.abspath(ADMIN_SCRIPT), default_timeout=TIMEOUT)
+                self.admin_app.session_state["my_info"] = self.admin
+            self._run("page99", self.admin_app, lambda at: not at.warning)
+
+    def loop(self, iterations, actions, think):
+        for _ in range(iterations):
+            for action in actions:
+                try:
+                    if not self.opened and action not in ("home", "page99"):
+                        self.home()
+                    getattr(self, action)()
+                except (StopIteration, KeyError) as e:
+                    # 上一次运行出错时页面上可能没有要操作的控件，记为失败（不计耗时）后继续
+                    self.records.append((action, None, False, [f"找不到控件: {type(e).__name__} {e}"]))
+                if think:
+                    time.sleep(self.rng.uniform(0, 2 * think))
+
+
+def _summarize(records, seconds, output, writer_errors) -> dict:
+    by_action = {}
+    for action, ms, ok, _ in records:
+        stats = by_action.setdefault(action, {"timings": [], "failures": 0})
+        if ms is not None:
+            stats["timings"].append(ms)
+        stats["failures"] += not ok
+    actions = {}
+    for action, stats in by_action.items():
+        timings = sorted(stats["timings"]) or [0.0]
+        actions[action] = {
+            "count": len(stats["timings"]),
+            "p50_ms": percentile(timings, 0.50),
+            "p95_ms": percentile(timings, 0.95),
+            "p99_ms": percentile(timings, 0.99),
+            "max_ms": timings[-1],
+            "failures": stats["failures"],
+        }
+    exceptions = Counter(message[:200] for *_, messages in records for message in messages)
+    lock_errors = (sum(count for message, count in exceptions.items() if is_lock_error(message))
+                   + sum(count for message, count in output.messages.items() if is_lock_error(message))
+                   + sum(count for message, count in writer_errors.items() if is_lock_error(message)))
+    return {
+        "seconds": seconds,
+        "operations": len(records),
+        "throughput": len(records) / seconds if seconds else 0.0,
+        "lock_errors": lock_errors,
+        "exceptions": dict(exceptions.most_common(5)),
+        "printed": dict(output.messages.most_common(5)),
+        "actions": actions,
+    }
+
+
+def _session(directory, index, staff, admin, numbers, iterations, actions, think, seed, barrier, results):
+    """子进程：在 directory 中作为一个虚拟用户运行，所有会话就绪后同时开始，结果放入 results 队列"""
+    from my_model.db_sqlite import data_connect, data_writer
+
+    os.chdir(directory)
+    _quiet()
+    records = []
+    output = _Output()
+    writer_errors = Counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            try:
+                user = VirtualUser(index, staff, admin, numbers, records, random.Random(seed * 1000 + index))
+            except BaseException:
+                # 不让主进程和其他会话一直等待这个会话就绪
+                barrier.abort()
+                raise
+            barrier.wait()
+            user.loop(iterations, actions, think)
+            for stats in data_writer.stats().values():
+                writer_errors.update(stats["errors"])
+    finally:
+        data_writer.stop_all()
+        data_connect.close_all()
+        results.put((records, output.messages, writer_errors))
+
+
+def run_level(directory, sessions, iterations, staff, admin, numbers, actions=ACTIONS, think: float = 0.0,
+              seed: int = 0) -> dict:
+    """
+    sessions 个虚拟用户各在一个子进程中并发执行 iterations 轮操作，返回统计结果
+
+    numbers 为可注册的员工号，依次分给各会话，会话之间不会注册同一个员工号
+    """
+    context = multiprocessing.get_context("spawn")
+    # 子进程导入 streamlit 和创建 AppTest 的时间不计入测试：所有会话就绪后才开始计时
+    barrier = context.Barrier(sessions + 1)
+    queue = context.Queue()
+    rng = random.Random(seed)
+    processes = [context.Process(target=_session, name=f"session-{i}",
+                                 args=(directory, i, rng.choice(staff), admin, numbers[i::sessions], iterations,
+                                       actions, think, seed, barrier, queue))
+                 for i in range(sessions)]
+    for process in processes:
+        process.start()
+    barrier.wait(timeout=TIMEOUT)
+    started = time.perf_counter()
+    records = []
+    output = _Output()
+    writer_errors = Counter()
+    for _ in processes:
+        session_records, messages, errors = queue.get()
+        records += session_records
+        output.messages.update(messages)
+        writer_errors.update(errors)
+    seconds = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    result = _summarize(records, seconds, output, writer_errors)
+    result["sessions"] = sessions
+    return result
+
+
+def run(scale: str = "small", seed: int = 0, levels=(1, 5, 10, 20), iterations: int = ITERATIONS,
+        actions=ACTIONS, think: float = 0.0) -> list:
+    """依次以各并发数运行，返回每个并发数的统计结果"""
+    from my_model.all_user.session import StaffSession
+    from my_model.by_file import page_config
+    from my_model.db_sqlite import data_connect, data_writer
+
+    path = synthetic.dataset(scale, seed)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name in LINKED:
+            os.symlink(os.path.join(ROOT, name), os.path.join(directory, name))
+        database_path = os.path.join(directory, "doctor_info.db")
+        os.rename(synthetic.working_copy(path, directory), database_path)
+        page_script(directory, ADMIN_PAGE)
+        try:
+            with data_connect.connection(database_path) as conn:
+                # 登录只接受 5 位员工号
+                staff = conn.execute(
+                    "SELECT number, name FROM doctor_info WHERE number BETWEEN 10000 AND 99999 ORDER BY id"
+                ).fetchall()
+                used = {row[0] for row in conn.execute("SELECT number FROM doctor_info")}
+            numbers = [number for number in range(10000, 100000) if number not in used]
+            random.Random(seed).shuffle(numbers)
+            admin = StaffSession(id=staff[0][0], name="闫方涛", section="优质服务中心", number=staff[0][0],
+                                 state=(1 << page_config.page_count()) - 1)
+            # 子进程各自打开数据库，主进程的连接在开始前关闭
+            data_connect.close_all()
+            for sessions in levels:
+                # 每个会话每轮最多注册一个员工号，各并发数使用不同的员工号
+                level_numbers, numbers = numbers[:sessions * iterations], numbers[sessions * iterations:]
+                results.append(run_level(directory, sessions, iterations, staff, admin, level_numbers, actions,
+                                         think, seed))
+        finally:
+            data_writer.stop_all()
+            data_connect.close_all()
+    return results
+
+
+def report(results):
+    for result in results:
+        print(f"\n并发 {result['sessions']}：{result['operations']} 次操作，耗时 {result['seconds']:.1f} 秒，"
+              f"吞吐量 {result['throughput']:.1f} 次/秒，SQLite 锁错误 {result['lock_errors']}")
+        print(f"{'操作':<10}{'次数':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'最大 ms':>10}{'失败':>6}")
+        for action, stats in result["actions"].items():
+            print(f"{action:<10}{stats['count']:>6}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}"
+                  f"{stats['p99_ms']:>10.0f}{stats['max_ms']:>10.0f}{stats['failures']:>6}")
+        for title, messages in (("页面异常", result["exceptions"]), ("打印的错误", result["printed"])):
+            for message, count in messages.items():
+                print(f"  {title} x{count}: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并发会话压力测试（AppTest）")
+    parser.add_argument("--scale", choices=synthetic.SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sessions", default="1,5,10,20", help="逗号分隔的并发会话数，依次测试")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS, help="每个会话重复整套操作的轮数")
+    parser.add_argument("--actions", default=",".join(ACTIONS), help=f"逗号分隔，可选 {','.join(ACTIONS)}")
+    parser.add_argument("--think", type=float, default=0.0, help="操作之间的平均思考时间（秒）")
+    parser.add_argument("--output", help="将结果另存为 JSON")
+    args = parser.parse_args()
+
+    actions = tuple(action for action in args.actions.split(",") if action)
+    unknown = set(actions) - set(ACTIONS)
+    if unknown:
+        parser.error(f"未知操作: {', '.join(sorted(unknown))}")
+    levels = [int(level) for level in args.sessions.split(",")]
+    results = run(args.scale, args.seed, levels, args.iterations, actions, args.think)
+    report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+        print(f"\n结果已写入 {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
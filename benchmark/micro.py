@@ -0,0 +1,197 @@
+"""
+my_model 辅助函数的微基准
+
+覆盖 my_model/db_sqlite 下的每个辅助模块，以及 base_converter 和 administrator。
+只读的用例直接在数据集上执行；写入类用例在数据集的临时副本上执行，不影响缓存的数据集。
+每个用例至少重复执行 MIN_TIME 秒（且不少于 MIN_RUNS 次），输出中位数、p95 和最小耗时。
+
+用法:
+    python -m benchmark.micro --scale small
+"""
+import argparse
+import datetime
+import io
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from benchmark import synthetic
+
+MIN_TIME = 0.2
+MIN_RUNS = 5
+MAX_RUNS = 10_000
+
+
+def measure(fn, min_time: float = MIN_TIME, min_runs: int = MIN_RUNS, max_runs: int = MAX_RUNS) -> dict:
+    """重复执行 fn，返回耗时统计（毫秒）"""
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < max_runs and (len(timings) < min_runs or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(int(len(timings) * 0.95), len(timings) - 1)],
+        "min_ms": timings[0],
+        "runs": len(timings),
+    }
+
+
+def read_cases(database_path) -> dict:
+    """只读用例：名称 -> 无参函数"""
+    import streamlit as st
+    from my_model.all_user.admin import administrator
+    from my_model.all_user.session import StaffSession
+    from my_model.by_text.advance_transform import base_converter
+    from my_model.db_sqlite import (data_check, data_connect, data_export, data_get, data_import, data_query,
+                                    data_search, data_staff, data_stats)
+
+    with data_connect.connection(database_path) as conn:
+        number, name, section = conn.execute(
+            "SELECT number, name, section FROM doctor_info WHERE state >= 0 ORDER BY id LIMIT 1 OFFSET 100"
+        ).fetchone()
+        department, doctor, day = conn.execute(
+            "SELECT department, doctor, date FROM doctor_forms ORDER BY id LIMIT 1 OFFSET 100"
+        ).fetchone()
+        ids = [row[0] for row in conn.execute("SELECT id FROM doctor_info ORDER BY id LIMIT 500")]
+    staff = data_staff.directory(database_path)
+    staff.frame()
+    _, cursor = data_query.query_forms(database_path)
+
+    roster = io.StringIO()
+    roster.write("员工号,姓名,科室\n")
+    for i in range(1000):
+        roster.write(f"{number if i == 0 else 60000 + i},{name},{section}\n")
+    roster_text = roster.getvalue()
+
+    def dry_run_import():
+        source = io.StringIO(roster_text)
+        source.name = "roster.csv"
+        data_import.import_roster(database_path, source, dry_run=True)
+
+    def borrow():
+        with data_connect.connection(database_path):
+            pass
+
+    def existing_ids():
+        with data_connect.connection(database_path) as conn:
+            data_check.existing_ids(conn, "doctor_info", ids)
+
+    def cold_directory():
+        staff.invalidate()
+        staff.frame()
+
+    # 在 Streamlit 运行时之外读写 st.session_state 时每次都会输出警告，基准中屏蔽它们
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    st.session_state["my_info"] = StaffSession(id=1, name=name, section=section, number=number, state=0b10001)
+
+    return {
+        "data_connect.connection": borrow,
+        "data_get.get_data.doctor_info": lambda: data_get.get_data(database_path, "doctor_info"),
+        "data_get.get_last_row": lambda: data_get.get_last_row(database_path, "doctor_forms"),
+        "data_check.check_existence": lambda: data_check.check_existence(
+            database_path, "doctor_info", {"name": name, "number": number}, match_all=False),
+        "data_check.existing_ids": existing_ids,
+        "data_staff.reload": cold_directory,
+        "data_staff.by_number": lambda: staff.by_number(number),
+        "data_staff.by_name": lambda: staff.by_name(name),
+        "data_staff.search.fuzzy": lambda: staff.search(name[:-1] + "某"),
+        "data_staff.search.initials": lambda: staff.search("zw"),
+        "data_query.query_forms.first_page": lambda: data_query.query_forms(database_path),
+        "data_query.query_forms.next_page": lambda: data_query.query_forms(database_path, after=cursor),
+        "data_query.query_forms.filtered": lambda: data_query.query_forms(
+            database_path, department=department, date_from=day),
+        "data_query.distinct_values": lambda: data_query.distinct_values(database_path, "department"),
+        "data_search.search_forms.trigram": lambda: data_search.search_forms(database_path, "股骨粗隆间"),
+        "data_search.search_forms.short": lambda: data_search.search_forms(database_path, "贫血"),
+        "data_search.search_forms.short.miss": lambda: data_search.search_forms(database_path, "癫痫"),
+        "data_stats.staff_summary": lambda: data_stats.staff_summary(database_path),
+        "data_stats.daily_counts": lambda: data_stats.daily_counts(database_path, "forms_day", 30, today=datetime.date.fromisoformat(day)),
+        "data_export.stream_csv.department": lambda: sum(map(len, data_export.stream_csv(
+            database_path, "doctor_forms", department=department, doctor=doctor))),
+        "data_import.dry_run_1000": dry_run_import,
+        "advance_transform.base_converter": lambda: base_converter("10001", 2, 10, 0),
+        "advance_transform.base_converter.padded": lambda: base_converter("17", 10, 2),
+        "admin.administrator": lambda: administrator(1, 2),
+    }
+
+
+def write_cases(database_path) -> dict:
+    """写入类用例（在副本上执行）：名称 -> 无参函数"""
+    from my_model.db_sqlite import (data_backup, data_connect, data_delete, data_insert, data_sequence,
+                                    data_update, data_writer)
+
+    with data_connect.connection(database_path) as conn:
+        ids = [row[0] for row in conn.execute("SELECT id FROM doctor_forms ORDER BY id LIMIT 100")]
+    model = {"department": "基准测试", "id_doc": "基准", "final_opinion": "基准"}
+    form = {"patient_name": "基准", "department": "基准测试", "doctor": "基准", "risk_level": "三级手术",
+            "date": "2026-01-01"}
+    backup_dir = os.path.join(os.path.dirname(database_path), "backups")
+
+    def next_value():
+        with data_connect.transaction(database_path) as conn:
+            data_sequence.next_value(conn, "benchmark", "")
+
+    def insert_then_delete():
+        data_delete.delete_data(database_path, "doctor_model", data_insert.insert_into_table(
+            database_path, "doctor_model", model))
+
+    def insert_then_delete_many():
+        row_ids = [data_insert.insert_into_table(database_path, "doctor_model", model) for _ in range(10)]
+        data_delete.delete_many(database_path, "doctor_model", row_ids)
+
+    def backup():
+        data_backup.backup(database_path, backup_dir)
+        data_backup.rotate(database_path, backup_dir, keep=1)
+
+    return {
+        "data_writer.run.noop": lambda: data_writer.run(database_path, lambda conn: None),
+        "data_sequence.next_value": next_value,
+        "data_insert.insert_into_table": lambda: data_insert.insert_into_table(database_path, "doctor_model", model),
+        "data_insert.insert_form": lambda: data_insert.insert_form(database_path, form),
+        "data_update.smart_update_record_by_id": lambda: data_update.smart_update_record_by_id(
+            database_path, "doctor_forms", ids[0], {"style": "已处理"}),
+        "data_update.update_many.100": lambda: data_update.update_many(
+            database_path, "doctor_forms", ids, {"style": "已处理"}),
+        "data_delete.delete_data": insert_then_delete,
+        "data_delete.delete_many.10": insert_then_delete_many,
+        "data_backup.backup": backup,
+    }
+
+
+def run(scale: str = "small", seed: int = 0, only: str = None) -> dict:
+    """执行所有微基准，返回 {用例名: 耗时统计}"""
+    from my_model.db_sqlite import data_connect, data_writer
+
+    path = synthetic.dataset(scale, seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        # 只读用例同样使用副本：连接池首次连接时会执行迁移，缓存的数据集保持不变
+        database_path = synthetic.working_copy(path, directory)
+        for cases in (read_cases(database_path), write_cases(database_path)):
+            for name, fn in cases.items():
+                if only and only not in name:
+                    continue
+                # 备份等慢操作只重复少量次数
+                results[name] = measure(fn, min_runs=3 if "backup" in name else MIN_RUNS)
+        data_writer.stop_all()
+        data_connect.close_all()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="my_model 辅助函数微基准")
+    parser.add_argument("--scale", choices=synthetic.SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", help="只运行名称包含该字符串的用例")
+    args = parser.parse_args()
+    print(json.dumps(run(args.scale, args.seed, args.only), ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+页面级耗时：用 streamlit.testing 的 AppTest 执行首页和页面配置中已启用的每个页面
+
+在临时目录中以合成数据集作为 doctor_info.db（代码目录通过符号链接引用），在子进程中执行，
+以管理员身份（拥有全部页面权限）记录每个页面的首次渲染耗时和再次重跑耗时的中位数。
+页面与 main.py 一样经 router 和 st.navigation 执行：为每个页面写一个只含该页面的入口脚本
+（见 page_script），只使用 AppTest 的公开接口。
+
+用法:
+    python -m benchmark.pages --scale small
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmark import synthetic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINKED = ("main.py", "my_data", "my_model", "my_page", "pages_config.json")
+RERUNS = 5
+
+PAGE_SCRIPT = """
+import streamlit as st
+from my_page import router
+
+page = next(page for page in router.visible_pages() if router.url_path(page) == {url_path!r})
+st.navigation([router.make_page(page)]).run()
+"""
+
+PAGE_TIMER = """
+import json, os, statistics, sys, time
+from streamlit.testing.v1 import AppTest
+from benchmark.pages import page_script
+from my_model.all_user.session import StaffSession
+from my_model.by_file import page_config
+from my_page import router
+
+reruns = int(sys.argv[1])
+admin = StaffSession(id=1, name="闫方涛", section="优质服务中心", number=10000,
+                     state=(1 << page_config.page_count()) - 1)
+results = {}
+
+def time_app(name, url_path=None):
+    script = "main.py" if url_path is None else page_script(".", url_path)
+    at = AppTest.from_file(os.path.abspath(script), default_timeout=300)
+    if url_path is not None:
+        at.session_state["my_info"] = admin
+    start = time.perf_counter()
+    at.run()
+    first = (time.perf_counter() - start) * 1000
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    results[f"{name}.first"] = {"median_ms": first, "p95_ms": first, "min_ms": first, "runs": 1,
+                                "exception": bool(at.exception)}
+    timings.sort()
+    results[f"{name}.rerun"] = {"median_ms": statistics.median(timings), "p95_ms": timings[-1],
+                                "min_ms": timings[0], "runs": len(timings)}
+
+time_app("page.home")
+for page in page_config.load_pages():
+    if page["enabled"]:
+        time_app("page." + page["file"].split("_", 1)[0], router.url_path(page))
+print(json.dumps(results))
+"""
+
+
+def script_name(url_path: str) -> str:
+    """page_script 写入的入口脚本文件名"""
+    return f"page_{url_path}.py"
+
+
+def page_script(directory: str, url_path: str) -> str:
+    """
+    在 directory 中写入只打开 URL 路径为 url_path 的页面的入口脚本，返回脚本路径
+
+    AppTest 只能按页面文件切换页面，而页面由 st.navigation 以函数注册；入口脚本同样经 router 检查权限并
+    生成 st.Page，导航中只有这一个页面，AppTest.run() 即执行该页面。
+    """
+    path = os.path.join(directory, script_name(url_path))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(PAGE_SCRIPT.format(url_path=url_path))
+    return path
+
+
+def run(scale: str = "small", seed: int = 0, reruns: int = RERUNS) -> dict:
+    """返回 {页面用例名: 耗时统计}"""
+    path = synthetic.dataset(scale, seed)
+    with tempfile.TemporaryDirectory() as directory:
+        for name in LINKED:
+            os.symlink(os.path.join(ROOT, name), os.path.join(directory, name))
+        os.rename(synthetic.working_copy(path, directory), os.path.join(directory, "doctor_info.db"))
+        # 代码目录在前，benchmark 包从仓库根目录导入
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join((directory, ROOT)))
+        output = subprocess.run([sys.executable, "-c", PAGE_TIMER, str(reruns)], cwd=directory, env=env,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="页面级耗时（AppTest）")
+    parser.add_argument("--scale", choices=synthetic.SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reruns", type=int, default=RERUNS)
+    args = parser.parse_args()
+    print(json.dumps(run(args.scale, args.seed, args.reruns), ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+并发写入压力测试：单写线程队列 与 各线程直接写入 的对比
+
+模拟 N 个会话线程同时提交沟通记录、修改记录和删除记录：
+    queue:  通过 data_insert / data_update / data_delete（经 data_writer 写线程组提交）；
+    direct: 每个线程各自借连接、开事务直接写入（旧的做法）。
+统计吞吐量、"database is locked" 错误数以及写线程的背压指标。
+数据库为临时文件，不影响 doctor_info.db。
+
+用法:
+    python -m benchmark.stress_writer --sessions 200 --operations 20
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from my_model.db_sqlite import data_connect, data_delete, data_fts, data_insert, data_update, data_writer
+
+FORM = {"patient_name": "测试", "department": "外科一病区", "doctor": "测试医生", "risk_level": "三级手术",
+        "diagnosis": "压力测试"}
+
+
+def session_queue(database_path, operations, rng, errors):
+    ids = []
+    for _ in range(operations):
+        action = rng.random()
+        try:
+            if action < 0.6 or not ids:
+                ids.append(data_insert.insert_form(database_path, FORM)[0])
+            elif action < 0.9:
+                if not data_update.smart_update_record_by_id(database_path, "doctor_forms", rng.choice(ids),
+                                                             {"opinion": "已修改"}):
+                    errors["update_failed"] += 1
+            else:
+                if not data_delete.delete_data(database_path, "doctor_forms", ids.pop()):
+                    errors["delete_failed"] += 1
+        except sqlite3.Error as e:
+            errors[str(e)] += 1
+
+
+def session_direct(database_path, operations, rng, errors):
+    ids = []
+    columns = ", ".join(FORM)
+    placeholders = ", ".join("?" * len(FORM))
+    for _ in range(operations):
+        action = rng.random()
+        try:
+            # 与写线程的辅助函数一样在同一事务中维护逐字全文索引
+            with data_connect.transaction(database_path) as conn:
+                if action < 0.6 or not ids:
+                    ids.append(conn.execute(f"INSERT INTO doctor_forms ({columns}) VALUES ({placeholders})",
+                                            tuple(FORM.values())).lastrowid)
+                    data_fts.add(conn, ids[-1:])
+                elif action < 0.9:
+                    record_id = rng.choice(ids)
+                    data_fts.remove(conn, [record_id])
+                    conn.execute("UPDATE doctor_forms SET opinion = ? WHERE id = ?", ("已修改", record_id))
+                    data_fts.add(conn, [record_id])
+                else:
+                    data_fts.remove(conn, ids[-1:])
+                    conn.execute("DELETE FROM doctor_forms WHERE id = ?", (ids.pop(),))
+        except sqlite3.Error as e:
+            errors[str(e)] += 1
+
+
+def run(mode: str, sessions: int, operations: int, seed: int = 0) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "stress.db")
+        # 预先建立表结构，避免迁移时间计入结果
+        with data_connect.connection(database_path):
+            pass
+
+        target = session_queue if mode == "queue" else session_direct
+        errors = Counter()
+        threads = [
+            threading.Thread(target=target, args=(database_path, operations, random.Random(seed + i), errors))
+            for i in range(sessions)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        writer = data_writer.stats().get(os.path.abspath(database_path))
+        data_writer.stop_all()
+        data_connect.close_all()
+
+    total = sessions * operations
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "operations": total,
+        "operations_per_second": total / elapsed,
+        "lock_errors": sum(count for message, count in errors.items() if "locked" in message),
+        "errors": dict(errors),
+        "writer": writer,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并发写入压力测试")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--operations", type=int, default=20, help="每个会话的写操作次数")
+    parser.add_argument("--modes", nargs="+", default=["queue", "direct"], choices=["queue", "direct"])
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        print(json.dumps(run(mode, args.sessions, args.operations), ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
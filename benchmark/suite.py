@@ -0,0 +1,119 @@
+"""
+基准测试套件：合成数据集上的微基准与页面耗时，结果写入 JSON 并与基线比较
+
+    python -m benchmark.suite --scale small                  # 运行并与 benchmark/baselines/small.json 比较
+    python -m benchmark.suite --scale small --save-baseline  # 用本次结果更新基线
+    python -m benchmark.suite --scale hospital --skip-pages  # 10 万员工、100 万记录，只跑微基准
+
+首次运行某个规模时会生成并缓存数据集（benchmark/data/，hospital 规模需要几分钟）。
+比较以中位数为准，超过基线 (1 + threshold) 倍且差值超过 NOISE_MS 记为退化；
+基线与本次结果应来自同一台机器。
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import sys
+
+from benchmark import micro, pages, synthetic
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(HERE, "baselines")
+RESULT_DIR = os.path.join(HERE, "results")
+THRESHOLD = 0.3
+# 绝对差值低于该值（毫秒）的变化视为计时噪声，不判定退化或改善
+NOISE_MS = 0.1
+
+
+def run(scale: str, seed: int, skip_pages: bool = False) -> dict:
+    results = micro.run(scale, seed)
+    if not skip_pages:
+        results.update(pages.run(scale, seed))
+    return {
+        "meta": {
+            "scale": scale,
+            "seed": seed,
+            **synthetic.SCALES[scale],
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD) -> list:
+    """
+    比较两次结果的中位数
+
+    返回:
+        list[dict]: 每个共同用例的 {name, baseline_ms, current_ms, ratio, status}，
+                    status 为 "退化"、"改善" 或 ""
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        if abs(result["median_ms"] - base["median_ms"]) < NOISE_MS:
+            status = ""
+        else:
+            status = "退化" if ratio > 1 + threshold else "改善" if ratio < 1 / (1 + threshold) else ""
+        rows.append({"name": name, "baseline_ms": base["median_ms"], "current_ms": result["median_ms"],
+                     "ratio": ratio, "status": status})
+    return rows
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="基准测试套件")
+    parser.add_argument("--scale", choices=synthetic.SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-pages", action="store_true", help="不运行 AppTest 页面耗时")
+    parser.add_argument("--output", help="结果 JSON 路径，默认 benchmark/results/<规模>-<时间>.json")
+    parser.add_argument("--baseline", help="基线 JSON 路径，默认 benchmark/baselines/<规模>.json")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="判定退化的相对阈值")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为基线")
+    parser.add_argument("--fail-on-regression", action="store_true", help="存在退化时以状态码 1 退出")
+    args = parser.parse_args()
+
+    current = run(args.scale, args.seed, args.skip_pages)
+    output = args.output or os.path.join(
+        RESULT_DIR, f"{args.scale}-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    _write(output, current)
+    print(f"结果已写入 {output}")
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{args.scale}.json")
+    if args.save_baseline:
+        _write(baseline_path, current)
+        print(f"基线已更新 {baseline_path}")
+        return
+    if not os.path.exists(baseline_path):
+        print(f"没有基线 {baseline_path}，可用 --save-baseline 保存本次结果")
+        return
+
+    with open(baseline_path, encoding="utf-8") as f:
+        rows = compare(current, json.load(f), args.threshold)
+    print(f"{'用例':<45}{'基线 ms':>12}{'本次 ms':>12}{'倍数':>8}")
+    for row in rows:
+        print(f"{row['name']:<45}{row['baseline_ms']:>12.3f}{row['current_ms']:>12.3f}"
+              f"{row['ratio']:>8.2f}  {row['status']}")
+    regressions = [row for row in rows if row["status"] == "退化"]
+    print(f"共 {len(rows)} 项，退化 {len(regressions)} 项")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+确定性的医院规模合成数据
+
+按给定的随机种子生成 doctor_info（员工）、doctor_forms（沟通记录）和 doctor_model（模板），
+相同参数总是得到相同的数据。科室取自 hospital_basic.section，沟通记录的医生取自对应科室的员工，
+日期均匀分布在 --days 天内，index_id 按天连续编号。
+
+数据库通过 data_connect 创建，迁移、全文检索和汇总计数的触发器与线上一致。
+员工号从 10000 起连续分配，超过 9 万人时会出现 6 位员工号（仅用于测试规模）。
+所有员工使用同一个密码哈希（密码为 1，盐由种子决定），避免生成时计算十万次 scrypt。
+
+用法:
+    python -m benchmark.synthetic --staff 100000 --forms 1000000 --output benchmark/data/hospital.db
+"""
+import argparse
+import contextlib
+import datetime
+import os
+import random
+import shutil
+import sqlite3
+import time
+
+from my_data.user_data import hospital_basic
+from my_model.all_user import credential
+from my_model.db_sqlite import data_connect, data_fts
+from my_model.db_sqlite.migrations import runner
+
+# 常见姓氏与名字用字，组合后姓名分布接近真实员工表（有少量重名）
+SURNAMES = "王李张刘陈杨赵黄周吴徐孙胡朱高林何郭马罗梁宋郑谢韩唐冯于董萧程曹袁邓许傅沈曾彭吕苏卢蒋蔡贾丁魏薛叶阎余潘杜戴夏钟汪田任姜范方石姚谭廖邹熊金陆郝孔白崔康毛邱秦江史顾侯邵孟龙万段雷钱汤尹黎易常武乔贺赖龚文闫"
+GIVEN = "伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉萍红鹏辉建国文斌宇浩凯健俊帆帅旭宁婷雪琳晨欣悦梦佳颖慧倩楠鑫媛琪怡瑜"
+RISK_LEVELS = ("二级手术", "三级手术", "四级手术")
+SURGERIES = ("腹腔镜胆囊切除术", "混合痔切除术", "全髋关节置换术", "肺叶切除术", "经皮冠状动脉介入治疗",
+             "股骨粗隆间骨折闭合复位内固定术", "甲状腺切除术", "阑尾切除术", "膝关节镜下半月板成形术")
+DIAGNOSES = ("胆囊结石", "混合痔", "股骨头坏死", "肺结节", "冠状动脉粥样硬化性心脏病", "股骨粗隆间骨折",
+             "甲状腺结节", "急性阑尾炎", "半月板损伤")
+OPINIONS = ("启动强化沟通程序", "高龄高危会诊", "多学科会诊后手术")
+COMORBIDITIES = ("高血压", "糖尿病", "冠心病", "慢性肾病", "贫血", "慢性阻塞性肺疾病", "脑梗死后遗症")
+
+# 预设规模：small 用于日常回归比较，hospital 为全院规模
+SCALES = {
+    "small": {"staff": 5_000, "forms": 20_000},
+    "hospital": {"staff": 100_000, "forms": 1_000_000},
+}
+
+BATCH = 10_000
+
+
+def _name(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + "".join(rng.choice(GIVEN) for _ in range(rng.choice((1, 2, 2))))
+
+
+def _staff_rows(rng, count, password):
+    sections = hospital_basic.section
+    for i in range(count):
+        # 约 1% 待审核，约 0.5% 拥有某个页面的管理员权限
+        roll = rng.random()
+        state = -1 if roll < 0.01 else (1 << rng.randrange(5)) if roll < 0.015 else 0
+        yield rng.choice(sections), _name(rng), 10000 + i, password, state
+
+
+def _form_rows(rng, count, days, start, doctors):
+    sections = list(doctors)
+    per_day = {}
+    for _ in range(count):
+        day = start + datetime.timedelta(days=rng.randrange(days))
+        per_day[day] = per_day.get(day, 0) + 1
+        department = rng.choice(sections)
+        doctor = rng.choice(doctors[department])
+        patient = _name(rng)
+        age = rng.randint(18, 95)
+        surgery_index = rng.randrange(len(SURGERIES))
+        comorbidity = "、".join(rng.sample(COMORBIDITIES, rng.randint(1, 3)))
+        yield (
+            f"{day:%Y%m%d}{per_day[day]:03d}", patient, age, department, doctor, doctor,
+            SURGERIES[surgery_index], str(rng.randint(100000, 999999)), rng.choice(RISK_LEVELS),
+            DIAGNOSES[surgery_index], rng.choice(OPINIONS), str(day),
+            "此方案为会诊确定最优方案。",
+            f"我们是患者{patient}的家属，因{DIAGNOSES[surgery_index]}住院，患者{age}岁，合并{comorbidity}，"
+            f"经患者本人同意及亲属知会，拟行{SURGERIES[surgery_index]}。",
+            f"主管医师多次与我们沟通并充分告知术中、术后可能出现{comorbidity}加重、心脑血管意外等风险。",
+            "我们及患者已全面了解了各种风险，经慎重考虑，仍然愿意采取手术方式治疗。",
+            "强烈要求进行手术，并自愿承担责任风险。",
+            "系统生成", "", "已处理", "",
+        )
+
+
+FORM_COLUMNS = ("index_id", "patient_name", "age", "department", "doctor", "id_doc", "surgery", "case_number",
+                "risk_level", "diagnosis", "opinion", "date", "risk_replace", "status_reason", "risk_disclosure",
+                "user_input", "final_opinion", "record_name", "file_address", "style", "add_info")
+
+
+def generate(database_path, staff: int, forms: int, seed: int = 0, days: int = 730,
+             start: datetime.date = datetime.date(2024, 1, 1)) -> dict:
+    """
+    生成合成数据库（database_path 不能已存在）
+
+    返回:
+        dict: 各表行数和耗时
+    """
+    if os.path.exists(database_path):
+        raise FileExistsError(database_path)
+    rng = random.Random(seed)
+    password = credential.make_hash("1", salt=rng.randbytes(credential.SALT_BYTES))
+    started = time.perf_counter()
+
+    with data_connect.transaction(database_path) as conn:
+        rows = list(_staff_rows(rng, staff, password))
+        conn.executemany(
+            "INSERT INTO doctor_info (section, name, number, password, state) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        doctors = {}
+        for section, name, _, _, state in rows:
+            if state >= 0:
+                doctors.setdefault(section, []).append(name)
+        conn.executemany(
+            "INSERT INTO doctor_model (department, id_doc, risk_replace, status_reason, risk_disclosure, "
+            "user_input, final_opinion) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(section, names[0], "此方案为会诊确定最优方案。", "", "", "", "强烈要求进行手术，并自愿承担责任风险。")
+             for section, names in sorted(doctors.items())],
+        )
+
+    insert_form = (f"INSERT INTO doctor_forms ({', '.join(FORM_COLUMNS)}) "
+                   f"VALUES ({', '.join('?' * len(FORM_COLUMNS))})")
+    form_rows = _form_rows(rng, forms, days, start, doctors)
+    while True:
+        batch = [row for _, row in zip(range(BATCH), form_rows)]
+        if not batch:
+            break
+        with data_connect.transaction(database_path) as conn:
+            conn.executemany(insert_form, batch)
+
+    with data_connect.transaction(database_path) as conn:
+        # 与 v004 迁移相同：让流水号计数器从已有编号之后继续
+        conn.execute("""
+            INSERT INTO sequences (name, period, value)
+            SELECT 'doctor_forms', substr(index_id, 1, 8), max(CAST(substr(index_id, 9) AS INTEGER))
+            FROM doctor_forms GROUP BY substr(index_id, 1, 8)
+            ON CONFLICT (name, period) DO UPDATE SET value = max(value, excluded.value)
+        """)
+        # 批量插入绕过了 data_insert，逐字全文索引一次性建立
+        data_fts.rebuild(conn)
+    with data_connect.connection(database_path) as conn:
+        conn.execute("PRAGMA optimize")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    data_connect.close_all()
+    return {"staff": staff, "forms": forms, "seconds": time.perf_counter() - started}
+
+
+def dataset(scale: str = "small", seed: int = 0, cache_dir: str = None) -> str:
+    """
+    返回指定规模的合成数据库路径，已生成过的直接复用（缓存在 benchmark/data/ 下）
+
+    调用方如需修改数据，应先复制一份（见 working_copy）。
+    """
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{scale}-{seed}.db")
+    if not os.path.exists(path):
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        generate(partial, seed=seed, **SCALES[scale])
+        os.replace(partial, path)
+    else:
+        # 之前生成的数据集按新增的迁移升级一次，避免每个工作副本各自重建索引
+        with contextlib.closing(sqlite3.connect(path, isolation_level=None)) as conn:
+            runner.migrate(conn)
+    return path
+
+
+def working_copy(path, directory) -> str:
+    """复制数据集到 directory，返回副本路径"""
+    target = os.path.join(directory, os.path.basename(path))
+    shutil.copyfile(path, target)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成确定性的合成医院数据库")
+    parser.add_argument("--staff", type=int, default=SCALES["hospital"]["staff"])
+    parser.add_argument("--forms", type=int, default=SCALES["hospital"]["forms"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=730, help="沟通记录的日期跨度")
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    result = generate(args.output, args.staff, args.forms, args.seed, args.days)
+    print(f"已生成 {args.output}：员工 {result['staff']}，沟通记录 {result['forms']}，耗时 {result['seconds']:.1f} 秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,39 @@
-from PIL import Image
+import io
 from datetime import datetime
 import streamlit as st
+from my_model.db_sqlite import data_trace
+from my_page import router
 from my_page.main import login, enroll, find, change
 
+HOME_IMAGE = 'my_data/images/home1.jpg'
+# 原图 4528x980，按页面最大显示宽度的两倍缩放后即可满足高分屏
+HOME_IMAGE_WIDTH = 1400
 
-def main():
-    st.title("🏥 华北医疗邢台总医院")
 
-    # 设置页面配置
-    st.set_page_config(
-        page_title="医疗科室信息中心",
-        page_icon="🏥",
-        # layout="wide",
-        initial_sidebar_state="expanded"
-    )
+@st.cache_resource
+def home_image() -> bytes:
+    """读取首页图片并缩放为 JPEG 字节，每个进程只解码一次"""
+    # PIL 只在首次生成缓存时导入
+    from PIL import Image
+
+    with Image.open(HOME_IMAGE) as image:
+        image.thumbnail((HOME_IMAGE_WIDTH, HOME_IMAGE_WIDTH))
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+@st.cache_resource
+def backup_scheduler():
+    """每个进程启动一次数据库定时备份线程"""
+    from my_model.db_sqlite import data_backup
+
+    return data_backup.start_scheduler('doctor_info.db')
+
+
+@data_trace.page('home')
+def home():
+    st.title("🏥 华北医疗邢台总医院")
 
     # 获取当前日期和时间
     now = datetime.now()
@@ -35,7 +55,7 @@ def main():
     with tab1:
         st.subheader('用户登录')
         login()
-        st.image(Image.open('my_data/images/home1.jpg'))
+        st.image(home_image())
     with tab2:
         st.subheader('欢迎注册')
         enroll()
@@ -47,5 +67,19 @@ def main():
         change()
 
 
+def main():
+    # 设置页面配置
+    st.set_page_config(
+        page_title="医疗科室信息中心",
+        page_icon="🏥",
+        # layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    # 无论会话先打开哪个页面，进程内都只启动一次备份线程
+    backup_scheduler()
+    # 按页面配置和登录用户的权限路由到首页或各功能页面
+    router.navigation(home).run()
+
+
 if __name__ == "__main__":
     main()
@@ -1,13 +1,8 @@
-# 默认页面数据，现在包含模板文件路径
+# 默认页面配置：access 为访问页面所需的权限（0 所有人，1 已登录，2 本页面管理员）
 DEFAULT_PAGES = [
-    {"name": "强化沟通信息记录", "file": "01_🌱_强化沟通信息记录.py", "enabled": True,
-     "template": "templates/page01.py"},
-    {"name": "预住院与日间手术", "file": "02_⛵_预住院与日间手术.py", "enabled": True,
-     "template": "templates/page02.py"},
-    {"name": "运营管理数据支持", "file": "03_🏡_运营管理数据支持.py", "enabled": True,
-     "template": "templates/page03.py"},
-    {"name": "六型科室综合评比", "file": "04_🚣_六型科室综合评比.py", "enabled": True,
-     "template": "templates/page04.py"},
-    {"name": "管理员的系统维护", "file": "99_🔧_管理员的系统维护.py", "enabled": True,
-     "template": "templates/page99.py"},
-]
\ No newline at end of file
+    {"name": "强化沟通信息记录", "file": "01_🌱_强化沟通信息记录.py", "enabled": True, "access": 1},
+    {"name": "预住院与日间手术", "file": "02_⛵_预住院与日间手术.py", "enabled": True, "access": 0},
+    {"name": "运营管理数据支持", "file": "03_🏡_运营管理数据支持.py", "enabled": True, "access": 0},
+    {"name": "六型科室综合评比", "file": "04_🚣_六型科室综合评比.py", "enabled": True, "access": 0},
+    {"name": "管理员的系统维护", "file": "99_🔧_管理员的系统维护.py", "enabled": True, "access": 1},
+]
@@ -1,4 +1,5 @@
 import streamlit as st
+from my_model.all_user import permission
 
 
 def administrator(ordinal, types=0):
@@ -7,15 +8,12 @@ def administrator(ordinal, types=0):
         # 未登录也可以看
         return True
     elif types > 0:
-        if 'user_info' in st.session_state:
-            # 获取当前用户信息
-            user_info = st.session_state['user_info']
-            bin_str = user_info['state']
-
-            # 检查索引是否有效
-            if ordinal - 1 < len(bin_str):
-                admin = bin_str[ordinal - 1] == '1'
-            else:
+        if 'my_info' in st.session_state:
+            # 获取当前用户信息（StaffSession），state 为整数权限位
+            my_info = st.session_state['my_info']
+            try:
+                admin = permission.has(my_info.state, ordinal)
+            except ValueError:
                 admin = False  # 索引超出范围，默认无权限
 
             if types == 1:
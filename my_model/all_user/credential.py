@@ -0,0 +1,98 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from my_model.db_sqlite import data_update
+
+# scrypt 参数：n=2^14, r=8 每次约占用 16MB 内存、数十毫秒 CPU
+SCHEME = "scrypt"
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+# 哈希计算放在有界线程池中执行：hashlib.scrypt 运行时会释放 GIL，
+# 登录高峰时最多占满 CPU 核数，其余请求排队，不会拖慢其他会话的脚本线程
+MAX_WORKERS = os.cpu_count() or 2
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="credential")
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r, dklen=HASH_BYTES,
+    )
+
+
+def is_hashed(stored) -> bool:
+    """判断数据库中的密码是否已是加盐哈希（否则为旧版明文）"""
+    return isinstance(stored, str) and stored.startswith(SCHEME + "$")
+
+
+def make_hash(password: str, salt: bytes = None) -> str:
+    """
+    同步计算加盐哈希
+
+    参数:
+        salt: 指定盐值（仅用于生成可复现的测试数据），默认随机生成
+
+    返回:
+        str: 形如 scrypt$n$r$p$salt$hash 的字符串，salt 与 hash 为 base64 编码
+    """
+    salt = secrets.token_bytes(SALT_BYTES) if salt is None else salt
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{SCHEME}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def check(password: str, stored) -> bool:
+    """同步校验密码，兼容旧版明文密码"""
+    if not is_hashed(stored):
+        return hmac.compare_digest(str(stored).encode("utf-8"), password.encode("utf-8"))
+
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p))
+    except ValueError:
+        # 格式损坏的哈希一律视为校验失败
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+def needs_rehash(stored) -> bool:
+    """旧版明文密码或参数低于当前配置的哈希需要重新计算"""
+    return not is_hashed(stored) or stored.split("$")[1:4] != [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+
+
+def hash_password(password: str) -> Future:
+    """在线程池中计算加盐哈希，返回 Future[str]"""
+    return _executor.submit(make_hash, password)
+
+
+def verify_password(password: str, stored) -> Future:
+    """在线程池中校验密码，返回 Future[bool]"""
+    return _executor.submit(check, password, stored)
+
+
+def upgrade_password(database_path: str, record_id: int, password: str) -> Future:
+    """
+    在后台将旧版明文密码迁移为加盐哈希，登录流程不必等待
+
+    返回:
+        Future[bool]: 数据库更新是否成功
+    """
+    def task():
+        hashed = make_hash(password)
+        return data_update.smart_update_record_by_id(
+            database_path, "doctor_info", int(record_id), {"password": hashed}
+        )
+
+    return _executor.submit(task)
@@ -0,0 +1,82 @@
+import enum
+
+import numpy as np
+from my_model.by_file import page_config
+
+# doctor_info.state 以十进制整数存储各页面的管理员权限位：
+# 按页面顺序，第 1 个页面对应最高位，最后一个页面对应最低位，
+# 例如共 5 个页面时 17 = 0b10001 表示第 1 个和第 5 个页面的管理员。
+# 页面数量和顺序由 page_config.PAGE_IDS 固定，页面配置不能改变权限位宽度。
+# 负数（-1）表示待审核用户，没有任何权限。
+
+
+def width() -> int:
+    """权限位宽度，即页面数量（固定）"""
+    return len(page_config.PAGE_IDS)
+
+
+def bit(ordinal: int, n: int = None) -> int:
+    """第 ordinal 个页面（从 1 开始）对应的权限位，n 为权限位宽度（默认为页面数量）"""
+    n = width() if n is None else n
+    if not 1 <= ordinal <= n:
+        raise ValueError(f"页面序号必须在1-{n}之间")
+    return 1 << (n - ordinal)
+
+
+def _build_flags():
+    # 以页面编号命名，例如 01_🌱_强化沟通信息记录.py -> PAGE01；
+    # 只使用固定的 PAGE_IDS，导入时不读取 pages_config.json
+    return enum.IntFlag("Page", {"PAGE" + page_id: bit(i) for i, page_id in enumerate(page_config.PAGE_IDS, 1)})
+
+
+# 具名权限位，例如 Page.PAGE01、Page.PAGE99
+Page = _build_flags()
+
+
+def has(state, ordinal: int) -> bool:
+    """判断 state 是否拥有第 ordinal 个页面的管理员权限"""
+    state = int(state)
+    return state >= 0 and state & bit(ordinal) != 0
+
+
+def flags(state) -> Page:
+    """将 state 转换为具名权限位组合，待审核用户返回空组合"""
+    state = int(state)
+    return Page(state & ((1 << width()) - 1)) if state >= 0 else Page(0)
+
+
+def to_list(state) -> list:
+    """按页面顺序返回每个页面是否有管理员权限"""
+    n = width()
+    state = int(state)
+    return [state >= 0 and state & bit(ordinal, n) != 0 for ordinal in range(1, n + 1)]
+
+
+def from_list(admins) -> int:
+    """to_list 的逆运算：按页面顺序的布尔列表转换为 state 整数"""
+    admins = list(admins)
+    state = 0
+    for ordinal, admin in enumerate(admins, 1):
+        if admin:
+            state |= bit(ordinal, len(admins))
+    return state
+
+
+def admins_mask(states, ordinal: int) -> np.ndarray:
+    """
+    批量判断一组 state 是否拥有第 ordinal 个页面的管理员权限
+
+    参数:
+        states: state 整数序列（list、numpy 数组或 pandas Series）
+        ordinal (int): 页面序号，从 1 开始
+
+    返回:
+        np.ndarray: 布尔数组，与 states 等长
+    """
+    states = np.asarray(states, dtype=np.int64)
+    return (states >= 0) & (states & bit(ordinal) != 0)
+
+
+def admins_of(staff, ordinal: int):
+    """从员工表 DataFrame 中筛选第 ordinal 个页面的管理员，例如 admins_of(df, 3)"""
+    return staff[admins_mask(staff["state"], ordinal)]
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class StaffSession:
+    """
+    登录用户的会话信息，保存在 st.session_state["my_info"] 中
+
+    只保留页面需要的字段（不含密码），使用 __slots__ 以减少每个会话的内存占用。
+    """
+    id: int
+    name: str
+    section: str
+    number: int
+    state: int
+
+    @classmethod
+    def from_row(cls, row) -> "StaffSession":
+        """由员工表的一行（pandas.Series 或字典）创建"""
+        return cls(
+            id=int(row["id"]),
+            name=str(row["name"]),
+            section=str(row["section"]),
+            number=int(row["number"]),
+            state=int(row["state"]),
+        )
@@ -0,0 +1,176 @@
+import copy
+import json
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+from my_data.user_data import pages_json
+
+CONFIG_FILE = "pages_config.json"
+
+# 每个页面配置项的必填字段及类型
+PAGE_SCHEMA = {"name": str, "file": str, "enabled": bool}
+# 可选字段及类型：access 为访问页面所需的权限（同 administrator 的 types，缺省为 0）；
+# template 是旧版按模板生成 pages 目录时的字段，保留以兼容旧配置，已不再使用
+OPTIONAL_FIELDS = {"access": int, "template": str}
+ACCESS_LEVELS = (0, 1, 2)
+# doctor_info.state 按页面顺序存储各页面的权限位（见 permission），页面的增减或重排会使已保存的
+# 权限位对应到别的页面，因此页面编号（文件名的数字前缀）及其顺序固定为默认配置中的顺序
+PAGE_IDS = tuple(page["file"].split("_", 1)[0] for page in pages_json.DEFAULT_PAGES)
+
+
+def atomic_write(path: Path, content: str):
+    """先写入同目录下的临时文件再重命名替换，读者不会看到写了一半的文件"""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        # mkstemp 创建的文件权限为 0600，沿用原文件的权限，新文件使用 0644
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def validate(pages) -> list:
+    """
+    校验页面配置，返回补全 access 字段后的副本
+
+    异常:
+        ValueError: 配置不是非空列表、缺少字段、字段类型或取值错误、文件名重复、页面编号或顺序改变
+    """
+    if not isinstance(pages, list) or not pages:
+        raise ValueError("页面配置必须是非空列表")
+    if len(pages) != len(PAGE_IDS):
+        raise ValueError(f"页面数量必须为 {len(PAGE_IDS)} 个，增减页面会使已保存的权限位错位")
+
+    result = []
+    files = set()
+    for i, page in enumerate(pages, 1):
+        if not isinstance(page, dict):
+            raise ValueError(f"第{i}个页面配置不是对象")
+        page = dict(page)
+        page.setdefault("access", 0)
+
+        for field, field_type in PAGE_SCHEMA.items():
+            if field not in page:
+                raise ValueError(f"第{i}个页面配置缺少字段 '{field}'")
+            if not isinstance(page[field], field_type):
+                raise ValueError(f"第{i}个页面配置的字段 '{field}' 应为 {field_type.__name__}")
+        for field, field_type in OPTIONAL_FIELDS.items():
+            if field in page and not isinstance(page[field], field_type):
+                raise ValueError(f"第{i}个页面配置的字段 '{field}' 应为 {field_type.__name__}")
+        if page["access"] not in ACCESS_LEVELS or isinstance(page["access"], bool):
+            raise ValueError(f"第{i}个页面的 access 必须是 {ACCESS_LEVELS} 之一")
+        if not page["file"].endswith(".py"):
+            raise ValueError(f"第{i}个页面的文件名必须以 .py 结尾")
+        if page["file"] in files:
+            raise ValueError(f"页面文件名重复: {page['file']}")
+        if page["file"].split("_", 1)[0] != PAGE_IDS[i - 1]:
+            raise ValueError(f"第{i}个页面的编号必须为 {PAGE_IDS[i - 1]}，页面顺序改变会使已保存的权限位错位")
+        files.add(page["file"])
+        result.append(page)
+    return result
+
+
+class PageConfig:
+    """
+    pages_config.json 的进程内缓存
+
+    以文件的 (mtime, size) 作为缓存键，文件未变化时不重复读取和解析；
+    通过 save() 保存时原子写入并直接替换缓存，同一进程中的所有会话在下一次重跑时即可看到新配置。
+    """
+
+    def __init__(self, path=CONFIG_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._key = None
+        self._pages = None
+
+    def _stat_key(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _current(self) -> list:
+        """返回缓存的配置（共享对象，调用方需持有锁且不得修改）"""
+        key = self._stat_key()
+        if key is None:
+            # 配置文件不存在时写入默认配置
+            self._write(pages_json.DEFAULT_PAGES)
+            key = self._stat_key()
+
+        if key != self._key:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._pages = validate(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"页面配置读取失败，使用默认配置: {e}")
+                self._pages = validate(pages_json.DEFAULT_PAGES)
+            self._key = key
+        return self._pages
+
+    def _write(self, pages):
+        atomic_write(self.path, json.dumps(pages, ensure_ascii=False, indent=4))
+
+    def pages(self) -> list:
+        """返回页面配置列表的副本，调用方可以自由修改"""
+        with self._lock:
+            return copy.deepcopy(self._current())
+
+    def names(self) -> list:
+        """按顺序返回页面名称"""
+        with self._lock:
+            return [page["name"] for page in self._current()]
+
+    def save(self, pages):
+        """校验后原子保存配置并替换缓存"""
+        pages = validate(pages)
+        with self._lock:
+            self._write(pages)
+            self._pages = pages
+            self._key = self._stat_key()
+
+
+_configs = {}
+_configs_lock = threading.Lock()
+
+
+def get_config(path=CONFIG_FILE) -> PageConfig:
+    """获取配置文件对应的进程级缓存对象"""
+    key = os.path.abspath(path)
+    config = _configs.get(key)
+    if config is None:
+        with _configs_lock:
+            config = _configs.setdefault(key, PageConfig(path))
+    return config
+
+
+def load_pages() -> list:
+    """读取页面配置（副本）"""
+    return get_config().pages()
+
+
+def save_pages(pages):
+    """保存页面配置"""
+    get_config().save(pages)
+
+
+def page_names() -> list:
+    """按顺序返回页面名称"""
+    return get_config().names()
+
+
+def page_count() -> int:
+    """页面数量，即 doctor_info.state 的权限位宽度（固定）"""
+    return len(PAGE_IDS)
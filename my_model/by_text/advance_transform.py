@@ -1,7 +1,7 @@
-from my_data.user_data import pages_json
+from my_model.by_file import page_config
 
 
-def base_converter(value: str, from_base: int, to_base: int, i: int = len(pages_json.DEFAULT_PAGES)) -> str:
+def base_converter(value: str, from_base: int, to_base: int, i: int = None) -> str:
     """
     将任意进制的字符串转换为另一种进制的字符串
 
@@ -9,7 +9,7 @@ def base_converter(value: str, from_base: int, to_base: int, i: int = len(pages_
     value (str): 输入的数值字符串
     from_base (int): 输入数值的进制
     to_base (int): 目标进制
-    i (int): 输出字符串的最小长度（左侧补零），默认为0表示不补零
+    i (int): 输出字符串的最小长度（左侧补零），默认为页面数量（即权限位宽度），0表示不补零
 
     返回:
     str: 转换后的数值字符串（左侧补零到指定长度）
@@ -59,6 +59,8 @@ def base_converter(value: str, from_base: int, to_base: int, i: int = len(pages_
             temp //= to_base
 
     # ====== 第三步：长度处理（左侧补零） ======
+    if i is None:
+        i = page_config.page_count()
     # 计算需要补充的零的数量
     zeros_to_add = max(0, i - len(result))
     # 补充前导零
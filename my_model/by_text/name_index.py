@@ -0,0 +1,202 @@
+import bisect
+import functools
+import heapq
+from collections import Counter
+
+from pypinyin import Style, lazy_pinyin
+
+# 匹配类型，数值越小排名越靠前
+EXACT = 0  # 姓名完全一致
+PREFIX = 1  # 姓名前缀，如“张”匹配“张三”
+INITIALS = 2  # 拼音首字母前缀，如“zs”匹配“张三”
+SUBSTRING = 3  # 姓名包含输入，如“三”匹配“张三”
+FUZZY = 4  # 编辑距离在允许范围内，如“张山”匹配“张三”
+
+FUZZY_CANDIDATES = 300  # 每次查询最多计算编辑距离的姓名数
+
+
+@functools.lru_cache(maxsize=None)
+def _initial(char: str) -> str:
+    return "".join(lazy_pinyin(char, style=Style.FIRST_LETTER, errors=lambda s: s)).lower()
+
+
+def initials(name: str) -> str:
+    """
+    返回姓名的拼音首字母，如“张三”返回“zs”
+
+    按单字取 pypinyin 的首字母并缓存（姓名用字有限，建索引时不必对每个姓名分词）；
+    非汉字字符原样保留（字母转为小写）。多音字按默认读音处理。
+    """
+    return "".join(_initial(char) for char in name)
+
+
+def edit_distance(a: str, b: str, limit: int = None) -> int:
+    """
+    Levenshtein 编辑距离；给定 limit 时，距离超过 limit 即提前返回 limit + 1
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def max_distance(query: str) -> int:
+    """允许的编辑距离：两三个字的姓名允许错一个字，更长的允许错两个"""
+    return 1 if len(query) <= 3 else 2
+
+
+class NameIndex:
+    """
+    员工姓名索引，支持前缀、子串、拼音首字母和编辑距离查询
+
+    索引只保存去重后的姓名：
+        _initials: 姓名 -> 拼音首字母；
+        _sorted_names / _sorted_initials: 有序列表，用二分查找做前缀匹配；
+        _by_char: 汉字 -> 包含该字的姓名集合，编辑距离只在与输入有公共字的姓名中计算。
+    sync() 按姓名集合的差异增量增删，员工注册后无需整体重建。
+    """
+
+    def __init__(self, names=()):
+        self._counts = Counter()
+        self._initials = {}
+        self._sorted_names = []
+        self._sorted_initials = []
+        self._by_char = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self._initials)
+
+    def __contains__(self, name):
+        return name in self._initials
+
+    def add(self, name: str):
+        """加入一个姓名（同名员工计数，不重复建立索引）"""
+        self._counts[name] += 1
+        if self._counts[name] > 1:
+            return
+        code = initials(name)
+        self._initials[name] = code
+        bisect.insort(self._sorted_names, name)
+        bisect.insort(self._sorted_initials, (code, name))
+        for char in set(name):
+            self._by_char.setdefault(char, set()).add(name)
+
+    def remove(self, name: str):
+        """移除一个姓名；同名员工全部移除后才从索引中删除"""
+        if self._counts[name] <= 0:
+            return
+        self._counts[name] -= 1
+        if self._counts[name] > 0:
+            return
+        del self._counts[name]
+        code = self._initials.pop(name)
+        self._sorted_names.remove(name)
+        self._sorted_initials.remove((code, name))
+        for char in set(name):
+            names = self._by_char[char]
+            names.discard(name)
+            if not names:
+                del self._by_char[char]
+
+    def sync(self, names):
+        """与给定的姓名列表（可含重复）对齐，只处理增删的部分"""
+        target = Counter(names)
+        for name in list(self._counts):
+            for _ in range(self._counts[name] - target.get(name, 0)):
+                self.remove(name)
+        for name, count in target.items():
+            for _ in range(count - self._counts.get(name, 0)):
+                self.add(name)
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        查询姓名
+
+        返回:
+            list: [(姓名, 匹配类型, 编辑距离), ...]，按匹配类型、编辑距离、姓名长度差排序
+        """
+        query = "".join(query.split())
+        if not query:
+            return []
+
+        matches = {}
+
+        def offer(name, kind, distance=0):
+            best = matches.get(name)
+            if best is None or (kind, distance) < best:
+                matches[name] = (kind, distance)
+
+        if query in self._initials:
+            offer(query, EXACT)
+
+        start = bisect.bisect_left(self._sorted_names, query)
+        for name in self._sorted_names[start:]:
+            if not name.startswith(query):
+                break
+            offer(name, PREFIX)
+
+        code = query.lower()
+        pinyin = code.isascii() and code.isalpha()
+        if pinyin:
+            start = bisect.bisect_left(self._sorted_initials, (code,))
+            for initials_code, name in self._sorted_initials[start:]:
+                if not initials_code.startswith(code):
+                    break
+                offer(name, INITIALS, len(initials_code) - len(code))
+        else:
+            for name in self._containing(query):
+                offer(name, SUBSTRING, len(name) - len(query))
+        # 模糊匹配排在最后：已有完全一致的姓名，或前面的匹配已排满结果时不再计算编辑距离
+        if not pinyin and query not in matches and len(matches) < limit:
+            limit_distance = max_distance(query)
+            for name in self._fuzzy_candidates(query, limit_distance):
+                if name in matches:
+                    continue
+                distance = edit_distance(query, name, limit_distance)
+                if distance <= limit_distance:
+                    offer(name, FUZZY, distance)
+
+        ranked = sorted(matches.items(), key=lambda item: (item[1], abs(len(item[0]) - len(query)), item[0]))
+        return [(name, kind, distance) for name, (kind, distance) in ranked[:limit]]
+
+    def _containing(self, query: str) -> set:
+        """包含输入的姓名：从最少的汉字集合开始求交集，再确认子串"""
+        sets = sorted((self._by_char.get(char, set()) for char in set(query)), key=len)
+        candidates = sets[0].intersection(*sets[1:])
+        return {name for name in candidates if query in name}
+
+    def _fuzzy_candidates(self, query: str, limit_distance: int) -> list:
+        """
+        需要计算编辑距离的姓名
+
+        编辑距离不小于 max(两者长度) - 公共字数，因此只保留长度相近、公共字足够多的姓名：
+        至少需要 need 个公共字时，姓名必然包含输入中最少见的 len(chars) - need + 1 个字之一，
+        只需合并这几个字的姓名集合。超过 FUZZY_CANDIDATES 个时优先取公共字多、长度接近的姓名。
+        """
+        chars = set(query)
+        repeated = len(query) - len(chars)
+        need = max(len(query) - limit_distance - repeated, 1)
+        rarest = sorted(chars, key=lambda char: len(self._by_char.get(char, ())))
+        pool = set().union(*(self._by_char.get(char, ()) for char in rarest[:len(rarest) - need + 1]))
+        candidates = []
+        for name in pool:
+            gap = abs(len(name) - len(query))
+            if gap > limit_distance:
+                continue
+            shared = len(chars.intersection(name))
+            if shared + repeated >= max(len(name), len(query)) - limit_distance:
+                candidates.append((-shared, gap, name))
+        if len(candidates) > FUZZY_CANDIDATES:
+            candidates = heapq.nsmallest(FUZZY_CANDIDATES, candidates)
+        return [name for _, _, name in candidates]
@@ -0,0 +1,267 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from my_model.db_sqlite import data_connect
+from my_model.db_sqlite.migrations import runner
+
+BACKUP_DIR = "backups"
+# 保留的快照数量，超出时删除最旧的
+KEEP = 14
+# 定时备份间隔（秒）
+INTERVAL = 6 * 3600
+# 每步复制的页数（默认页大小 4KB，即每步约 1MB）和步间让出的秒数；
+# 每步只短暂持有源库的读锁，步与步之间写入可以继续进行
+PAGES_PER_STEP = 256
+STEP_SLEEP = 0.005
+# 分步备份被其他连接的写入打断而重来的次数上限，超过后改为一步完成
+MAX_RESTARTS = 3
+
+SNAPSHOT_SUFFIX = ".db"
+TIME_FORMAT = "%Y%m%d-%H%M%S-%f"  # 含微秒，连续备份（如恢复前的备份）不会重名
+
+
+class _Restarted(Exception):
+    pass
+
+
+def snapshot_dir(database_path, backup_dir=None) -> str:
+    """快照目录，默认为数据库所在目录下的 backups/"""
+    return backup_dir or os.path.join(os.path.dirname(os.path.abspath(database_path)), BACKUP_DIR)
+
+
+def integrity_check(path) -> str:
+    """对数据库文件执行 PRAGMA integrity_check，返回 'ok' 或第一条错误信息"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def backup(database_path, backup_dir=None, pages: int = PAGES_PER_STEP, sleep: float = STEP_SLEEP) -> dict:
+    """
+    在线热备份：使用 sqlite3 备份 API 分步复制到快照文件，并校验完整性
+
+    快照先写入 .partial 临时文件，校验通过后再改名，目录中只会出现完整可用的快照。
+
+    参数:
+        database_path: 数据库路径
+        backup_dir: 快照目录，默认见 snapshot_dir
+        pages: 每步复制的页数
+        sleep: 步间等待秒数
+
+    返回:
+        dict: {"path", "size", "seconds", "steps", "restarts", "single_step", "max_step_ms",
+               "total_step_ms", "integrity"}；max_step_ms / total_step_ms 为单步与累计持有源库锁的时间，
+               single_step 表示因反复重来而改为一步完成
+
+    异常:
+        sqlite3.Error: 备份失败或快照未通过完整性校验（临时文件会被删除）
+    """
+    directory = snapshot_dir(database_path, backup_dir)
+    os.makedirs(directory, exist_ok=True)
+    name = os.path.splitext(os.path.basename(database_path))[0]
+    path = os.path.join(directory, f"{name}-{datetime.now().strftime(TIME_FORMAT)}{SNAPSHOT_SUFFIX}")
+    partial = path + ".partial"
+
+    steps = []
+    last = None
+    restarts = 0
+    previous = None
+
+    def progress(status, remaining, total):
+        # 回调在每步完成后调用，两次回调间隔减去步间等待即为该步耗时
+        nonlocal last, restarts, previous
+        now = time.perf_counter()
+        steps.append(max(now - last - (sleep if steps else 0.0), 0.0))
+        last = now
+        # 其他连接在步间写入会使备份从头开始（remaining 回升）
+        if previous is not None and remaining > previous:
+            restarts += 1
+            if restarts > MAX_RESTARTS:
+                raise _Restarted
+        previous = remaining
+
+    started = time.perf_counter()
+    source = data_connect.get_pool(database_path).connect()
+    target = sqlite3.connect(partial)
+    try:
+        last = time.perf_counter()
+        try:
+            source.backup(target, pages=pages, progress=progress, sleep=sleep)
+        except _Restarted:
+            # 写入频繁时分步备份可能一直重来，改为一步完成：
+            # WAL 模式下一步备份只持有读事务，写入仍可继续
+            pages = -1
+            last = time.perf_counter()
+            source.backup(target, pages=-1, progress=progress)
+        # 快照作为独立文件保存，不使用 WAL
+        target.execute("PRAGMA journal_mode = DELETE")
+        target.close()
+        result = integrity_check(partial)
+        if result != "ok":
+            raise sqlite3.DatabaseError(f"快照完整性校验失败: {result}")
+        os.replace(partial, path)
+    except BaseException:
+        target.close()
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    finally:
+        source.close()
+
+    return {
+        "path": path,
+        "size": os.path.getsize(path),
+        "seconds": time.perf_counter() - started,
+        "steps": len(steps),
+        "restarts": restarts,
+        "single_step": pages == -1,
+        "max_step_ms": max(steps, default=0.0) * 1000,
+        "total_step_ms": sum(steps) * 1000,
+        "integrity": result,
+    }
+
+
+def list_snapshots(database_path, backup_dir=None) -> list:
+    """
+    列出快照，最新的在前
+
+    返回:
+        list[dict]: [{"path", "name", "size", "created"}, ...]
+    """
+    directory = snapshot_dir(database_path, backup_dir)
+    if not os.path.isdir(directory):
+        return []
+    prefix = os.path.splitext(os.path.basename(database_path))[0] + "-"
+    snapshots = []
+    for entry in os.scandir(directory):
+        if entry.name.startswith(prefix) and entry.name.endswith(SNAPSHOT_SUFFIX):
+            try:
+                created = datetime.strptime(entry.name[len(prefix):-len(SNAPSHOT_SUFFIX)], TIME_FORMAT)
+            except ValueError:
+                continue
+            snapshots.append({"path": entry.path, "name": entry.name, "size": entry.stat().st_size,
+                              "created": created})
+    return sorted(snapshots, key=lambda snapshot: snapshot["created"], reverse=True)
+
+
+def rotate(database_path, backup_dir=None, keep: int = KEEP) -> list:
+    """只保留最新的 keep 个快照，返回被删除的文件路径"""
+    removed = []
+    for snapshot in list_snapshots(database_path, backup_dir)[keep:]:
+        os.remove(snapshot["path"])
+        removed.append(snapshot["path"])
+    return removed
+
+
+def restore(database_path, snapshot_path, backup_dir=None) -> dict:
+    """
+    从快照恢复数据库
+
+    先校验快照完整性，再为当前数据库做一次备份（恢复出错时可以找回），然后通过备份 API
+    将快照整体写回在线数据库。写回期间其他连接会在 busy_timeout 内等待。恢复后重新执行
+    schema 迁移（快照可能来自旧版本），并通知所有表的缓存失效。
+
+    返回:
+        dict: {"safety_backup": 恢复前的备份路径, "seconds": 耗时}
+
+    异常:
+        sqlite3.Error: 快照损坏或恢复失败
+    """
+    result = integrity_check(snapshot_path)
+    if result != "ok":
+        raise sqlite3.DatabaseError(f"快照完整性校验失败: {result}")
+
+    started = time.perf_counter()
+    safety = backup(database_path, backup_dir)
+    source = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+    target = data_connect.get_pool(database_path).connect()
+    try:
+        source.backup(target)
+        runner.migrate(target)
+        tables = [row[0] for row in target.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    finally:
+        source.close()
+        target.close()
+
+    for table_name in tables:
+        data_connect.notify_change(database_path, table_name)
+    return {"safety_backup": safety["path"], "seconds": time.perf_counter() - started}
+
+
+class BackupScheduler:
+    """
+    后台定时备份线程
+
+    距最新快照每满 interval 秒执行一次 backup() 和 rotate()；失败时记录错误，下个周期继续。
+    last 保存最近一次的结果（或 {"error": ...}）。
+    """
+
+    def __init__(self, database_path, interval: float = INTERVAL, keep: int = KEEP, backup_dir=None):
+        self.database_path = database_path
+        self.interval = interval
+        self.keep = keep
+        self.backup_dir = backup_dir
+        self.last = None
+        # 进程重启后沿用已有快照的时间，最新快照已超过一个周期（或没有快照）时立即备份
+        snapshots = list_snapshots(database_path, backup_dir)
+        latest = snapshots[0]["created"].timestamp() if snapshots else 0
+        self.next_run = max(latest + interval, time.time())
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="sqlite-backup", daemon=True)
+        self._thread.start()
+
+    def run_now(self) -> dict:
+        """立即执行一次备份和轮换（与定时任务互斥）"""
+        with self._lock:
+            try:
+                result = backup(self.database_path, self.backup_dir)
+                result["removed"] = rotate(self.database_path, self.backup_dir, self.keep)
+            except (sqlite3.Error, OSError) as e:
+                print(f"备份失败: {str(e)}")
+                result = {"error": str(e)}
+            result["finished"] = datetime.now()
+            self.last = result
+            return result
+
+    def _run(self):
+        while not self._stop.wait(max(self.next_run - time.time(), 0)):
+            self.run_now()
+            self.next_run = time.time() + self.interval
+
+    def stop(self, timeout: float = 10):
+        self._stop.set()
+        self._thread.join(timeout)
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def start_scheduler(database_path, interval: float = INTERVAL, keep: int = KEEP, backup_dir=None) -> BackupScheduler:
+    """启动（或返回已启动的）数据库定时备份线程"""
+    key = os.path.abspath(database_path)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = _schedulers[key] = BackupScheduler(database_path, interval, keep, backup_dir)
+    return scheduler
+
+
+def get_scheduler(database_path):
+    """返回已启动的定时备份线程，未启动时返回 None"""
+    return _schedulers.get(os.path.abspath(database_path))
+
+
+@atexit.register
+def stop_all():
+    with _schedulers_lock:
+        for scheduler in _schedulers.values():
+            scheduler.stop()
+        _schedulers.clear()
@@ -1,8 +1,11 @@
+import json
 import sqlite3
 
 import pandas as pd
+from my_model.db_sqlite import data_connect, data_trace
 
 
+@data_trace.helper
 def check_existence(database_path, table_name, conditions=None, match_all=True):
     """
     Query SQLite database for records matching conditions and return as DataFrame.
@@ -42,12 +45,31 @@ def check_existence(database_path, table_name, conditions=None, match_all=True):
 
     # Execute query and return results
     try:
-        with sqlite3.connect(database_path) as conn:
+        with data_connect.connection(database_path) as conn:
             return pd.read_sql_query(sql, conn, params=params)
     except (sqlite3.Error, pd.errors.DatabaseError):
         return pd.DataFrame()
 
 
+@data_trace.helper
+def existing_ids(cursor, table_name, ids):
+    """
+    在已打开的连接/游标上查询 ids 中实际存在的记录ID
+
+    通过 json_each 传入整组ID，不受 SQL 参数个数限制。
+
+    Args:
+        cursor: sqlite3 连接或游标
+        table_name (str): 表名
+        ids (list[int]): 待检查的ID列表
+
+    Returns:
+        list[int]: 存在的ID，按ID排序
+    """
+    sql = f'SELECT id FROM "{table_name}" WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id'
+    return [row[0] for row in cursor.execute(sql, (json.dumps([int(i) for i in ids]),))]
+
+
 # # 使用示例
 # if __name__ == "__main__":
 #     try:
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from queue import LifoQueue, Empty, Full
+
+from my_model.db_sqlite import data_trace
+from my_model.db_sqlite.migrations import runner
+
+# 每个新连接只执行一次的调优参数
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",  # 读写互不阻塞
+    "PRAGMA synchronous = NORMAL",  # WAL 模式下 NORMAL 已足够安全
+    "PRAGMA mmap_size = 268435456",  # 256MB 内存映射，减少 read 系统调用
+    "PRAGMA cache_size = -16000",  # 每个连接约 16MB 页缓存
+    "PRAGMA busy_timeout = 5000",  # 遇到写锁时等待 5 秒而不是立即报错
+    "PRAGMA temp_store = MEMORY",
+)
+
+# 每个数据库最多保留的空闲连接数
+POOL_SIZE = 8
+
+
+class ConnectionPool:
+    """
+    单个 SQLite 数据库的连接池
+
+    连接在创建时应用一次 PRAGMAS，用完后归还池中复用，避免每次调用都重新
+    建立连接和预热页缓存。池中第一个连接建立时执行 schema 迁移，之后的读写
+    都可以假定表结构已是最新版本。同一线程内嵌套借用时返回同一个连接，因此外层
+    transaction() 中调用的其他辅助函数会自动加入同一个事务。
+    """
+
+    def __init__(self, database_path: str, size: int = POOL_SIZE):
+        self.database_path = database_path
+        self.size = size
+        self._idle = LifoQueue(maxsize=size)
+        self._local = threading.local()
+        self._migrated = False
+        self._migrate_lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        """新建一个已调优的连接（不归还池中，供需要独占连接的调用方使用）"""
+        # isolation_level=None：由 transaction() 显式控制事务边界
+        # check_same_thread=False：Streamlit 每次重跑可能换线程，连接需要跨线程复用
+        # TracedConnection：开启查询追踪时记录每条查询（见 data_trace），未开启时几乎没有开销
+        conn = sqlite3.connect(
+            self.database_path, timeout=5, isolation_level=None, check_same_thread=False,
+            factory=data_trace.TracedConnection
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        if not self._migrated:
+            with self._migrate_lock:
+                if not self._migrated:
+                    runner.migrate(conn)
+                    self._migrated = True
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """借出一个连接，退出时归还；同一线程内可重入"""
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        try:
+            conn = self._idle.get_nowait()
+        except Empty:
+            conn = self.connect()
+
+        local.conn = conn
+        try:
+            yield conn
+        finally:
+            local.conn = None
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except Full:
+                conn.close()
+
+    def in_transaction(self) -> bool:
+        """当前线程是否借用着连接并处于事务中"""
+        conn = getattr(self._local, "conn", None)
+        return conn is not None and conn.in_transaction
+
+    @contextmanager
+    def transaction(self):
+        """在一个写事务中执行，正常退出提交，异常回滚；嵌套调用并入外层事务"""
+        with self.connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+
+            # IMMEDIATE 在事务开始时即获取写锁，避免读后升级写锁时的死锁
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.pending = []
+            try:
+                yield conn
+            except BaseException:
+                self._local.pending = None
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+                # 事务提交后才通知变更，回滚的修改不会使缓存失效
+                pending, self._local.pending = self._local.pending, None
+                for table_name in dict.fromkeys(pending):
+                    _notify(self.database_path, table_name)
+
+    def defer_notification(self, table_name: str) -> bool:
+        """当前线程处于事务中时，将变更通知推迟到提交之后，返回是否已推迟"""
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            return False
+        pending.append(table_name)
+        return True
+
+    def close(self):
+        """关闭池中所有空闲连接"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# 数据变更监听函数列表，签名为 listener(database_path, table_name)
+_listeners = []
+
+
+def get_pool(database_path: str) -> ConnectionPool:
+    """获取（必要时创建）数据库对应的进程级连接池"""
+    key = os.path.abspath(database_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(database_path)
+    return pool
+
+
+def connection(database_path: str):
+    """
+    从连接池借用连接的上下文管理器
+
+    用法:
+        with data_connect.connection("doctor_info.db") as conn:
+            conn.execute(...)
+    """
+    return get_pool(database_path).connection()
+
+
+def transaction(database_path: str):
+    """
+    事务上下文管理器，正常退出自动提交，异常自动回滚
+
+    用法:
+        with data_connect.transaction("doctor_info.db") as conn:
+            conn.execute("UPDATE ...")
+    """
+    return get_pool(database_path).transaction()
+
+
+def add_listener(listener):
+    """注册数据变更监听函数，写入辅助函数提交成功后会调用它（用于缓存失效）"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _notify(database_path: str, table_name: str):
+    for listener in _listeners:
+        listener(database_path, table_name)
+
+
+def notify_change(database_path: str, table_name: str):
+    """通知所有监听函数：table_name 表的数据已变更；在外层事务中调用时等到提交后再通知"""
+    if not get_pool(database_path).defer_notification(table_name):
+        _notify(database_path, table_name)
+
+
+def close_all():
+    """关闭所有连接池中的空闲连接（测试或进程退出时使用）"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
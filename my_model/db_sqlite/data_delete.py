@@ -1,7 +1,9 @@
 # 用python写一个delete函数，控制sqlite数据库删除一行数据，参数为数据库名database_path, 表名table_name，id
 import sqlite3
+from my_model.db_sqlite import data_connect, data_check, data_fts, data_writer, data_trace
 
 
+@data_trace.helper
 def delete_data(database_path, table_name, id):
     """
     从SQLite数据库中删除指定表的一行数据
@@ -14,35 +16,65 @@ def delete_data(database_path, table_name, id):
     返回:
         bool: 成功删除返回True，失败返回False
     """
-    conn = None
+    # 使用参数化查询防止SQL注入
+    query = f"DELETE FROM {table_name} WHERE id = ?"
+
+    def delete(conn):
+        # 删除记录前先用其文本从逐字全文索引中删除
+        if data_fts.tracks(table_name):
+            data_fts.remove(conn, [id])
+        return conn.execute(query, (id,)).rowcount
+
     try:
-        # 连接到数据库
-        conn = sqlite3.connect(database_path)
-        cursor = conn.cursor()
-
-        # 使用参数化查询防止SQL注入
-        query = f"DELETE FROM {table_name} WHERE id = ?"
-        cursor.execute(query, (id,))
-
-        # 检查是否成功删除
-        if cursor.rowcount > 0:
-            # 提交事务
-            conn.commit()
-            return True
-        else:
-            # 未找到记录，回滚事务
-            conn.rollback()
-            return False
+        rowcount = data_writer.run(database_path, delete)
 
     except sqlite3.Error as e:
         print(f"数据库错误: {e}")
-        if conn:
-            conn.rollback()
         return False
-    finally:
-        # 关闭连接
-        if conn:
-            conn.close()
+
+    # 检查是否成功删除
+    if rowcount > 0:
+        data_connect.notify_change(database_path, table_name)
+        return True
+    return False
+
+
+@data_trace.helper
+def delete_many(database_path, table_name, ids):
+    """
+    在一个事务中用 executemany 删除多行数据
+
+    参数:
+        database_path (str): 数据库文件路径
+        table_name (str): 目标表名称
+        ids (Iterable[int]): 要删除的数据行的ID
+
+    返回:
+        dict: {id: bool}，每个ID是否删除成功（记录不存在或事务失败为False）
+    """
+    ids = [int(i) for i in ids]
+    results = {i: False for i in ids}
+    if not ids:
+        return results
+
+    def delete(conn):
+        existing = data_check.existing_ids(conn, table_name, ids)
+        if data_fts.tracks(table_name):
+            data_fts.remove(conn, existing)
+        conn.executemany(f"DELETE FROM {table_name} WHERE id = ?", [(i,) for i in existing])
+        return existing
+
+    try:
+        deleted = data_writer.run(database_path, delete)
+
+    except sqlite3.Error as e:
+        print(f"数据库错误: {e}")
+        return results
+
+    results.update(dict.fromkeys(deleted, True))
+    if deleted:
+        data_connect.notify_change(database_path, table_name)
+    return results
 
 
 # # 使用示例
@@ -0,0 +1,224 @@
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import time
+
+from my_model.db_sqlite import data_connect, data_query
+
+# 每次从游标取出并写入文件的行数，内存占用只与该值有关，与表的大小无关
+CHUNK_SIZE = 2000
+
+# 可导出的员工表列，密码永不导出
+STAFF_COLUMNS = ("id", "number", "name", "section", "state")
+
+# 格式 -> (扩展名, MIME 类型, 依赖的可选模块)
+FORMATS = {
+    "csv": (".csv", "text/csv", None),
+    "parquet": (".parquet", "application/vnd.apache.parquet", "pyarrow"),
+    "xlsx": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "openpyxl"),
+}
+
+
+def available_formats() -> list:
+    """返回当前环境可用的导出格式（Parquet 需要 pyarrow，XLSX 需要 openpyxl）"""
+    available = []
+    for fmt, (_, _, module) in FORMATS.items():
+        if module is not None:
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+        available.append(fmt)
+    return available
+
+
+def build_query(database_path, table_name, columns=None, **filters):
+    """
+    构建导出查询
+
+    doctor_forms 使用与分页查询相同的筛选条件（见 data_query.build_filters）和排序；
+    doctor_info 只支持按 section 筛选，且不能导出 password 列。
+
+    返回:
+        tuple[str, list, list[str]]: SQL、参数和列名
+
+    异常:
+        ValueError: 表不支持导出或请求了不允许的列
+    """
+    if table_name == data_query.FORM_TABLE:
+        allowed = data_query.table_columns(database_path)
+        clauses, params = data_query.build_filters(**filters)
+        order = "date DESC, id DESC"
+    elif table_name == "doctor_info":
+        allowed = STAFF_COLUMNS
+        clauses, params = [], []
+        if filters.get("section"):
+            clauses.append("section = ?")
+            params.append(filters["section"])
+        order = "id"
+    else:
+        raise ValueError(f"表 {table_name} 不支持导出")
+
+    columns = list(columns or allowed)
+    unknown = [column for column in columns if column not in allowed]
+    if unknown:
+        raise ValueError(f"表 {table_name} 中不能导出列: {', '.join(unknown)}")
+
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"SELECT {', '.join(columns)} FROM {table_name}{where} ORDER BY {order}", params, columns
+
+
+def iter_chunks(database_path, sql, params, chunk_size: int = CHUNK_SIZE):
+    """
+    逐块产出查询结果（元组列表）
+
+    使用独占连接而不是池中的连接：生成器可能在其他线程中被消费
+    （例如流式响应），结束或被关闭时连接随之关闭。
+    """
+    conn = data_connect.get_pool(database_path).connect()
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+
+def stream_csv(database_path, table_name, columns=None, chunk_size: int = CHUNK_SIZE, **filters):
+    """逐块产出 CSV 的 UTF-8 字节（带 BOM 以便 Excel 直接打开），适合流式响应"""
+    sql, params, columns = build_query(database_path, table_name, columns, **filters)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    for rows in iter_chunks(database_path, sql, params, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _write_csv(path, columns, chunks):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+
+
+def _write_parquet(path, columns, chunks, types):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # 按声明类型确定 schema，避免首块中全为空的列被推断成 null 类型
+    def arrow_type(declared):
+        declared = declared.upper()
+        if "INT" in declared:
+            return pa.int64()
+        if any(word in declared for word in ("REAL", "FLOA", "DOUB")):
+            return pa.float64()
+        return pa.string()
+
+    schema = pa.schema([(column, arrow_type(types.get(column, ""))) for column in columns])
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            data = list(zip(*rows))
+            writer.write_table(pa.table(
+                [pa.array(values, type=field.type) for values, field in zip(data, schema)], schema=schema
+            ))
+
+
+def _write_xlsx(path, columns, chunks):
+    from openpyxl import Workbook
+
+    # write_only 模式逐行写入临时文件，不在内存中保留整张工作表
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(columns)
+    for rows in chunks:
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+
+
+def export_file(database_path, table_name, fmt="csv", path=None, columns=None, chunk_size: int = CHUNK_SIZE,
+                **filters) -> dict:
+    """
+    将查询结果按块写入文件
+
+    参数:
+        database_path: 数据库路径
+        table_name: doctor_forms 或 doctor_info
+        fmt: csv / parquet / xlsx
+        path: 输出路径，None 时写入临时文件（由调用方负责删除）
+        columns: 导出的列，默认为全部可导出列
+        chunk_size: 每块行数
+        **filters: 筛选条件，见 build_query
+
+    返回:
+        dict: {"path": 文件路径, "rows": 行数, "seconds": 耗时}
+
+    异常:
+        ValueError: 格式或查询参数无效
+        ImportError: 所需的可选依赖未安装
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    suffix, _, module = FORMATS[fmt]
+    if module is not None and fmt not in available_formats():
+        raise ImportError(f"导出 {fmt} 需要安装 {module}")
+
+    sql, params, columns = build_query(database_path, table_name, columns, **filters)
+    created = path is None
+    if created:
+        handle, path = tempfile.mkstemp(prefix=f"{table_name}_", suffix=suffix)
+        os.close(handle)
+
+    started = time.perf_counter()
+    rows = 0
+
+    def counted():
+        nonlocal rows
+        for chunk in iter_chunks(database_path, sql, params, chunk_size):
+            rows += len(chunk)
+            yield chunk
+
+    try:
+        if fmt == "csv":
+            _write_csv(path, columns, counted())
+        elif fmt == "parquet":
+            with data_connect.connection(database_path) as conn:
+                types = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+            _write_parquet(path, columns, counted(), types)
+        else:
+            _write_xlsx(path, columns, counted())
+    except BaseException:
+        # 写入失败时删除本函数创建的临时文件，调用方拿不到路径也就无法删除
+        if created and os.path.exists(path):
+            os.unlink(path)
+        raise
+    return {"path": path, "rows": rows, "seconds": time.perf_counter() - started}
+
+
+@contextlib.contextmanager
+def open_export(database_path, table_name, fmt="csv", columns=None, **filters):
+    """
+    按块导出到临时文件并以二进制方式打开，退出时关闭并删除临时文件
+
+    文件对象可直接交给 st.download_button；导出过程不在内存中保留整张表。
+
+    用法:
+        with data_export.open_export("doctor_info.db", "doctor_info", "csv") as (f, result):
+            st.download_button("下载", f, file_name="doctor_info.csv")
+    """
+    result = export_file(database_path, table_name, fmt, columns=columns, **filters)
+    try:
+        with open(result["path"], "rb") as f:
+            yield f, result
+    finally:
+        os.remove(result["path"])
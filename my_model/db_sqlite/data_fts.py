@@ -0,0 +1,68 @@
+import json
+
+# 逐字全文索引：trigram 分词器只能检索 3 个字以上的片段，而常见的中文医学术语多为两个字
+# （骨折、贫血、癫痫）。逐字索引表中每个字是一个词元，两个字的关键词按短语检索相邻的两个字。
+# 文本在写入索引前在字与字之间插入空格，默认的 unicode61 分词器据此按字切分。
+#
+# 索引由应用的写入路径维护（data_insert / data_update / data_delete 在写线程的同一事务中调用
+# add / remove），不使用触发器：触发器中不能调用应用注册的 SQL 函数，否则 sqlite3 命令行、
+# 备份恢复工具等其他连接写入 doctor_forms 时会报 no such function。
+# 绕过这些辅助函数直接写入 doctor_forms 后，需要调用 rebuild 重建索引。
+FORM_TABLE = "doctor_forms"
+CHARS_TABLE = "doctor_forms_chars"
+COLUMNS = ("diagnosis", "surgery", "opinion", "risk_disclosure", "user_input", "final_opinion")
+
+_COLUMNS = ", ".join(COLUMNS)
+_INSERT = f"INSERT INTO {CHARS_TABLE}(rowid, {_COLUMNS}) VALUES (?{', ?' * len(COLUMNS)})"
+_DELETE = f"INSERT INTO {CHARS_TABLE}({CHARS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', ?{', ?' * len(COLUMNS)})"
+
+
+def chars(text):
+    """字与字之间插入空格，例如 '肾衰竭' -> '肾 衰 竭'"""
+    if text is None:
+        return None
+    return " ".join(str(text))
+
+
+def phrase(term: str) -> str:
+    """关键词转换为逐字索引的短语查询，双引号需要转义为两个双引号"""
+    return '"' + chars(term.replace('"', '""')) + '"'
+
+
+def tracks(table_name, columns=COLUMNS) -> bool:
+    """写入 table_name 的 columns 列时是否需要维护逐字索引"""
+    return table_name == FORM_TABLE and not set(columns).isdisjoint(COLUMNS)
+
+
+def _entries(rows):
+    return [(row[0], *map(chars, row[1:])) for row in rows]
+
+
+def _rows(conn, ids):
+    sql = f"SELECT id, {_COLUMNS} FROM {FORM_TABLE} WHERE id IN (SELECT value FROM json_each(?))"
+    return conn.execute(sql, (json.dumps([int(i) for i in ids]),)).fetchall()
+
+
+def remove(conn, ids):
+    """
+    在修改或删除记录之前调用：按记录当前的文本从索引中删除
+
+    索引表不保存内容（content=''），删除时必须提供与写入时相同的词元。
+    """
+    conn.executemany(_DELETE, _entries(_rows(conn, ids)))
+
+
+def add(conn, ids):
+    """在插入或修改记录之后调用：按记录当前的文本写入索引（已删除的记录被忽略）"""
+    conn.executemany(_INSERT, _entries(_rows(conn, ids)))
+
+
+def rebuild(conn, batch: int = 10000):
+    """按 doctor_forms 的当前内容重建整个索引，分批读取，内存占用与表的大小无关"""
+    conn.execute(f"INSERT INTO {CHARS_TABLE}({CHARS_TABLE}) VALUES ('delete-all')")
+    cursor = conn.execute(f"SELECT id, {_COLUMNS} FROM {FORM_TABLE}")
+    while True:
+        rows = cursor.fetchmany(batch)
+        if not rows:
+            break
+        conn.executemany(_INSERT, _entries(rows))
@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+from my_model.db_sqlite import data_connect, data_writer
+from my_model.all_user import credential
+from my_data.user_data import hospital_basic
+
+STAFF_TABLE = "doctor_info"
+
+# 每批读取、校验并在一个事务中写入的行数
+CHUNK_SIZE = 500
+
+# 人事导出表格中常见的列名 -> doctor_info 列名
+COLUMN_ALIASES = {
+    "员工号": "number", "工号": "number", "number": "number",
+    "姓名": "name", "name": "name",
+    "科室": "section", "部门": "section", "section": "section",
+    "密码": "password", "password": "password",
+}
+REQUIRED_COLUMNS = ("number", "name", "section")
+
+# 导入后的账号默认直接激活（人事名单无需再走准入审核），未提供密码时使用初始密码
+DEFAULT_STATE = 0
+INITIAL_PASSWORD = "1"
+
+# 逐行报告中的处理结果
+INSERTED = "新增"
+UPDATED = "更新"
+UNCHANGED = "未变"
+INVALID = "错误"
+
+INSERT_SQL = f"INSERT INTO {STAFF_TABLE} (number, name, section, password, state) VALUES (?, ?, ?, ?, ?)"
+UPDATE_SQL = f"UPDATE {STAFF_TABLE} SET name = ?, section = ? WHERE number = ?"
+
+
+def _source_name(source) -> str:
+    return source if isinstance(source, str) else getattr(source, "name", "")
+
+
+def read_chunks(source, chunk_size: int = CHUNK_SIZE):
+    """
+    按块读取 CSV/XLSX 花名册，逐块产出列名已统一的 DataFrame（所有值为字符串）
+
+    参数:
+        source: 文件路径或带 name 属性的文件对象（如 st.file_uploader 的返回值）
+        chunk_size: 每块行数
+
+    异常:
+        ValueError: 文件类型不支持或缺少必需列
+        ImportError: 读取 XLSX 但未安装 openpyxl
+    """
+    name = _source_name(source).lower()
+    if name.endswith(".xlsx"):
+        chunks = _read_xlsx_chunks(source, chunk_size)
+    elif name.endswith(".csv") or not name:
+        # utf-8-sig 兼容 Excel 另存为 CSV 时写入的 BOM
+        chunks = pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_size, encoding="utf-8-sig")
+    else:
+        raise ValueError(f"不支持的文件类型: {name}，请使用 CSV 或 XLSX")
+
+    for chunk in chunks:
+        chunk = chunk.rename(columns=lambda column: COLUMN_ALIASES.get(str(column).strip(), str(column).strip()))
+        missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"缺少必需列: {', '.join(missing)}")
+        yield chunk
+
+
+def _read_xlsx_chunks(source, chunk_size):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("读取 XLSX 需要安装 openpyxl，或将表格另存为 CSV") from None
+
+    # read_only 模式按行流式读取，不把整个工作簿载入内存
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(value).strip() if value is not None else "" for value in next(rows, ())]
+        chunk = []
+        for row in rows:
+            chunk.append(["" if value is None else str(value).strip() for value in row])
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def validate_chunk(chunk: pd.DataFrame, first_row: int, seen: set):
+    """
+    校验一块数据
+
+    参数:
+        chunk: read_chunks 产出的 DataFrame
+        first_row: 该块第一行在文件中的行号（表头为第1行）
+        seen: 已出现过的员工号，用于发现文件内重复（会被更新）
+
+    返回:
+        tuple: (有效记录列表, 错误报告列表)；有效记录为 {row, number, name, section, password}
+    """
+    sections = set(hospital_basic.section)
+    has_password = "password" in chunk.columns
+    records, errors = [], []
+    for offset, row in enumerate(chunk.itertuples(index=False)):
+        line = first_row + offset
+        number = str(row.number).strip()
+        name = "".join(str(row.name).split())
+        section = str(row.section).strip()
+        password = str(row.password).strip() if has_password else ""
+
+        if not (number.isdigit() and len(number) == 5):
+            message = "员工号必须是5位数字"
+        elif not name:
+            message = "姓名不能为空"
+        elif section not in sections:
+            message = f"科室不在科室列表中: {section}"
+        elif password and not password.isdigit():
+            # 与登录时的校验一致，否则导入的账号无法登录
+            message = "密码必须为数字"
+        elif int(number) in seen:
+            message = "员工号在文件中重复"
+        else:
+            seen.add(int(number))
+            records.append({"row": line, "number": int(number), "name": name, "section": section,
+                            "password": password})
+            continue
+        errors.append({"row": line, "number": number, "name": name, "status": INVALID, "message": message})
+    return records, errors
+
+
+def _existing(conn, numbers) -> dict:
+    """通过 number 唯一索引一次查出已存在的员工 {number: (name, section)}"""
+    sql = f"SELECT number, name, section FROM {STAFF_TABLE} WHERE number IN (SELECT value FROM json_each(?))"
+    return {number: (name, section) for number, name, section in conn.execute(sql, (json.dumps(numbers),))}
+
+
+def _compare(existing, records) -> list:
+    """与已有记录 {number: (name, section)} 比对，返回逐行报告"""
+    report = []
+    for record in records:
+        current = existing.get(record["number"])
+        if current is None:
+            status, message = INSERTED, ""
+        elif current == (record["name"], record["section"]):
+            status, message = UNCHANGED, ""
+        else:
+            status, message = UPDATED, f"原为 {current[0]}（{current[1]}）"
+        report.append({"row": record["row"], "number": record["number"], "name": record["name"],
+                       "status": status, "message": message})
+    return report
+
+
+def _write_chunk(conn, records):
+    """在写线程的事务中重新比对已有记录并写入一块数据，返回逐行报告"""
+    report = _compare(_existing(conn, [record["number"] for record in records]), records)
+    inserted, updated = [], []
+    for record, line in zip(records, report):
+        if line["status"] == INSERTED:
+            # 比对后才被删除的员工没有预先计算哈希，在此补算
+            password_hash = record.get("hash") or credential.make_hash(record["password"] or INITIAL_PASSWORD)
+            inserted.append((record["number"], record["name"], record["section"], password_hash, DEFAULT_STATE))
+        elif line["status"] == UPDATED:
+            updated.append((record["name"], record["section"], record["number"]))
+    if inserted:
+        conn.executemany(INSERT_SQL, inserted)
+    if updated:
+        conn.executemany(UPDATE_SQL, updated)
+    return report
+
+
+def import_roster(database_path, source, chunk_size: int = CHUNK_SIZE, dry_run: bool = False, progress=None) -> dict:
+    """
+    导入人事花名册：按块读取、校验，按员工号新增或更新 doctor_info
+
+    每块数据先在读连接上查出已存在的员工，只为新员工计算密码哈希，再在写线程的一个事务中
+    重新比对并写入。已存在的员工只更新姓名和科室，不修改其密码和状态；新员工直接激活，
+    密码取表格中的密码列，缺省为初始密码。dry_run 只在读连接上比对，不进入写线程。
+
+    参数:
+        database_path: 数据库路径
+        source: 文件路径或文件对象，见 read_chunks
+        chunk_size: 每块行数
+        dry_run: 为 True 时只校验和比对，不写入数据库
+        progress: 可选回调 progress(已处理行数)，每块处理完后调用
+
+    返回:
+        dict: {"report": 逐行报告 DataFrame, "counts": {结果: 行数}, "rows": 总行数,
+               "seconds": 耗时, "rows_per_second": 每秒处理行数}
+    """
+    started = time.perf_counter()
+    initial_hash = None
+    seen = set()
+    report = []
+    rows = 0
+    for chunk in read_chunks(source, chunk_size):
+        records, errors = validate_chunk(chunk, rows + 2, seen)
+        rows += len(chunk)
+        report += errors
+
+        if records:
+            with data_connect.connection(database_path) as conn:
+                existing = _existing(conn, [record["number"] for record in records])
+            if dry_run:
+                report += _compare(existing, records)
+            else:
+                # 只为新员工计算哈希：初始密码每次导入只计算一次，表格中提供的密码在线程池中并行计算
+                added = [record for record in records if record["number"] not in existing]
+                if initial_hash is None and any(not record["password"] for record in added):
+                    initial_hash = credential.make_hash(INITIAL_PASSWORD)
+                futures = {record["row"]: credential.hash_password(record["password"])
+                           for record in added if record["password"]}
+                for record in added:
+                    record["hash"] = futures[record["row"]].result() if record["row"] in futures else initial_hash
+                report += data_writer.run(database_path, _write_chunk, records)
+        if progress is not None:
+            progress(rows)
+
+    if not dry_run:
+        data_connect.notify_change(database_path, STAFF_TABLE)
+
+    seconds = time.perf_counter() - started
+    frame = pd.DataFrame(report, columns=["row", "number", "name", "status", "message"]).sort_values("row")
+    return {
+        "report": frame.reset_index(drop=True),
+        "counts": frame["status"].value_counts().to_dict(),
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    # 用法: python -m my_model.db_sqlite.data_import roster.csv --database doctor_info.db --report report.csv
+    parser = argparse.ArgumentParser(description="导入人事花名册到 doctor_info")
+    parser.add_argument("source", help="CSV 或 XLSX 文件，需包含 员工号、姓名、科室 列")
+    parser.add_argument("--database", default="doctor_info.db")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="只校验和比对，不写入")
+    parser.add_argument("--report", help="逐行报告输出的 CSV 路径")
+    args = parser.parse_args()
+
+    result = import_roster(args.database, os.path.abspath(args.source), args.chunk_size, args.dry_run,
+                           progress=lambda done: print(f"已处理 {done} 行", flush=True))
+    if args.report:
+        result["report"].to_csv(args.report, index=False, encoding="utf-8-sig")
+    print(f"共 {result['rows']} 行，{result['counts']}，"
+          f"耗时 {result['seconds']:.2f} 秒（{result['rows_per_second']:.0f} 行/秒）")
@@ -1,16 +1,20 @@
 import json
-import sqlite3
+from my_model.db_sqlite import data_connect, data_fts, data_sequence, data_writer, data_trace
 
 
+@data_trace.helper
 def insert_into_table(database_path, table_name, data, id_column='id'):
     """
-    向SQLite表插入数据，并将自增ID存储到指定列（如果表不存在则自动创建）
+    向SQLite表插入数据，返回自增ID
+
+    表结构由 migrations 在启动时建立，id_column 为 INTEGER PRIMARY KEY（即 rowid），
+    插入时不做表结构检查。
 
     参数:
         database_path: 数据库路径
         table_name: 目标表名
         data: 插入数据字典 {列名: 值}
-        id_column: 存储ID的列名（默认为'id')
+        id_column: 自增主键列名（默认为'id'），data 中的同名键会被忽略
 
     返回:
         插入记录的自增ID
@@ -21,87 +25,66 @@ def insert_into_table(database_path, table_name, data, id_column='id'):
     if not data:
         raise ValueError("数据字典不能为空")
 
-    # SQLite 类型映射
-    type_mapping = {
-        int: "INTEGER",
-        float: "REAL",
-        bool: "INTEGER",
-        str: "TEXT",
-        bytes: "BLOB",
-        type(None): "NULL"  # 处理 None 值
-    }
-
-    with sqlite3.connect(database_path) as conn:
-        cursor = conn.cursor()
-
-        # 检查表是否存在
-        cursor.execute("""
-            SELECT name 
-            FROM sqlite_master 
-            WHERE type='table' AND name=?
-        """, (table_name,))
-        table_exists = cursor.fetchone() is not None
-
-        # 预处理数据：将列表等非SQLite支持的类型转换为JSON字符串
-        processed_data = {}
-        for key, value in data.items():
-            if isinstance(value, (list, dict)):
-                processed_data[key] = json.dumps(value, ensure_ascii=False)  # 转换为JSON字符串
-            else:
-                processed_data[key] = value
-
-        # 如果表不存在，则创建表
-        if not table_exists:
-            # 创建列定义（排除ID列）
-            columns = []
-            for key, value in processed_data.items():
-                if key == id_column:
-                    continue
-                value_type = type(value)
-                sql_type = type_mapping.get(value_type, "TEXT")  # 默认使用 TEXT
-                columns.append(f"{key} {sql_type}")
-
-            # 添加自增主键列
-            if id_column:
-                columns.insert(0, f"{id_column} INTEGER PRIMARY KEY AUTOINCREMENT")
-
-            create_sql = f"""
-                CREATE TABLE {table_name} (
-                    {', '.join(columns)}
-                )
-            """
-            cursor.execute(create_sql)
-
-        # 准备插入数据（排除ID列）
-        data_insert = {k: v for k, v in processed_data.items() if k != id_column}
-        columns_str = ', '.join(data_insert.keys())
-        placeholders = ', '.join(['?'] * len(data_insert))
-
-        # 执行插入操作
-        insert_sql = f"""
-            INSERT INTO {table_name} (
-                {columns_str}
-            ) VALUES (
-                {placeholders}
-            )
-        """
-        cursor.execute(insert_sql, tuple(data_insert.values()))
-        last_row_id = cursor.lastrowid
-
-        # 将ID存储到指定列
-        if id_column and last_row_id is not None:
-            update_sql = f"""
-                UPDATE {table_name} 
-                SET {id_column} = ? 
-                WHERE rowid = ?
-            """
-            cursor.execute(update_sql, (last_row_id, last_row_id))
-
-        conn.commit()
+    # 预处理数据：将列表等非SQLite支持的类型转换为JSON字符串，并排除ID列
+    data_insert = {}
+    for key, value in data.items():
+        if key == id_column:
+            continue
+        if isinstance(value, (list, dict)):
+            data_insert[key] = json.dumps(value, ensure_ascii=False)  # 转换为JSON字符串
+        else:
+            data_insert[key] = value
+
+    columns_str = ', '.join(data_insert.keys())
+    placeholders = ', '.join(['?'] * len(data_insert))
+    insert_sql = f"""
+        INSERT INTO {table_name} (
+            {columns_str}
+        ) VALUES (
+            {placeholders}
+        )
+    """
+
+    indexed = data_fts.tracks(table_name, data_insert)
+
+    def insert(conn):
+        row_id = conn.execute(insert_sql, tuple(data_insert.values())).lastrowid
+        if indexed:
+            # 逐字全文索引与记录在同一事务中写入
+            data_fts.add(conn, [row_id])
+        return row_id
 
+    # 交给写线程执行插入操作
+    last_row_id = data_writer.run(database_path, insert)
+
+    data_connect.notify_change(database_path, table_name)
     return last_row_id
 
 
+@data_trace.helper
+def insert_form(database_path, data, per_department=False):
+    """
+    插入一条沟通记录（doctor_forms），在同一事务中分配 index_id 流水号
+
+    参数:
+        database_path: 数据库路径
+        data: 插入数据字典 {列名: 值}，其中的 index_id 会被覆盖
+        per_department: 为 True 时按 data['department'] 单独计数
+
+    返回:
+        tuple: (插入记录的自增ID, index_id)
+    """
+    department = data.get("department") if per_department else None
+
+    def insert(conn):
+        index_id = data_sequence.daily_index_id(conn, department=department)
+        # 嵌套调用在写线程的当前事务中直接执行，流水号与记录一起提交或回滚
+        row_id = insert_into_table(database_path, "doctor_forms", {**data, "index_id": index_id})
+        return row_id, index_id
+
+    return data_writer.run(database_path, insert)
+
+
 # # 使用示例
 # if __name__ == "__main__":
 #     try:
@@ -114,7 +97,7 @@ def insert_into_table(database_path, table_name, data, id_column='id'):
 #             "email": "zhangsan@example.com"
 #         }
 #
-#         # 插入数据（表不存在时会自动创建）
+#         # 插入数据（表结构由 migrations 建立）
 #         row_id = insert_into_table(db_path, table, user_data)
 #         print(f"成功插入记录，ID为: {row_id}")
 #
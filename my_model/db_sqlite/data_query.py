@@ -0,0 +1,115 @@
+import sqlite3
+from functools import lru_cache
+
+import pandas as pd
+from my_model.db_sqlite import data_connect, data_trace
+
+FORM_TABLE = "doctor_forms"
+
+# 列表页默认显示的列，避免读取大段的沟通记录文本
+DEFAULT_COLUMNS = ("index_id", "date", "department", "doctor", "patient_name", "risk_level", "surgery", "style")
+
+# 可以作为等值筛选条件的列（均有 (列, date, id) 复合索引）
+FILTER_COLUMNS = ("department", "doctor", "risk_level")
+
+PAGE_SIZE = 50
+
+
+@lru_cache(maxsize=None)
+def _table_columns(database_path, table_name):
+    with data_connect.connection(database_path) as conn:
+        return tuple(row[1] for row in conn.execute(f"PRAGMA table_info({table_name})"))
+
+
+@data_trace.helper
+def table_columns(database_path, table_name=FORM_TABLE):
+    """返回表的所有列名（进程内缓存，表结构由 migrations 管理）"""
+    return list(_table_columns(database_path, table_name))
+
+
+def build_filters(department=None, doctor=None, risk_level=None, date_from=None, date_to=None):
+    """
+    构建 doctor_forms 的筛选条件
+
+    参数:
+        department / doctor / risk_level: 等值筛选，None 或空字符串表示不筛选
+        date_from / date_to: 日期范围（含两端），接受 'YYYY-MM-DD' 字符串或 date 对象
+
+    返回:
+        tuple[list[str], list]: WHERE 子句列表和对应参数
+    """
+    clauses, params = [], []
+    for column, value in zip(FILTER_COLUMNS, (department, doctor, risk_level)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if date_from:
+        clauses.append("date >= ?")
+        params.append(str(date_from))
+    if date_to:
+        clauses.append("date <= ?")
+        params.append(str(date_to))
+    return clauses, params
+
+
+@data_trace.helper
+def query_forms(database_path, columns=None, after=None, limit=PAGE_SIZE, **filters):
+    """
+    按 (date, id) 倒序键集分页查询沟通记录
+
+    参数:
+        database_path (str): SQLite 数据库文件路径
+        columns (list[str]): 需要返回的列，默认为 DEFAULT_COLUMNS；id 和 date 总会返回
+        after (tuple): 上一页返回的游标 (date, id)，None 表示第一页
+        limit (int): 每页行数
+        **filters: 传给 build_filters 的筛选条件
+
+    返回:
+        tuple[pd.DataFrame, tuple]: 本页数据和下一页游标（没有下一页时为 None）
+
+    异常:
+        ValueError: 请求了表中不存在的列
+    """
+    known = table_columns(database_path)
+    columns = list(columns or DEFAULT_COLUMNS)
+    unknown = [column for column in columns if column not in known]
+    if unknown:
+        raise ValueError(f"表 {FORM_TABLE} 中不存在列: {', '.join(unknown)}")
+    columns = ["id", "date"] + [column for column in columns if column not in ("id", "date")]
+
+    clauses, params = build_filters(**filters)
+    if after is not None:
+        # 行值比较可以直接使用 (…, date, id) 索引做范围扫描
+        clauses.append("(date, id) < (?, ?)")
+        params.extend([after[0], int(after[1])])
+
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = (f"SELECT {', '.join(columns)} FROM {FORM_TABLE}{where} "
+           f"ORDER BY date DESC, id DESC LIMIT ?")
+    # 多取一行用于判断是否还有下一页
+    params.append(limit + 1)
+
+    try:
+        with data_connect.connection(database_path) as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        print(f"SQLite 错误: {str(e)}")
+        return pd.DataFrame(columns=columns), None
+
+    if len(df) <= limit:
+        return df, None
+    df = df.iloc[:limit]
+    last = df.iloc[-1]
+    return df, (last["date"], int(last["id"]))
+
+
+@data_trace.helper
+def distinct_values(database_path, column):
+    """返回筛选列的所有取值（沿复合索引去重），用于下拉选择"""
+    if column not in FILTER_COLUMNS:
+        raise ValueError(f"列 {column} 不是可筛选列")
+    with data_connect.connection(database_path) as conn:
+        rows = conn.execute(
+            f"SELECT DISTINCT {column} FROM {FORM_TABLE} WHERE {column} IS NOT NULL ORDER BY {column}"
+        )
+        return [row[0] for row in rows]
@@ -0,0 +1,171 @@
+import math
+import sqlite3
+
+import pandas as pd
+from my_model.db_sqlite import data_connect, data_fts, data_query, data_trace
+
+FTS_TABLE = "doctor_forms_fts"
+CHARS_TABLE = data_fts.CHARS_TABLE
+
+# 参与全文检索的列，与 migrations/v003_form_fts.py 中的索引列一致
+SEARCH_COLUMNS = ("diagnosis", "surgery", "opinion", "risk_disclosure", "user_input", "final_opinion")
+
+# 检索结果中随摘要一起返回的记录信息
+RESULT_COLUMNS = ("id", "index_id", "date", "department", "doctor", "patient_name", "risk_level")
+
+# trigram 分词器只能索引长度不少于 3 的片段，较短的关键词使用逐字索引（见 data_fts）
+MIN_INDEXED_LENGTH = 3
+
+# 只对最近的这么多条命中记录（按 id，即录入顺序）计算相关度，常见词命中几十万条时也不必全部打分；
+# 更早的命中记录不参与排序，页面上会说明这一范围。FTS5 的 bm25() 计算短语的文档频率时会遍历该短语的
+# 全部命中，因此相关度在候选记录内计算（见 _score）
+RANK_WINDOW = 1000
+# BM25 参数
+K1 = 1.2
+B = 0.75
+
+HIGHLIGHT_START = "**"
+HIGHLIGHT_END = "**"
+
+
+def _fts_phrase(term: str) -> str:
+    # 每个关键词作为一个短语，双引号需要转义为两个双引号
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _mark_terms(text: str, terms) -> str:
+    """用高亮标记包围文本中出现的关键词，相邻或重叠的命中合并为一段（如“骨 折”标记为 **骨折**）"""
+    spans = []
+    for term in set(terms):
+        start = text.find(term)
+        while term and start >= 0:
+            spans.append((start, start + len(term)))
+            start = text.find(term, start + 1)
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    parts, position = [], 0
+    for start, end in merged:
+        parts += [text[position:start], HIGHLIGHT_START, text[start:end], HIGHLIGHT_END]
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def _highlight(text: str, terms, width: int = 40) -> str:
+    """为 LIKE 检索的结果生成摘要：截取首个命中位置附近的文本并标记关键词"""
+    positions = [text.find(term) for term in terms if term in text]
+    start = max(0, min(positions) - width // 2) if positions else 0
+    snippet = _mark_terms(text[start:start + width], terms)
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + width < len(text) else ""
+    return prefix + snippet + suffix
+
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame(columns=list(RESULT_COLUMNS) + ["snippet", "score"])
+
+
+def _score(texts, terms) -> list:
+    """
+    候选记录的 BM25 相关度（取负值，越小越相关）
+
+    文档频率和平均长度取自候选记录本身，候选记录都是最近的命中，排序只需相对大小。
+    """
+    n = len(texts)
+    average = sum(len(text) for text in texts) / n or 1
+    scores = [0.0] * n
+    for term in terms:
+        counts = [text.count(term) for text in texts]
+        hits = sum(1 for count in counts if count)
+        idf = math.log((n - hits + 0.5) / (hits + 0.5) + 1)
+        for i, count in enumerate(counts):
+            if count:
+                scores[i] -= idf * count * (K1 + 1) / (count + K1 * (1 - B + B * len(texts[i]) / average))
+    return scores
+
+
+@data_trace.helper
+def search_forms(database_path, text, limit=20, **filters) -> pd.DataFrame:
+    """
+    全文检索沟通记录的诊断、手术、意见、风险告知等叙述性文本
+
+    以空白分隔多个关键词，所有关键词都必须命中（AND）。有长度不少于 3 的关键词时走 FTS5
+    trigram 索引，较短的关键词作为附加条件；全部关键词都较短（如两个字的中文词）时走逐字索引，
+    按短语检索。取最近的 RANK_WINDOW 条命中记录按 BM25 排序。
+
+    参数:
+        database_path (str): SQLite 数据库文件路径
+        text (str): 检索词
+        limit (int): 最多返回的记录数
+        **filters: 传给 data_query.build_filters 的筛选条件（科室、医生、风险等级、日期）
+
+    返回:
+        pd.DataFrame: RESULT_COLUMNS 加上 snippet（高亮摘要）和 score（越小越相关）
+    """
+    terms = text.split()
+    if not terms:
+        return _empty()
+
+    long_terms = [term for term in terms if len(term) >= MIN_INDEXED_LENGTH]
+    short_terms = [term for term in terms if len(term) < MIN_INDEXED_LENGTH]
+
+    clauses, params = data_query.build_filters(**filters)
+    # 逐字索引按字切分时会忽略标点，短语可能跨过标点命中，因此仍用 LIKE 核对较短的关键词
+    for term in short_terms:
+        pattern = _like_pattern(term)
+        clauses.append("(" + " OR ".join(f"f.{column} LIKE ? ESCAPE '\\'" for column in SEARCH_COLUMNS) + ")")
+        params.extend([pattern] * len(SEARCH_COLUMNS))
+
+    if long_terms:
+        table = FTS_TABLE
+        match = " AND ".join(_fts_phrase(term) for term in long_terms)
+    else:
+        table = CHARS_TABLE
+        match = " AND ".join(data_fts.phrase(term) for term in short_terms)
+
+    columns = ", ".join(f"f.{column}" for column in RESULT_COLUMNS + SEARCH_COLUMNS)
+    where = " AND ".join([f"{table} MATCH ?"] + clauses)
+    sql = f"""
+        SELECT {columns}
+        FROM {table} JOIN doctor_forms AS f ON f.id = {table}.rowid
+        WHERE {where}
+        ORDER BY {table}.rowid DESC
+        LIMIT ?
+    """
+    try:
+        with data_connect.connection(database_path) as conn:
+            rows = conn.execute(sql, [match] + params + [RANK_WINDOW]).fetchall()
+    except sqlite3.Error as e:
+        print(f"SQLite 错误: {str(e)}")
+        return _empty()
+    if not rows:
+        return _empty()
+
+    width = len(RESULT_COLUMNS)
+    texts = ["\n".join(value or "" for value in row[width:]) for row in rows]
+    scores = _score(texts, terms)
+    # 相关度相同时较新的记录在前（rows 已按 id 倒序，sorted 是稳定排序）
+    ranked = sorted(range(len(rows)), key=scores.__getitem__)[:limit]
+
+    def make_snippet(row):
+        # 取第一个命中的文本列生成摘要
+        for value in row[width:]:
+            value = value or ""
+            if any(term in value for term in terms):
+                return _highlight(value, terms)
+        return ""
+
+    return pd.DataFrame(
+        [rows[i][:width] + (make_snippet(rows[i]), scores[i]) for i in ranked],
+        columns=list(RESULT_COLUMNS) + ["snippet", "score"],
+    )
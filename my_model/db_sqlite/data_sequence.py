@@ -0,0 +1,44 @@
+import datetime
+import sqlite3
+
+FORM_SEQUENCE = "doctor_forms"
+
+
+def next_value(conn: sqlite3.Connection, name: str, period: str = "") -> int:
+    """
+    原子地递增并返回计数器 (name, period) 的下一个值，首次使用时从 1 开始
+
+    必须在调用方的写事务中执行（例如 data_connect.transaction），
+    与使用该值的 INSERT 一起提交或回滚，不会出现重复或跳号。
+
+    参数:
+        conn: 处于写事务中的连接
+        name (str): 计数器名称，例如 'doctor_forms' 或 'doctor_forms:外科一病区'
+        period (str): 计数周期，例如 '20250814'；为空表示不分周期
+
+    返回:
+        int: 递增后的值
+    """
+    row = conn.execute("""
+        INSERT INTO sequences (name, period, value) VALUES (?, ?, 1)
+        ON CONFLICT (name, period) DO UPDATE SET value = value + 1
+        RETURNING value
+    """, (name, period)).fetchone()
+    return row[0]
+
+
+def daily_index_id(conn: sqlite3.Connection, day: datetime.date = None, department: str = None) -> str:
+    """
+    生成形如 YYYYMMDD### 的每日流水号
+
+    参数:
+        conn: 处于写事务中的连接
+        day (datetime.date): 日期，默认为今天
+        department (str): 指定时按科室单独计数（流水号只在该科室内唯一）
+
+    返回:
+        str: 流水号，例如 '20250814001'
+    """
+    period = (day or datetime.date.today()).strftime("%Y%m%d")
+    name = FORM_SEQUENCE if department is None else f"{FORM_SEQUENCE}:{department}"
+    return f"{period}{next_value(conn, name, period):03d}"
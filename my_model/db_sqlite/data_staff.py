@@ -0,0 +1,151 @@
+import os
+import threading
+
+import pandas as pd
+from my_model.db_sqlite import data_connect
+from my_data.user_data import hospital_basic
+from my_model.by_text.name_index import NameIndex
+
+STAFF_TABLE = "doctor_info"
+
+
+def compact(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    压缩员工表的内存表示：section 转为以 hospital_basic.section 为类别的分类类型，
+    id、number、state 转为 int32（原地修改并返回）
+    """
+    # 历史数据中存在不在科室列表中的取值（如带尾随空格），追加为额外类别
+    categories = list(dict.fromkeys(hospital_basic.section))
+    categories += sorted(set(frame["section"].dropna()) - set(categories))
+    frame["section"] = pd.Categorical(frame["section"], categories=categories)
+    for column in ("id", "number", "state"):
+        frame[column] = frame[column].astype("int32")
+    return frame
+
+
+class StaffDirectory:
+    """
+    进程内共享的员工表（doctor_info）缓存
+
+    员工表读多写少，所有 Streamlit 会话共用同一份内存数据。缓存在以下情况失效：
+        1. 本进程内的写入辅助函数（data_insert/data_update/data_delete）提交后通知；
+        2. 每次访问时检查独占连接上的 PRAGMA data_version，
+           其他连接或其他进程提交的修改都会使它变化。
+
+    frame() 返回的 DataFrame 为各会话共享，调用方不得原地修改；
+    by_number() 返回的行是副本，可以自由修改。姓名索引（NameIndex）随缓存重新加载
+    按差异增量更新，新员工注册后不需要整体重建。
+    """
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self._lock = threading.RLock()
+        self._conn = None
+        self._data_version = None
+        self._stale = True
+        self._frame = pd.DataFrame()
+        self._by_number = {}
+        self._by_name = {}
+        self._names = NameIndex()
+
+    def invalidate(self):
+        """标记缓存失效，下次访问时重新加载"""
+        self._stale = True
+
+    def _refresh(self):
+        """检查数据版本，必要时从数据库重新加载（调用方需持有锁）"""
+        if self._conn is None:
+            self._conn = data_connect.get_pool(self.database_path).connect()
+
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if not self._stale and data_version == self._data_version:
+            return
+
+        # 先清除标记再加载，加载期间到达的失效通知不会丢失
+        self._stale = False
+        frame = compact(pd.read_sql_query(f"SELECT * FROM {STAFF_TABLE} ORDER BY id", self._conn))
+
+        by_name = {}
+        for position, name in enumerate(frame["name"].tolist()):
+            by_name.setdefault(name, []).append(position)
+
+        self._frame = frame
+        self._by_number = {number: position for position, number in enumerate(frame["number"].tolist())}
+        self._by_name = by_name
+        self._names.sync(by_name.keys())
+        self._data_version = data_version
+
+    def frame(self) -> pd.DataFrame:
+        """返回完整员工表（共享对象，只读）"""
+        with self._lock:
+            self._refresh()
+            return self._frame
+
+    def by_number(self, number):
+        """
+        按员工号查询
+
+        返回:
+            pd.Series: 员工信息行的副本，不存在时返回 None
+        """
+        with self._lock:
+            self._refresh()
+            position = self._by_number.get(int(number))
+            if position is None:
+                return None
+            return self._frame.iloc[position].copy()
+
+    def by_name(self, name) -> pd.DataFrame:
+        """按姓名查询，同名员工按员工号排序返回多行"""
+        with self._lock:
+            self._refresh()
+            positions = self._by_name.get(name, [])
+            return self._frame.iloc[positions].sort_values("number")
+
+    def search(self, query: str, limit: int = 10) -> pd.DataFrame:
+        """
+        按姓名模糊查询：前缀、子串、拼音首字母和编辑距离，结果按相关度排序
+
+        返回:
+            pd.DataFrame: 匹配的员工行（副本），match 列为匹配类型（见 name_index），
+                          同名员工按员工号排序
+        """
+        with self._lock:
+            self._refresh()
+            numbers = self._frame["number"].values
+            positions, kinds = [], []
+            for name, kind, _ in self._names.search(query, limit):
+                matched = sorted(self._by_name[name], key=numbers.__getitem__)
+                positions += matched
+                kinds += [kind] * len(matched)
+            return self._frame.iloc[positions].assign(match=kinds)
+
+    def with_state_at_most(self, state) -> pd.DataFrame:
+        """返回 state 不大于给定值的员工，例如 -1 为待审核人员"""
+        with self._lock:
+            self._refresh()
+            frame = self._frame
+            return frame[frame["state"] <= state]
+
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+
+def directory(database_path: str) -> StaffDirectory:
+    """获取数据库对应的进程级员工表缓存"""
+    key = os.path.abspath(database_path)
+    staff = _directories.get(key)
+    if staff is None:
+        with _directories_lock:
+            staff = _directories.setdefault(key, StaffDirectory(database_path))
+    return staff
+
+
+def _on_change(database_path, table_name):
+    staff = _directories.get(os.path.abspath(database_path))
+    if table_name == STAFF_TABLE and staff is not None:
+        staff.invalidate()
+
+
+data_connect.add_listener(_on_change)
@@ -0,0 +1,59 @@
+import datetime
+
+import pandas as pd
+from my_model.db_sqlite import data_connect, data_trace
+
+# stat_counts 表由 migrations/v005_stat_counts 建立，触发器在每次写入 doctor_info /
+# doctor_forms 时同步更新；这里的查询只按主键读取汇总行，耗时与两张表的行数无关
+
+
+@data_trace.helper
+def counts(database_path, metric) -> dict:
+    """
+    读取不分日期的计数
+
+    返回:
+        dict: {key: value}，只包含大于 0 的计数
+    """
+    with data_connect.connection(database_path) as conn:
+        rows = conn.execute(
+            "SELECT key, value FROM stat_counts WHERE metric = ? AND day = '' AND value > 0", (metric,)
+        )
+        return dict(rows)
+
+
+@data_trace.helper
+def daily_counts(database_path, metric, days: int = 30, today=None) -> pd.DataFrame:
+    """
+    读取最近 days 天（含今天）的按日计数
+
+    返回:
+        pd.DataFrame: day、key、value 三列，按日期排序
+    """
+    today = today or datetime.date.today()
+    since = str(today - datetime.timedelta(days=days - 1))
+    with data_connect.connection(database_path) as conn:
+        rows = conn.execute(
+            "SELECT day, key, value FROM stat_counts "
+            "WHERE metric = ? AND day BETWEEN ? AND ? AND value > 0 ORDER BY day",
+            (metric, since, str(today)),
+        ).fetchall()
+    return pd.DataFrame(rows, columns=["day", "key", "value"])
+
+
+@data_trace.helper
+def staff_summary(database_path) -> dict:
+    """
+    员工统计
+
+    返回:
+        dict: {"total", "active", "pending", "sections": {科室: 人数}, "bits": {位序号: 管理员人数}}
+    """
+    states = counts(database_path, "staff_state")
+    return {
+        "total": sum(states.values()),
+        "active": states.get("active", 0),
+        "pending": states.get("pending", 0),
+        "sections": counts(database_path, "staff_section"),
+        "bits": {int(bit): value for bit, value in counts(database_path, "state_bit").items()},
+    }
@@ -0,0 +1,293 @@
+import functools
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# 设置环境变量 HOSPITAL_TRACE=1 在启动时开启追踪，也可以在管理员页面中随时开关
+_enabled = os.environ.get("HOSPITAL_TRACE") == "1"
+
+# 超过该耗时（毫秒）的查询记入慢查询日志
+SLOW_MS = float(os.environ.get("HOSPITAL_SLOW_MS", 50))
+# 慢查询日志和最近重跑记录保留的条数
+SLOW_LOG_SIZE = 100
+SPAN_LOG_SIZE = 50
+# 单次重跑最多记录的查询条数，超出部分只计数
+MAX_QUERIES_PER_SPAN = 500
+SQL_PREVIEW = 500
+
+_local = threading.local()
+_lock = threading.Lock()
+_slow_log = deque(maxlen=SLOW_LOG_SIZE)
+_span_log = deque(maxlen=SPAN_LOG_SIZE)
+_whitespace = re.compile(r"\s+")
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(slow_ms: float = None):
+    """开启追踪，可同时调整慢查询阈值"""
+    global _enabled, SLOW_MS
+    if slow_ms is not None:
+        SLOW_MS = float(slow_ms)
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def clear():
+    """清空慢查询日志和重跑记录"""
+    with _lock:
+        _slow_log.clear()
+        _span_log.clear()
+
+
+def slow_queries() -> list:
+    """慢查询日志（最新的在前）"""
+    with _lock:
+        return list(reversed(_slow_log))
+
+
+def spans() -> list:
+    """最近的页面重跑记录（最新的在前）"""
+    with _lock:
+        return list(reversed(_span_log))
+
+
+class Span:
+    """
+    一次页面重跑期间执行的辅助函数调用和 SQL 查询
+
+    queries 中每条记录为 dict：sql、params（参数形状）、rows、ms、helper、error。
+    """
+
+    __slots__ = ("name", "started", "finished", "queries", "dropped", "calls")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.finished = None
+        self.queries = []
+        self.dropped = 0
+        self.calls = {}  # 辅助函数名 -> [调用次数, 累计毫秒]
+
+    def add(self, record):
+        if len(self.queries) < MAX_QUERIES_PER_SPAN:
+            self.queries.append(record)
+        else:
+            self.dropped += 1
+
+    def summary(self) -> dict:
+        return {
+            "name": self.name,
+            "started": self.started,
+            "ms": (self.finished - self.started) * 1000 if self.finished else None,
+            "queries": len(self.queries) + self.dropped,
+            "sql_ms": sum(query["ms"] for query in self.queries),
+            "rows": sum(query["rows"] or 0 for query in self.queries),
+        }
+
+
+def current():
+    """当前线程正在记录的 Span，未开启追踪或不在页面重跑中时为 None"""
+    return getattr(_local, "span", None)
+
+
+def context():
+    """当前线程的 (Span, 辅助函数名)，交给其他线程执行的操作可以据此归属到提交方"""
+    return getattr(_local, "span", None), getattr(_local, "helper", None)
+
+
+def activate(span, helper=None):
+    """将 span 设为当前线程的 Span（例如写线程代替提交方执行操作时），返回之前的 Span"""
+    previous = getattr(_local, "span", None)
+    _local.span = span
+    _local.helper = helper
+    return previous
+
+
+def page(name: str):
+    """
+    页面入口装饰器：开启追踪时，把一次重跑中执行的查询记录为一个 Span
+
+    用法:
+        @data_trace.page("page01")
+        def main(): ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled or current() is not None:
+                return func(*args, **kwargs)
+            span = Span(name)
+            previous = activate(span)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                span.finished = time.time()
+                activate(previous)
+                with _lock:
+                    _span_log.append(span)
+        return wrapper
+    return decorator
+
+
+def helper(func):
+    """db_sqlite 辅助函数装饰器：记录调用次数和耗时，并把期间的查询归属到该函数"""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        span = current() if _enabled else None
+        if span is None:
+            return func(*args, **kwargs)
+        outer = getattr(_local, "helper", None)
+        _local.helper = outer or name
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.helper = outer
+            stats = span.calls.setdefault(name, [0, 0.0])
+            stats[0] += 1
+            stats[1] += (time.perf_counter() - started) * 1000
+    return wrapper
+
+
+def _params_shape(params) -> str:
+    if params is None:
+        return ""
+    if isinstance(params, dict):
+        return f"dict[{len(params)}]"
+    try:
+        return f"{type(params).__name__}[{len(params)}]"
+    except TypeError:
+        return type(params).__name__
+
+
+def _plan(conn, sql, params) -> list:
+    # 直接调用 sqlite3.Connection.execute，查询计划本身不计入追踪记录
+    try:
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params if params is not None else ())
+        return [detail for _, _, _, detail in rows]
+    except (sqlite3.Error, ValueError) as e:
+        return [f"无法获取查询计划: {e}"]
+
+
+class TracedCursor(sqlite3.Cursor):
+    """记录 execute/executemany 与 fetch* 耗时和行数的游标；未开启追踪时只多一次判断"""
+
+    _record = None
+    # 原始语句和参数只保存在游标上，用于记入慢查询日志时获取查询计划；
+    # 记录本身会进入全局的 Span 缓冲区，不能保留参数（其中可能有密码哈希等敏感数据）
+    _query = None
+
+    def _start(self, sql, params, many=False):
+        span = current()
+        if span is None:
+            self._record = self._query = None
+            return None
+        record = {
+            "sql": _whitespace.sub(" ", sql).strip()[:SQL_PREVIEW],
+            "params": f"executemany[{len(params)}]" if many and hasattr(params, "__len__")
+            else "executemany" if many else _params_shape(params),
+            "rows": None,
+            "ms": 0.0,
+            "helper": getattr(_local, "helper", None),
+            "error": None,
+        }
+        span.add(record)
+        self._record = record
+        self._query = None if many else (sql, params)
+        return record
+
+    def _finish(self, record, started, rows=None, error=None):
+        record["ms"] += (time.perf_counter() - started) * 1000
+        if rows is not None:
+            record["rows"] = (record["rows"] or 0) + rows
+        if error is not None:
+            record["error"] = str(error)
+        if record["ms"] >= SLOW_MS and "logged" not in record:
+            # 慢查询日志与 Span 共用同一条记录，之后继续 fetch 的行数和耗时也会反映到日志中
+            query, self._query = self._query, None
+            span = current()
+            record["page"] = span.name if span else None
+            record["logged"] = time.time()
+            record["plan"] = _plan(self.connection, *query) if query else []
+            with _lock:
+                _slow_log.append(record)
+
+    def execute(self, sql, parameters=()):
+        if not _enabled:
+            return super().execute(sql, parameters)
+        record = self._start(sql, parameters)
+        if record is None:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            result = super().execute(sql, parameters)
+        except sqlite3.Error as e:
+            self._finish(record, started, error=e)
+            raise
+        # 写语句的影响行数在 execute 后即可得到，查询的行数在 fetch 时累计
+        self._finish(record, started, rows=self.rowcount if self.rowcount >= 0 else None)
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        if not _enabled:
+            return super().executemany(sql, seq_of_parameters)
+        record = self._start(sql, seq_of_parameters, many=True)
+        if record is None:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            result = super().executemany(sql, seq_of_parameters)
+        except sqlite3.Error as e:
+            self._finish(record, started, error=e)
+            raise
+        self._finish(record, started, rows=self.rowcount if self.rowcount >= 0 else None)
+        return result
+
+    def _fetch(self, method, *args):
+        record = self._record
+        if record is None or not _enabled:
+            return method(*args)
+        started = time.perf_counter()
+        rows = method(*args)
+        count = len(rows) if isinstance(rows, list) else int(rows is not None)
+        self._finish(record, started, rows=count)
+        return rows
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, *(() if size is None else (size,)))
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+
+class TracedConnection(sqlite3.Connection):
+    """
+    连接池使用的连接类
+
+    sqlite3.Connection.execute 在 C 层直接执行而不经过游标的 execute 方法，
+    这里改为先创建 TracedCursor 再执行。直接迭代游标取出的行不计入行数。
+    """
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
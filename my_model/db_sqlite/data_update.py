@@ -1,10 +1,15 @@
 import sqlite3
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable
+from my_model.db_sqlite import data_connect, data_check, data_fts, data_writer, data_trace
 
 
+@data_trace.helper
 def smart_update_record_by_id(db_path: str, table_name: str, record_id: int, data_dict: Dict[str, Any]) -> bool:
     """
-    智能更新SQLite数据库中的记录，自动处理列是否存在的情况
+    更新SQLite数据库中指定ID的记录
+
+    表结构由 migrations 在启动时建立，更新时不做列检查；
+    data_dict 中包含表中不存在的列时更新失败。
 
     参数:
         db_path (str): SQLite数据库文件路径
@@ -29,99 +34,101 @@ def smart_update_record_by_id(db_path: str, table_name: str, record_id: int, dat
             print(f"错误: 列名 '{column}' 包含非法字符")
             return False
 
-    conn = None
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # 1. 检查记录是否存在
-        if not record_exists(cursor, table_name, record_id):
-            print(f"错误: ID {record_id} 的记录不存在")
-            return False
-
-        # 2. 获取表的列信息
-        existing_columns = get_table_columns(cursor, table_name)
-        if not existing_columns:
-            print(f"错误: 表 '{table_name}' 不存在或无法访问")
-            return False
-
-        # 3. 添加不存在的列
-        columns_to_add = [col for col in data_dict.keys()
-                          if col not in existing_columns and col != "id"]
-
-        for column in columns_to_add:
-            value = data_dict[column]
-            col_type = infer_sql_type(value)
-            if not add_column_to_table(cursor, table_name, column, col_type):
-                print(f"添加列 {column} 失败，更新操作中止")
-                conn.rollback()
-                return False
-
-        # 4. 构建更新语句(只更新data_dict中提供的字段)
-        set_clause, params = prepare_update_statement(data_dict, record_id)
-        if not set_clause:
-            print("警告: 没有有效的列需要更新")
-            return False
+    # 构建更新语句(只更新data_dict中提供的字段)
+    set_clause, params = prepare_update_statement(data_dict, record_id)
+    if not set_clause:
+        print("警告: 没有有效的列需要更新")
+        return False
 
-        sql = f"UPDATE {table_name} SET {set_clause} WHERE id = ?"
+    sql = f"UPDATE {table_name} SET {set_clause} WHERE id = ?"
+    indexed = data_fts.tracks(table_name, data_dict)
 
-        # 5. 执行更新
-        cursor.execute(sql, params)
-        conn.commit()
+    def update(conn):
+        # 修改了全文检索的列时，在同一事务中用旧文本删除、新文本写入逐字索引
+        if indexed:
+            data_fts.remove(conn, [record_id])
+        rowcount = conn.execute(sql, params).rowcount
+        if indexed:
+            data_fts.add(conn, [record_id])
+        return rowcount
 
-        return cursor.rowcount == 1
+    try:
+        rowcount = data_writer.run(db_path, update)
 
     except sqlite3.Error as e:
         print(f"数据库错误: {e}")
-        if conn:
-            conn.rollback()
         return False
-    finally:
-        if conn:
-            conn.close()
-
-
-def is_valid_sql_identifier(identifier: str) -> bool:
-    """检查SQL标识符是否合法，防止SQL注入"""
-    # SQL标识符通常只允许字母、数字和下划线，且不能以数字开头
-    return identifier.replace('_', '').isalnum() and not identifier[0].isdigit()
 
+    if rowcount == 0:
+        print(f"错误: ID {record_id} 的记录不存在")
+        return False
 
-def record_exists(cursor: sqlite3.Cursor, table_name: str, record_id: int) -> bool:
-    """检查记录是否存在"""
-    record_id = record_id
-    cursor.execute(f"SELECT 1 FROM {table_name} WHERE id = ?", (record_id,))
-    return cursor.fetchone() is not None
+    data_connect.notify_change(db_path, table_name)
+    return rowcount == 1
 
 
-def get_table_columns(cursor: sqlite3.Cursor, table_name: str) -> List[str]:
-    """获取表的列信息"""
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    return [column[1] for column in cursor.fetchall()]
+@data_trace.helper
+def update_many(db_path: str, table_name: str, ids: Iterable[int], values: Dict[str, Any]) -> Dict[int, bool]:
+    """
+    在一个事务中用 executemany 将同一组字段值写入多条记录
 
+    参数:
+        db_path (str): SQLite数据库文件路径
+        table_name (str): 要更新的表名
+        ids (Iterable[int]): 要更新的记录ID
+        values (Dict[str, Any]): 每条记录都要写入的字段和值
 
-def infer_sql_type(value: Any) -> str:
-    """根据值推断SQL类型"""
-    if value is None:
-        # 无法确定类型时默认使用TEXT
-        return "TEXT"
-    elif isinstance(value, int):
-        return "INTEGER"
-    elif isinstance(value, float):
-        return "REAL"
-    else:
-        return "TEXT"
+    返回:
+        Dict[int, bool]: 每个ID是否更新成功（记录不存在或事务失败为False）
+    """
+    ids = [int(record_id) for record_id in ids]
+    results = {record_id: False for record_id in ids}
+    if not ids:
+        return results
 
+    if not values:
+        print("警告: 数据字典为空，无需更新")
+        return results
+
+    if not is_valid_sql_identifier(table_name) or not all(map(is_valid_sql_identifier, values)):
+        print(f"错误: 表名 '{table_name}' 或列名包含非法字符")
+        return results
+
+    set_clause, params = prepare_update_statement(values, 0)
+    if not set_clause:
+        print("警告: 没有有效的列需要更新")
+        return results
+
+    sql = f"UPDATE {table_name} SET {set_clause} WHERE id = ?"
+    field_values = params[:-1]
+    indexed = data_fts.tracks(table_name, values)
+
+    def update(conn):
+        existing = data_check.existing_ids(conn, table_name, ids)
+        if indexed:
+            data_fts.remove(conn, existing)
+        conn.executemany(sql, [field_values + [record_id] for record_id in existing])
+        if indexed:
+            data_fts.add(conn, existing)
+        return existing
 
-def add_column_to_table(cursor: sqlite3.Cursor, table_name: str, column: str, col_type: str) -> bool:
-    """向表中添加新列"""
     try:
-        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} {col_type}")
-        print(f"已添加新列: {column} ({col_type})")
-        return True
+        updated = data_writer.run(db_path, update)
+
     except sqlite3.Error as e:
-        print(f"添加列 {column} 失败: {e}")
-        return False
+        print(f"数据库错误: {e}")
+        return results
+
+    results.update(dict.fromkeys(updated, True))
+    if updated:
+        data_connect.notify_change(db_path, table_name)
+    return results
+
+
+def is_valid_sql_identifier(identifier: str) -> bool:
+    """检查SQL标识符是否合法，防止SQL注入"""
+    # SQL标识符通常只允许字母、数字和下划线，且不能以数字开头
+    return identifier.replace('_', '').isalnum() and not identifier[0].isdigit()
 
 
 def prepare_update_statement(data_dict: Dict[str, Any], record_id: int) -> tuple:
@@ -143,10 +150,8 @@ def prepare_update_statement(data_dict: Dict[str, Any], record_id: int) -> tuple
 #
 #     # 更新数据示例
 #     update_data = {
-#         "section": '优质服务中心',  # 存在的列 - 更新数据
-#         "new_field": '新添加的值',  # 不存在的列 - 自动添加
-#         "another_field": 12345,  # 不存在的列 - 自动添加
-#         "state": None  # 存在的列 - 更新为NULL
+#         "section": '优质服务中心',
+#         "state": 0
 #     }
 #
 #     success = smart_update_record_by_id(db_path, table_name, 1, update_data)
@@ -0,0 +1,214 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from my_model.db_sqlite import data_connect, data_trace
+
+# 等待写入的操作上限，队列满时提交方阻塞等待（背压）
+MAX_QUEUE = 1000
+# 一次组提交最多合并的操作数
+MAX_BATCH = 64
+
+_STOP = object()
+
+
+class WriterMetrics:
+    """写线程的运行指标，snapshot() 返回字典副本"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.max_depth = 0
+        self.throttled = 0  # 队列已满、提交方被阻塞的次数
+        self.queue_wait = 0.0  # 操作从提交到开始执行的累计等待秒数
+        self.errors = Counter()
+
+    def record(self, **changes):
+        with self._lock:
+            for name, value in changes.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def peak(self, name: str, value):
+        with self._lock:
+            setattr(self, name, max(getattr(self, name), value))
+
+    def error(self, e: Exception, count: int = 1):
+        with self._lock:
+            self.errors[f"{type(e).__name__}: {e}"] += count
+
+    def snapshot(self, depth: int) -> dict:
+        with self._lock:
+            executed = self.completed + self.failed
+            return {
+                "depth": depth,
+                "max_depth": self.max_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "batches": self.batches,
+                "avg_batch": executed / self.batches if self.batches else 0.0,
+                "max_batch": self.max_batch,
+                "throttled": self.throttled,
+                "avg_wait_ms": self.queue_wait * 1000 / executed if executed else 0.0,
+                "errors": dict(self.errors),
+            }
+
+
+class Writer:
+    """
+    单个数据库的专用写线程
+
+    所有写操作排队交给同一个线程执行，避免多个会话线程争抢写锁。写线程每次取出
+    队列中已有的一批操作（最多 MAX_BATCH 个），放在一个事务中执行后一次提交
+    （组提交）；每个操作包在 SAVEPOINT 中，单个操作失败只回滚它自己。
+    操作的结果或异常在事务提交后通过 Future 返回给提交方。
+    """
+
+    def __init__(self, database_path: str, max_queue: int = MAX_QUEUE, max_batch: int = MAX_BATCH):
+        self.database_path = database_path
+        self.max_batch = max_batch
+        self.metrics = WriterMetrics()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation, *args) -> Future:
+        """
+        提交写操作 operation(conn, *args)，返回 Future
+
+        队列已满时阻塞，直到写线程腾出空间。
+        """
+        future = Future()
+        # 记下提交方当前的追踪 Span，写线程执行时把查询记到提交方的页面重跑下
+        item = (future, operation, args, time.perf_counter(), data_trace.context())
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.metrics.record(throttled=1)
+            self._queue.put(item)
+        self.metrics.record(submitted=1)
+        self.metrics.peak("max_depth", self._queue.qsize())
+        return future
+
+    def stats(self) -> dict:
+        return self.metrics.snapshot(self._queue.qsize())
+
+    def stop(self, timeout: float = 10):
+        """处理完已提交的操作后停止写线程"""
+        self._queue.put((None, _STOP, (), 0.0, (None, None)))
+        self._thread.join(timeout)
+
+    def _take_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch and batch[-1][1] is not _STOP:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        pool = data_connect.get_pool(self.database_path)
+        while True:
+            batch = self._take_batch()
+            stop = batch[-1][1] is _STOP
+            if stop:
+                batch.pop()
+
+            done = []
+            started = time.perf_counter()
+            try:
+                with pool.transaction() as conn:
+                    for future, operation, args, submitted, trace in batch:
+                        self.metrics.record(queue_wait=started - submitted)
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        conn.execute("SAVEPOINT writer_op")
+                        data_trace.activate(*trace)
+                        try:
+                            result = operation(conn, *args)
+                        except Exception as e:
+                            data_trace.activate(None)
+                            conn.execute("ROLLBACK TO writer_op")
+                            conn.execute("RELEASE writer_op")
+                            self.metrics.record(failed=1)
+                            self.metrics.error(e)
+                            future.set_exception(e)
+                        else:
+                            data_trace.activate(None)
+                            conn.execute("RELEASE writer_op")
+                            done.append((future, result))
+            except Exception as e:
+                # 事务开始或提交失败：本批中尚未返回结果的操作全部失败
+                failed = [future for future, *_ in batch if not future.done()]
+                self.metrics.record(failed=len(failed))
+                self.metrics.error(e, len(failed))
+                for future in failed:
+                    future.set_exception(e)
+            else:
+                self.metrics.record(completed=len(done))
+                for future, result in done:
+                    future.set_result(result)
+            finally:
+                data_trace.activate(None)
+
+            if batch:
+                self.metrics.record(batches=1)
+                self.metrics.peak("max_batch", len(batch))
+            if stop:
+                break
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(database_path: str) -> Writer:
+    """获取（必要时启动）数据库对应的写线程"""
+    key = os.path.abspath(database_path)
+    writer = _writers.get(key)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(key)
+            if writer is None:
+                writer = _writers[key] = Writer(database_path)
+    return writer
+
+
+def run(database_path: str, operation, *args):
+    """
+    执行写操作 operation(conn, *args) 并等待结果
+
+    当前线程已处于事务中（例如写线程内的嵌套调用）时直接在该事务中执行，
+    否则交给写线程排队执行。
+
+    异常:
+        operation 抛出的异常或提交失败时的 sqlite3.Error
+    """
+    pool = data_connect.get_pool(database_path)
+    if pool.in_transaction():
+        with pool.connection() as conn:
+            return operation(conn, *args)
+    return get_writer(database_path).submit(operation, *args).result()
+
+
+def stats() -> dict:
+    """所有写线程的运行指标，键为数据库路径"""
+    return {key: writer.stats() for key, writer in list(_writers.items())}
+
+
+@atexit.register
+def stop_all():
+    """进程退出时处理完队列中剩余的写操作"""
+    with _writers_lock:
+        for writer in _writers.values():
+            writer.stop()
+        _writers.clear()
@@ -0,0 +1,72 @@
+import importlib
+import pkgutil
+import re
+import sqlite3
+import sys
+
+from my_model.db_sqlite import migrations
+
+# 迁移脚本命名规则：v<版本号>_<说明>.py，例如 v001_initial_schema.py
+MIGRATION_PATTERN = re.compile(r"^v(\d+)_\w+$")
+
+
+def load_migrations():
+    """
+    按版本号顺序加载 migrations 目录下的所有迁移脚本
+
+    返回:
+        list[tuple[int, module]]: (版本号, 模块) 列表，每个模块提供 upgrade(conn)
+    """
+    found = []
+    for info in pkgutil.iter_modules(migrations.__path__):
+        match = MIGRATION_PATTERN.match(info.name)
+        if match:
+            module = importlib.import_module(f"{migrations.__name__}.{info.name}")
+            found.append((int(match.group(1)), module))
+    return sorted(found, key=lambda item: item[0])
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """读取数据库当前的 schema 版本（PRAGMA user_version）"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    将数据库升级到最新版本，每个迁移在独立事务中执行并写入 user_version
+
+    参数:
+        conn: isolation_level=None 的 SQLite 连接（由调用方控制事务）
+
+    返回:
+        int: 升级后的 schema 版本
+    """
+    current = get_version(conn)
+    for version, module in load_migrations():
+        if version <= current:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 获取写锁后再读一次，其他进程可能已经完成了同一迁移
+            if get_version(conn) >= version:
+                conn.rollback()
+                current = get_version(conn)
+                continue
+            module.upgrade(conn)
+            # PRAGMA 不支持参数占位符，version 来自文件名中的数字
+            conn.execute(f"PRAGMA user_version = {version:d}")
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        current = version
+    return current
+
+
+if __name__ == "__main__":
+    # 用法: python -m my_model.db_sqlite.migrations.runner doctor_info.db
+    database_path = sys.argv[1] if len(sys.argv) > 1 else "doctor_info.db"
+    with sqlite3.connect(database_path, isolation_level=None) as connection:
+        print(f"{database_path}: schema 版本 {get_version(connection)} -> {migrate(connection)}")
@@ -0,0 +1,74 @@
+"""
+建立规范的表结构：doctor_info 以 id 为主键、number 唯一，并为各列声明类型
+
+旧版本的 doctor_info 由 pandas.to_sql 生成，没有主键和约束，这里通过
+“新建表 - 复制数据 - 替换旧表”的方式重建。历史上由写入时自动添加的额外
+列会原样保留。
+"""
+import sqlite3
+
+DOCTOR_INFO = """
+    CREATE TABLE {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        section TEXT NOT NULL,
+        name TEXT NOT NULL,
+        number INTEGER NOT NULL UNIQUE,
+        password TEXT NOT NULL,
+        state INTEGER NOT NULL DEFAULT -1{extra}
+    )
+"""
+
+DOCTOR_INFO_COLUMNS = ("id", "section", "name", "number", "password", "state")
+
+DOCTOR_FORMS = """
+    CREATE TABLE IF NOT EXISTS doctor_forms (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, index_id TEXT,
+        patient_name TEXT, age INTEGER, department TEXT, doctor TEXT, id_doc TEXT,
+        surgery TEXT, case_number TEXT, risk_level TEXT, diagnosis TEXT,
+        opinion TEXT, date TEXT, risk_replace TEXT, status_reason TEXT,
+        risk_disclosure TEXT, user_input TEXT, final_opinion TEXT,
+        record_name TEXT, file_address TEXT, style TEXT, add_info TEXT
+    )
+"""
+
+DOCTOR_MODEL = """
+    CREATE TABLE IF NOT EXISTS doctor_model (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        department TEXT,
+        id_doc TEXT,
+        risk_replace TEXT,
+        status_reason TEXT,
+        risk_disclosure TEXT,
+        user_input TEXT,
+        final_opinion TEXT
+    )
+"""
+
+
+def upgrade(conn: sqlite3.Connection):
+    old_columns = conn.execute("PRAGMA table_info(doctor_info)").fetchall()
+
+    if not old_columns:
+        conn.execute(DOCTOR_INFO.format(name="doctor_info", extra=""))
+    else:
+        # 保留历史上自动添加的列: (cid, name, type, notnull, default, pk)
+        extra_columns = [(col[1], col[2] or "TEXT") for col in old_columns
+                         if col[1] not in DOCTOR_INFO_COLUMNS]
+        extra = "".join(f",\n        {name} {col_type}" for name, col_type in extra_columns)
+        conn.execute(DOCTOR_INFO.format(name="doctor_info_new", extra=extra))
+
+        # 旧表的密码以 INTEGER 存储，统一转为 TEXT
+        columns = list(DOCTOR_INFO_COLUMNS) + [name for name, _ in extra_columns]
+        selects = ["CAST(password AS TEXT)" if name == "password" else name for name in columns]
+        conn.execute(f"""
+            INSERT INTO doctor_info_new ({", ".join(columns)})
+            SELECT {", ".join(selects)} FROM doctor_info
+        """)
+        conn.execute("DROP TABLE doctor_info")
+        conn.execute("ALTER TABLE doctor_info_new RENAME TO doctor_info")
+
+    # number 的 UNIQUE 约束已自带索引，姓名查询需要单独建索引
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_doctor_info_name ON doctor_info(name)")
+
+    conn.execute(DOCTOR_FORMS)
+    conn.execute(DOCTOR_MODEL)
@@ -0,0 +1,19 @@
+"""
+为 doctor_forms 建立复合索引，支撑按科室、医生、风险等级和日期筛选的键集分页
+
+分页按 (date DESC, id DESC) 排序，每个筛选列的索引都以 (date, id) 结尾，
+筛选后可以直接沿索引顺序取下一页，无需排序。
+"""
+import sqlite3
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_doctor_forms_date ON doctor_forms(date, id)",
+    "CREATE INDEX IF NOT EXISTS idx_doctor_forms_department ON doctor_forms(department, date, id)",
+    "CREATE INDEX IF NOT EXISTS idx_doctor_forms_doctor ON doctor_forms(doctor, date, id)",
+    "CREATE INDEX IF NOT EXISTS idx_doctor_forms_risk_level ON doctor_forms(risk_level, date, id)",
+)
+
+
+def upgrade(conn: sqlite3.Connection):
+    for index_sql in INDEXES:
+        conn.execute(index_sql)
@@ -0,0 +1,41 @@
+"""
+为 doctor_forms 的叙述性文本建立 FTS5 全文索引
+
+使用 trigram 分词器，中文无需分词即可按任意连续 3 个字以上的片段检索。
+索引表为外部内容表（content='doctor_forms'），不重复存储原文，
+由插入、更新、删除触发器保持同步。
+"""
+import sqlite3
+
+FTS_COLUMNS = ("diagnosis", "surgery", "opinion", "risk_disclosure", "user_input", "final_opinion")
+
+
+def upgrade(conn: sqlite3.Connection):
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS doctor_forms_fts USING fts5(
+            {columns},
+            content='doctor_forms', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS doctor_forms_fts_insert AFTER INSERT ON doctor_forms BEGIN
+            INSERT INTO doctor_forms_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS doctor_forms_fts_delete AFTER DELETE ON doctor_forms BEGIN
+            INSERT INTO doctor_forms_fts(doctor_forms_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS doctor_forms_fts_update AFTER UPDATE OF {columns} ON doctor_forms BEGIN
+            INSERT INTO doctor_forms_fts(doctor_forms_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO doctor_forms_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    # 为已有记录建立索引
+    conn.execute("INSERT INTO doctor_forms_fts(doctor_forms_fts) VALUES ('rebuild')")
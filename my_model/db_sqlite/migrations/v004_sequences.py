@@ -0,0 +1,26 @@
+"""
+建立计数器表 sequences，用于原子地生成每日（或每科室每日）流水号
+
+计数器按 (name, period) 区分，例如 ('doctor_forms', '20250814')。
+已有的 doctor_forms.index_id（YYYYMMDD###）按日期写入初始值，新的流水号从其后继续。
+"""
+import sqlite3
+
+
+def upgrade(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sequences (
+            name TEXT NOT NULL,
+            period TEXT NOT NULL,
+            value INTEGER NOT NULL,
+            PRIMARY KEY (name, period)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        INSERT INTO sequences (name, period, value)
+        SELECT 'doctor_forms', substr(index_id, 1, 8), max(CAST(substr(index_id, 9) AS INTEGER))
+        FROM doctor_forms
+        WHERE length(index_id) >= 11 AND substr(index_id, 1, 8) GLOB '[0-9]*'
+        GROUP BY substr(index_id, 1, 8)
+        ON CONFLICT (name, period) DO UPDATE SET value = max(value, excluded.value)
+    """)
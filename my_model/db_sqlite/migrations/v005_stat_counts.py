@@ -0,0 +1,89 @@
+"""
+建立管理看板使用的汇总计数表 stat_counts，由触发器在每次写入时增量维护
+
+    metric = 'staff_section'：各科室员工数，key 为科室；
+    metric = 'staff_state'：key 为 'pending'（state < 0，待审核）或 'active'；
+    metric = 'state_bit'：已激活员工中 state 第 key 位为 1 的人数（key 为位序号，最低位为 0），
+                          页面与位的对应关系由 permission.bit 换算，页面增减时计数无需重建；
+    metric = 'forms_day'：各科室每天的沟通记录数，day 为日期，key 为科室。
+
+主键以 (metric, day) 开头，按日期范围读取时直接走主键范围扫描。
+stat_bits 为 0-62 的位序号表，用于在触发器中按位展开 state。
+"""
+import sqlite3
+
+# 触发器中使用的计数更新语句片段：{rows} 为产生 (metric, day, key) 的 SELECT，{delta} 为 +1 或 -1
+_UPSERT = """
+    INSERT INTO stat_counts (metric, day, key, value)
+    {rows}
+    ON CONFLICT (metric, day, key) DO UPDATE SET value = value + ({delta});
+"""
+
+
+def _staff_rows(alias):
+    return f"""
+        SELECT 'staff_section', '', {alias}.section, {{delta}}
+        UNION ALL
+        SELECT 'staff_state', '', CASE WHEN {alias}.state < 0 THEN 'pending' ELSE 'active' END, {{delta}}
+        UNION ALL
+        SELECT 'state_bit', '', bit, {{delta}} FROM stat_bits
+        WHERE {alias}.state >= 0 AND ({alias}.state >> bit) & 1
+    """
+
+
+def _forms_rows(alias):
+    return f"SELECT 'forms_day', coalesce({alias}.date, ''), coalesce({alias}.department, ''), {{delta}}"
+
+
+def _statement(rows, delta):
+    # INSERT ... SELECT 后接 ON CONFLICT 时，SELECT 需要带 WHERE 子句以消除语法歧义
+    return _UPSERT.format(rows=f"SELECT * FROM ({rows.format(delta=delta)}) WHERE true", delta=delta)
+
+
+def upgrade(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stat_counts (
+            metric TEXT NOT NULL,
+            day TEXT NOT NULL DEFAULT '',
+            key TEXT NOT NULL,
+            value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, day, key)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE TABLE IF NOT EXISTS stat_bits (bit INTEGER PRIMARY KEY)")
+    conn.execute("""
+        INSERT OR IGNORE INTO stat_bits (bit)
+        WITH RECURSIVE bits(bit) AS (SELECT 0 UNION ALL SELECT bit + 1 FROM bits WHERE bit < 62)
+        SELECT bit FROM bits
+    """)
+
+    staff_new, staff_old = _staff_rows("NEW"), _staff_rows("OLD")
+    forms_new, forms_old = _forms_rows("NEW"), _forms_rows("OLD")
+    triggers = {
+        "doctor_info_stat_insert": ("AFTER INSERT ON doctor_info", [_statement(staff_new, 1)]),
+        "doctor_info_stat_delete": ("AFTER DELETE ON doctor_info", [_statement(staff_old, -1)]),
+        "doctor_info_stat_update": ("AFTER UPDATE OF section, state ON doctor_info",
+                                    [_statement(staff_old, -1), _statement(staff_new, 1)]),
+        "doctor_forms_stat_insert": ("AFTER INSERT ON doctor_forms", [_statement(forms_new, 1)]),
+        "doctor_forms_stat_delete": ("AFTER DELETE ON doctor_forms", [_statement(forms_old, -1)]),
+        "doctor_forms_stat_update": ("AFTER UPDATE OF department, date ON doctor_forms",
+                                     [_statement(forms_old, -1), _statement(forms_new, 1)]),
+    }
+    for name, (event, statements) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {''.join(statements)} END")
+
+    # 按现有数据写入初始计数
+    conn.execute("DELETE FROM stat_counts")
+    conn.execute("""
+        INSERT INTO stat_counts (metric, day, key, value)
+        SELECT 'staff_section', '', section, count(*) FROM doctor_info GROUP BY section
+        UNION ALL
+        SELECT 'staff_state', '', CASE WHEN state < 0 THEN 'pending' ELSE 'active' END, count(*)
+        FROM doctor_info GROUP BY 3
+        UNION ALL
+        SELECT 'state_bit', '', bit, count(*) FROM doctor_info, stat_bits
+        WHERE state >= 0 AND (state >> bit) & 1 GROUP BY bit
+        UNION ALL
+        SELECT 'forms_day', coalesce(date, ''), coalesce(department, ''), count(*)
+        FROM doctor_forms GROUP BY 2, 3
+    """)
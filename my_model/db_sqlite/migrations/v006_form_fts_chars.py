@@ -0,0 +1,45 @@
+"""
+为 doctor_forms 的叙述性文本建立逐字 FTS5 索引，支持两个字（以及单字）关键词的索引检索
+
+v003 的 trigram 索引只能检索 3 个字以上的片段。本索引中每个字是一个词元（见 data_fts），
+关键词按短语检索相邻的字。索引表不保存内容（content=''），删除时由触发器用旧值生成
+相同的词元；摘要由检索代码从 doctor_forms 原文生成。
+
+触发器调用的 fts_chars 函数只在本迁移的连接上注册，v007 已删除这些触发器，改由应用维护索引。
+"""
+import sqlite3
+
+FTS_COLUMNS = ("diagnosis", "surgery", "opinion", "risk_disclosure", "user_input", "final_opinion")
+
+
+def _chars(text):
+    return None if text is None else " ".join(str(text))
+
+
+def upgrade(conn: sqlite3.Connection):
+    conn.create_function("fts_chars", 1, _chars, deterministic=True)
+    table, function = "doctor_forms_chars", "fts_chars"
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"{function}(new.{column})" for column in FTS_COLUMNS)
+    old_values = ", ".join(f"{function}(old.{column})" for column in FTS_COLUMNS)
+
+    conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({columns}, content='')")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON doctor_forms BEGIN
+            INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON doctor_forms BEGIN
+            INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {columns} ON doctor_forms BEGIN
+            INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    # 为已有记录建立索引
+    select_values = ", ".join(f"{function}({column})" for column in FTS_COLUMNS)
+    conn.execute(f"INSERT INTO {table}(rowid, {columns}) SELECT id, {select_values} FROM doctor_forms")
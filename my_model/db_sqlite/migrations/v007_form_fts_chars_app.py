@@ -0,0 +1,15 @@
+"""
+删除 v006 为逐字索引 doctor_forms_chars 建立的触发器，改由应用的写入路径维护（见 data_fts）
+
+v006 的触发器调用只在应用连接上注册的 SQL 函数 fts_chars，其他连接（sqlite3 命令行、
+备份恢复工具、其他进程）写入 doctor_forms 时会失败，trusted_schema=OFF 时也无法使用。
+索引内容在删除触发器时与 doctor_forms 一致，无需重建。
+"""
+import sqlite3
+
+TABLE = "doctor_forms_chars"
+
+
+def upgrade(conn: sqlite3.Connection):
+    for event in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {TABLE}_{event}")
@@ -1,17 +1,29 @@
+import sqlite3
 import time
 import streamlit as st
-from my_model.db_sqlite import data_get, data_insert, data_check, data_update
-from my_model.by_text import advance_transform
 from my_data.user_data import hospital_basic
+from my_model.db_sqlite import data_trace
 
+# 数据库相关模块（依赖 pandas）在表单提交或输入查询时才导入，
+# 首页首次渲染不需要加载 pandas，登录页保持最轻量
 
+# 四个标签页各自是一个 fragment：在某个标签页中操作控件时只重跑该标签页，
+# 其他标签页、侧边栏和首页图片保持上一次的结果。会改变登录状态的操作（登录、退出、修改信息）
+# 会影响其他标签页，这些操作完成后调用 st.rerun() 重跑整个页面。
+# 每个 fragment 单独重跑时在查询追踪中记为一次 home.xxx 重跑（整页重跑时并入 home）。
+
+
+@st.fragment
+@data_trace.page("home.login")
 def login():
-    # 未登录时显示登录表单
-    doctor_info = data_get.get_data("doctor_info.db", "doctor_info")
     # 如果已登录，显示退出按钮和用户信息
     if "my_info" in st.session_state:
         my_info = st.session_state["my_info"]
-        st.success(f"您已登录为: {my_info['name']}，科室: {my_info['section']}")
+        # 登录成功后整页重跑，欢迎信息通过会话状态带到重跑后显示一次
+        welcome = st.session_state.pop("welcome", None)
+        if welcome:
+            st.success(welcome)
+        st.success(f"您已登录为: {my_info.name}，科室: {my_info.section}")
 
         if st.button("退出登录"):
             st.session_state.clear()
@@ -38,26 +50,35 @@ def login():
                 st.error("员工号必须是5位数字")
                 return False
 
-            # 检查用户名是否存在
+            # 检查用户名是否存在（查询进程内员工表缓存）
+            from my_model.db_sqlite import data_staff
+            from my_model.all_user import credential
+            from my_model.all_user.session import StaffSession
             username = int(username)
-            if username not in doctor_info["number"].values:
+            my_info = data_staff.directory("doctor_info.db").by_number(username)
+            if my_info is None:
                 st.error("员工号不存在")
                 return False
 
-            # 获取密码并验证
-            my_info = doctor_info[doctor_info["number"] == username].iloc[0]
-            stored_password = str(my_info["password"])
-            if stored_password == password:
-                st.success(f"欢迎，{my_info["name"]}！员工号{username} - 登录成功。")
-                my_info["state"] = advance_transform.base_converter(str(my_info["state"]), 10, 2)
-                st.session_state["my_info"] = my_info
-                return True
+            # 获取密码并在哈希线程池中验证
+            stored_password = my_info["password"]
+            if credential.verify_password(password, stored_password).result():
+                if credential.needs_rehash(stored_password):
+                    # 旧版明文密码登录成功后，在后台透明升级为加盐哈希
+                    credential.upgrade_password("doctor_info.db", my_info["id"], password)
+                # 会话中只保存精简的 StaffSession，不保存整行数据和密码
+                st.session_state["my_info"] = StaffSession.from_row(my_info)
+                st.session_state["welcome"] = f"欢迎，{my_info['name']}！员工号{username} - 登录成功。"
+                # 修改信息标签页依赖登录状态，重跑整个页面
+                st.rerun()
 
             else:
                 st.error("密码错误")
                 return False
 
 
+@st.fragment
+@data_trace.page("home.enroll")
 def enroll():
 
     with st.form("doctor_registration_form"):
@@ -84,39 +105,53 @@ def enroll():
             elif password != confirm_password:
                 st.error("两次输入的密码不一致！")
             else:
-                # 准备用户数据（使用实际密码）
+                from my_model.db_sqlite import data_insert
+                from my_model.all_user import credential
                 user_data = {
                     "name": name,
                     "number": number,
                     "section": section,
-                    "password": password,  # 使用实际输入的密码
+                    # 只保存加盐哈希，不保存明文密码
+                    "password": credential.hash_password(password).result(),
                     "state": -1
                 }
-                conditions = {"name": name, "number": number}
-                exists = data_check.check_existence('doctor_info.db', 'doctor_info', conditions, match_all=False)
-                if exists.empty:
-                    # 插入数据（表不存在时会自动创建）
+                # 员工号由 doctor_info.number 的 UNIQUE 约束保证唯一，不先查询再插入，
+                # 同时提交的两个相同员工号的注册只有一个能成功（表结构由 migrations 建立）
+                try:
                     row_id = data_insert.insert_into_table('doctor_info.db', 'doctor_info', user_data)
-                    st.success(f'注册成功，您是我院第{row_id}员工，请登录')
-                else:
+                except sqlite3.IntegrityError:
                     st.warning("此账号已注册，若有疑问联系管理员")
+                else:
+                    st.success(f'注册成功，您是我院第{row_id}员工，请登录')
 
 
+@st.fragment
+@data_trace.page("home.find")
 def find():
-    doctor_info = data_get.get_data("doctor_info.db", "doctor_info")
-    name = st.text_input("请输入您的姓名：")
+    name = st.text_input("请输入您的姓名：", placeholder="支持部分姓名、错别字或拼音首字母，如 zs")
     if name:
-        df = doctor_info[doctor_info["name"] == name]
+        from my_model.db_sqlite import data_staff
+        from my_model.by_text import name_index
+        df = data_staff.directory("doctor_info.db").search(name)
         if df.empty:
             st.warning('这里没有您的信息，请联系人事部门要到员工号和所在部门，再在系统上注册')
         else:
+            # 姓名完全一致时只列出同名员工，否则列出按相关度排序的候选
+            exact = df[df["match"] == name_index.EXACT]
+            if not exact.empty:
+                df = exact
+            else:
+                st.caption("未找到完全一致的姓名，您要找的是不是：")
             if len(df) > 1:
-                number = st.selectbox('请选择您的员工号：', df['number'].values)
-                df = df[df["number"] == number]
+                labels = [f"{row.name}（{row.section}）" for row in df.itertuples(index=False)]
+                choice = st.selectbox('请选择：', range(len(df)), format_func=labels.__getitem__)
+                df = df.iloc[[choice]]
             info = df.iloc[0]
             st.info(f"员工{info['name']}，所属科室{info['section']}，员工号{info['number']}")
 
 
+@st.fragment
+@data_trace.page("home.change")
 def change():
     if "my_info" not in st.session_state:
         st.warning('用户请先登录')
@@ -126,13 +161,13 @@ def change():
             st.subheader("修改个人信息")
 
             # 姓名输入框
-            name = st.text_input("姓名", value=my_info["name"], key="name1")
+            name = st.text_input("姓名", value=my_info.name, key="name1")
 
             # 科室选择框
-            # 确保my_info["section"]存在于hospital_section.section中
+            # 确保my_info.section存在于hospital_section.section中
             section_index = 0
-            if my_info["section"] in hospital_basic.section:
-                section_index = hospital_basic.section.index(my_info["section"])
+            if my_info.section in hospital_basic.section:
+                section_index = hospital_basic.section.index(my_info.section)
 
             section = st.selectbox(
                 "科室",
@@ -141,7 +176,7 @@ def change():
                 key="section1"
             )
 
-            number = st.number_input("员工号", value=my_info['number'], min_value=1, step=1, format="%d", key="number1")
+            number = st.number_input("员工号", value=my_info.number, min_value=1, step=1, format="%d", key="number1")
 
             # 密码修改部分
             st.info("密码（留空表示不修改密码）")
@@ -159,6 +194,8 @@ def change():
                 elif password and password != confirm_password:
                     st.error("两次输入的密码不一致！")
                 else:
+                    from my_model.db_sqlite import data_update
+                    from my_model.all_user import credential
                     # 准备用户数据
                     user_data = {
                         "name": name,
@@ -168,11 +205,11 @@ def change():
 
                     # 只有在输入了新密码时才更新密码字段
                     if password:
-                        user_data["password"] = password
+                        user_data["password"] = credential.hash_password(password).result()
 
                     # 更新数据库
                     success = data_update.smart_update_record_by_id(
-                        "doctor_info.db", "doctor_info", int(my_info['id']), user_data
+                        "doctor_info.db", "doctor_info", my_info.id, user_data
                     )
 
                     if success:
@@ -1,8 +1,94 @@
 import streamlit as st
+from my_model.all_user.admin import administrator
+from my_model.db_sqlite import data_export, data_query, data_search, data_trace
 
+DATABASE = "doctor_info.db"
 
+
+def filters():
+    """筛选条件表单，条件变化时回到第一页"""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        department = st.selectbox("科室", [""] + data_query.distinct_values(DATABASE, "department"),
+                                  format_func=lambda x: x or "全部", key="forms_department")
+    with col2:
+        doctor = st.text_input("医生", key="forms_doctor").strip()
+    with col3:
+        risk_level = st.selectbox("风险等级", [""] + data_query.distinct_values(DATABASE, "risk_level"),
+                                  format_func=lambda x: x or "全部", key="forms_risk_level")
+
+    dates = st.date_input("日期范围", value=(), key="forms_dates")
+    date_from = dates[0] if len(dates) > 0 else None
+    date_to = dates[1] if len(dates) > 1 else date_from
+
+    conditions = {"department": department, "doctor": doctor, "risk_level": risk_level,
+                  "date_from": date_from, "date_to": date_to}
+    if st.session_state.get("forms_conditions") != conditions:
+        st.session_state["forms_conditions"] = conditions
+        st.session_state["forms_cursors"] = [None]
+    return conditions
+
+
+def browse(conditions):
+    """键集分页浏览，forms_cursors 保存每一页的起始游标"""
+    cursors = st.session_state.setdefault("forms_cursors", [None])
+    df, next_cursor = data_query.query_forms(DATABASE, after=cursors[-1], **conditions)
+
+    st.dataframe(df, hide_index=True, use_container_width=True)
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        if st.button("上一页", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button("下一页", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
+    with col3:
+        st.caption(f"第 {len(cursors)} 页，本页 {len(df)} 条")
+
+
+def search(text, conditions):
+    """全文检索结果，按相关度排序并高亮命中的关键词"""
+    df = data_search.search_forms(DATABASE, text, **conditions)
+    if df.empty:
+        st.info("没有找到匹配的记录")
+        return
+
+    st.caption(f"显示相关度最高的前 {len(df)} 条（在最近的 {data_search.RANK_WINDOW} 条命中记录中排序）")
+    for row in df.itertuples(index=False):
+        with st.container(border=True):
+            st.markdown(f"**{row.index_id}** · {row.date} · {row.department} · {row.doctor} · {row.patient_name}")
+            st.markdown(row.snippet)
+
+
+def export(conditions):
+    """按当前筛选条件导出全部记录，点击生成时才分块写入临时文件"""
+    with st.expander("导出当前筛选结果"):
+        fmt = st.selectbox("格式", data_export.available_formats(), key="forms_export_format")
+        suffix, mime, _ = data_export.FORMATS[fmt]
+        if st.button("生成导出文件", key="forms_export"):
+            with data_export.open_export(DATABASE, data_query.FORM_TABLE, fmt, **conditions) as (f, result):
+                st.download_button(f"下载（{result['rows']} 条）", f, file_name=f"doctor_forms{suffix}", mime=mime,
+                                   on_click="ignore")
+
+
+@data_trace.page('page01')
 def main():
-    st.write('你好')
+    if not administrator(1, 1):
+        st.warning('请您先登录')
+        return
+
+    st.subheader("沟通信息记录")
+    text = st.text_input("全文检索", placeholder="输入诊断、手术、意见或风险告知中的关键词，多个关键词用空格分隔",
+                         key="forms_search").strip()
+    conditions = filters()
+    if text:
+        search(text, conditions)
+    else:
+        browse(conditions)
+    export(conditions)
 
 
 if __name__ == '__main__':
@@ -1,6 +1,8 @@
 import streamlit as st
+from my_model.db_sqlite import data_trace
 
 
+@data_trace.page('page03')
 def main():
     st.write('你好')
 
@@ -1,12 +1,17 @@
 import streamlit as st
-from my_page.page99 import tab1_see, tab2_open, tab3_state, tab4_audit
+from my_model.db_sqlite import data_trace
+from my_page.page99 import (tab1_see, tab2_open, tab3_state, tab4_audit, tab5_import, tab6_backup,
+                             tab7_trace)
 
 
+@data_trace.page('page99')
 def main():
     if 'my_info' in st.session_state:
         my_info = st.session_state.my_info
-        if my_info['name'] == '闫方涛':
-            tab1, tab2, tab3, tab4 = st.tabs(['管理看板', '页面控制', '状态修改', '准入审核'])
+        if my_info.name == '闫方涛':
+            tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+                ['管理看板', '页面控制', '状态修改', '准入审核', '名单管理', '数据备份', '查询追踪']
+            )
             with tab1:
                 st.title("📄 管理看板")
                 tab1_see.main()
@@ -19,6 +24,15 @@ def main():
             with tab4:
                 st.title("📄 准入审核")
                 tab4_audit.main()
+            with tab5:
+                st.title("📄 名单管理")
+                tab5_import.main()
+            with tab6:
+                st.title("📄 数据备份")
+                tab6_backup.main()
+            with tab7:
+                st.title("📄 查询追踪")
+                tab7_trace.main()
         else:
             st.warning('您不是系统管理员')
     else:
@@ -1,8 +1,47 @@
+import pandas as pd
 import streamlit as st
+from my_model.all_user import permission
+from my_model.by_file import page_config
+from my_model.db_sqlite import data_stats
+
+DATABASE = "doctor_info.db"
+
+
+def staff():
+    summary = data_stats.staff_summary(DATABASE)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("员工总数", summary["total"])
+    col2.metric("已激活", summary["active"])
+    col3.metric("待审核", summary["pending"])
+
+    st.subheader("各页面管理员人数")
+    names = page_config.page_names()
+    n = len(names)
+    st.dataframe(pd.DataFrame({
+        "页面": names,
+        "管理员人数": [summary["bits"].get(permission.bit(i, n).bit_length() - 1, 0) for i in range(1, n + 1)],
+    }), hide_index=True)
+
+    st.subheader("各科室员工人数")
+    sections = pd.Series(summary["sections"], name="人数").sort_values(ascending=False)
+    st.bar_chart(sections, horizontal=True, height=max(300, 18 * len(sections)))
+
+
+def forms():
+    st.subheader("沟通记录（按科室、日期）")
+    days = st.selectbox("时间范围", [7, 30, 90], index=1, format_func=lambda d: f"最近 {d} 天", key="see_days")
+    daily = data_stats.daily_counts(DATABASE, "forms_day", days)
+    if daily.empty:
+        st.info("该时间范围内没有沟通记录")
+        return
+    st.metric(f"最近 {days} 天记录数", int(daily["value"].sum()))
+    table = daily.pivot_table(index="day", columns="key", values="value", aggfunc="sum", fill_value=0)
+    st.bar_chart(table, stack=True)
 
 
 def main():
-    st.info('此处为管理员看板')
+    staff()
+    forms()
 
 
 if __name__ == '__main__':
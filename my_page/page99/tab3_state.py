@@ -1,36 +1,39 @@
 import time
 
 import streamlit as st
-from my_model.db_sqlite import data_check, data_update
-from my_model.by_text import advance_transform
-from my_data.user_data import pages_json
+from my_model.db_sqlite import data_update, data_staff
+from my_model.all_user import permission
+from my_model.by_file import page_config
 
 
 def update_state(doctor_id, doctor_state):
-    function = [page['name'] for page in pages_json.DEFAULT_PAGES]
-    str_state1 = advance_transform.base_converter(str(doctor_state), 10, 2)
-    box = {'普通用户': '0', '管理员': '1'}
+    if int(doctor_state) < 0:
+        st.warning('该员工尚未通过准入审核，请先在准入审核中激活')
+        return
+
+    function = page_config.page_names()
+    admins = permission.to_list(doctor_state)
+    box = {'普通用户': False, '管理员': True}
 
     with st.form(key='update_state'):
-        # 创建一个列表来存储新的状态值
-        new_states = ''
+        # 创建一个列表来存储新的权限值
+        new_admins = []
 
-        for i in range(len(str_state1)):
+        for i, admin in enumerate(admins):
             # 为每个选择框创建唯一键
             key = f"state_{i}"  # 添加索引确保唯一性
             # 获取当前选择框的值
             selected = st.selectbox(
                 f"{function[i]}",
                 box,
-                index=list(box.values()).index(str_state1[i]),
+                index=list(box.values()).index(admin),
                 key=key
             )
-            new_states = new_states + box[selected]  # 取消注释这行来收集选择的值
+            new_admins.append(box[selected])
 
         # 表单提交按钮
         if st.form_submit_button('点击更新状态数据'):
-            str_state2 = advance_transform.base_converter(new_states, 2, 10)
-            condition = {'state': int(str_state2)}
+            condition = {'state': permission.from_list(new_admins)}
             success = data_update.smart_update_record_by_id('doctor_info.db', 'doctor_info', int(doctor_id), condition)
             if success:
                 st.success('更新数据成功')
@@ -51,8 +54,10 @@ def get_data():
 
             # 验证是否为5位数字
             if len(number_str) == 5:
-                conditions = {"number": number}
-                doctor_info = data_check.check_existence('doctor_info.db', 'doctor_info', conditions).iloc[0]
+                doctor_info = data_staff.directory('doctor_info.db').by_number(number)
+                if doctor_info is None:
+                    st.error("员工号不存在")
+                    return
                 doctor_state = doctor_info['state']
                 doctor_id = doctor_info['id']
 
@@ -1,12 +1,11 @@
 import time
 
 import streamlit as st
-from my_model.db_sqlite import data_get, data_update, data_delete
+from my_model.db_sqlite import data_update, data_delete, data_staff
 
 
 def get_data(num):
-    data = data_get.get_data('doctor_info.db', 'doctor_info')
-    my_data = data[data['state'] <= num]
+    my_data = data_staff.directory('doctor_info.db').with_state_at_most(num)
     return my_data
 
 
@@ -19,28 +18,26 @@ def update_data(my_data):
     col1, col2 = st.columns(2)
     with col1:
         if st.button('点击激活新注册人员'):
+            # 所有选中人员在一个事务中批量激活
+            results = data_update.update_many(
+                'doctor_info.db', 'doctor_info', [my_dict[i] for i in my_list], {"state": 0}
+            )
             for i in my_list:
-                # 更新数据示例
-                data = {
-                    "state": 0,  # 存在的列 - 更新数据
-                }
-
-                success = data_update.smart_update_record_by_id('doctor_info.db', 'doctor_info', my_dict[i], data)
-                if success:
+                if results[my_dict[i]]:
                     st.success(f'已激活新注册人员：{i}')
                 else:
-                    st.error("记录更新失败")
+                    st.error(f"记录更新失败：{i}")
             time.sleep(2)
             st.rerun()
     with col2:
         if st.button('点击删除待审核人员'):
+            # 所有选中人员在一个事务中批量删除
+            results = data_delete.delete_many('doctor_info.db', 'doctor_info', [my_dict[i] for i in my_list])
             for i in my_list:
-
-                success = data_delete.delete_data('doctor_info.db', 'doctor_info', my_dict[i])
-                if success:
+                if results[my_dict[i]]:
                     st.success(f'已删除待审核人员：{i}')
                 else:
-                    st.error("记录删除失败")
+                    st.error(f"记录删除失败：{i}")
             time.sleep(2)
             st.rerun()
 
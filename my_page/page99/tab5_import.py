@@ -0,0 +1,80 @@
+import sqlite3
+
+import streamlit as st
+from my_data.user_data import hospital_basic
+from my_model.db_sqlite import data_export, data_import
+
+
+def show_result(result):
+    counts = result["counts"]
+    cols = st.columns(4)
+    for col, status in zip(cols, (data_import.INSERTED, data_import.UPDATED, data_import.UNCHANGED, data_import.INVALID)):
+        col.metric(status, counts.get(status, 0))
+    st.caption(f"共 {result['rows']} 行，耗时 {result['seconds']:.2f} 秒（{result['rows_per_second']:.0f} 行/秒）")
+
+    report = result["report"]
+    only_problems = st.checkbox("只显示错误和更新的行", value=True)
+    if only_problems:
+        report = report[report["status"].isin([data_import.INVALID, data_import.UPDATED])]
+    st.dataframe(report, hide_index=True)
+    st.download_button(
+        "下载逐行报告", result["report"].to_csv(index=False).encode("utf-8-sig"),
+        file_name="import_report.csv", mime="text/csv",
+    )
+
+
+def export():
+    """导出员工名单（不含密码），可按科室筛选"""
+    with st.expander("导出员工名单"):
+        section = st.selectbox("科室", [""] + hospital_basic.section, format_func=lambda x: x or "全部",
+                               key="staff_export_section")
+        fmt = st.selectbox("格式", data_export.available_formats(), key="staff_export_format")
+        suffix, mime, _ = data_export.FORMATS[fmt]
+        if st.button("生成导出文件", key="staff_export"):
+            with data_export.open_export("doctor_info.db", "doctor_info", fmt, section=section) as (f, result):
+                st.download_button(f"下载（{result['rows']} 人）", f, file_name=f"doctor_info{suffix}", mime=mime,
+                                   on_click="ignore")
+
+
+def main():
+    export()
+    st.info("上传人事花名册（CSV 或 XLSX），需包含 员工号、姓名、科室 列，可选 密码 列；"
+            "已有员工按员工号更新姓名和科室，新员工直接激活，未提供密码时初始密码为 1")
+    uploaded = st.file_uploader("选择花名册文件", type=["csv", "xlsx"])
+    if uploaded is None:
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        preview = st.button("校验预览（不写入）")
+    with col2:
+        submit = st.button("开始导入")
+
+    if preview or submit:
+        status = st.empty()
+        try:
+            uploaded.seek(0)
+            result = data_import.import_roster(
+                "doctor_info.db", uploaded, dry_run=preview,
+                progress=lambda done: status.caption(f"已处理 {done} 行…"),
+            )
+        except (ValueError, ImportError) as e:
+            status.empty()
+            st.error(f"导入失败：{e}")
+            return
+        except sqlite3.Error as e:
+            # 每块在单独的事务中写入，出错的块已回滚，之前的块已写入；按员工号导入，可直接重新导入
+            status.empty()
+            st.error(f"写入数据库失败：{e}。出错前已处理的行已写入，可修正后重新导入")
+            return
+        status.empty()
+        st.session_state["import_result"] = result
+        if submit:
+            st.success("导入完成")
+
+    if "import_result" in st.session_state:
+        show_result(st.session_state["import_result"])
+
+
+if __name__ == '__main__':
+    main()
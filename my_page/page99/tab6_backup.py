@@ -0,0 +1,77 @@
+import time
+
+import pandas as pd
+import streamlit as st
+from my_model.db_sqlite import data_backup
+
+DATABASE = "doctor_info.db"
+
+
+def status():
+    scheduler = data_backup.get_scheduler(DATABASE)
+    if scheduler is None:
+        st.warning("定时备份未启动")
+        return
+    next_run = time.strftime("%Y-%m-%d %H:%M", time.localtime(scheduler.next_run))
+    st.caption(f"每 {scheduler.interval / 3600:g} 小时自动备份一次，保留最近 {scheduler.keep} 份，下次备份：{next_run}")
+    last = scheduler.last
+    if last is None:
+        return
+    if "error" in last:
+        st.error(f"最近一次备份失败（{last['finished']:%Y-%m-%d %H:%M}）：{last['error']}")
+    else:
+        st.caption(f"最近一次备份：{last['finished']:%Y-%m-%d %H:%M}，{last['size'] / 1e6:.1f} MB，"
+                   f"耗时 {last['seconds']:.2f} 秒，单步最长持锁 {last['max_step_ms']:.1f} ms，"
+                   f"完整性校验 {last['integrity']}")
+
+
+def backup_now():
+    if st.button("立即备份"):
+        scheduler = data_backup.get_scheduler(DATABASE)
+        if scheduler is not None:
+            result = scheduler.run_now()
+        else:
+            try:
+                result = data_backup.backup(DATABASE)
+                data_backup.rotate(DATABASE)
+            except Exception as e:
+                result = {"error": str(e)}
+        if "error" in result:
+            st.error(f"备份失败：{result['error']}")
+        else:
+            st.success(f"已备份：{result['path']}")
+
+
+def restore(snapshots):
+    names = [snapshot["name"] for snapshot in snapshots]
+    name = st.selectbox("选择要恢复的快照", names)
+    confirm = st.checkbox("我已确认：当前数据将被该快照覆盖（恢复前会自动备份当前数据）")
+    if st.button("从快照恢复", disabled=not confirm):
+        snapshot = snapshots[names.index(name)]
+        try:
+            result = data_backup.restore(DATABASE, snapshot["path"])
+        except Exception as e:
+            st.error(f"恢复失败：{e}")
+            return
+        st.success(f"已从 {name} 恢复，恢复前的数据已备份为 {result['safety_backup']}")
+        time.sleep(2)
+        st.rerun()
+
+
+def main():
+    status()
+    backup_now()
+
+    snapshots = data_backup.list_snapshots(DATABASE)
+    if not snapshots:
+        st.info("还没有快照")
+        return
+    st.dataframe(pd.DataFrame([
+        {"快照": snapshot["name"], "时间": snapshot["created"], "大小(MB)": round(snapshot["size"] / 1e6, 2)}
+        for snapshot in snapshots
+    ]), hide_index=True)
+    restore(snapshots)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import time
+
+import pandas as pd
+import streamlit as st
+from my_model.db_sqlite import data_trace
+
+
+def settings():
+    on = st.toggle("开启查询追踪", value=data_trace.enabled(),
+                   help="开启后记录每次页面重跑执行的查询，对所有用户生效；排查完毕后请关闭")
+    slow_ms = st.number_input("慢查询阈值（毫秒，0 表示记录全部）", min_value=0.0, value=float(data_trace.SLOW_MS), step=10.0)
+    if on:
+        data_trace.enable(slow_ms)
+    else:
+        data_trace.disable()
+    if st.button("清空记录"):
+        data_trace.clear()
+
+
+def queries_frame(queries) -> pd.DataFrame:
+    return pd.DataFrame([
+        {"辅助函数": query["helper"], "SQL": query["sql"], "参数": query["params"], "行数": query["rows"],
+         "耗时(ms)": round(query["ms"], 2), "错误": query["error"]}
+        for query in queries
+    ])
+
+
+def spans():
+    st.subheader("最近的页面重跑")
+    records = data_trace.spans()
+    if not records:
+        st.info("暂无记录" if data_trace.enabled() else "查询追踪未开启")
+        return
+    st.dataframe(pd.DataFrame([
+        {"页面": summary["name"], "时间": time.strftime("%H:%M:%S", time.localtime(summary["started"])),
+         "总耗时(ms)": round(summary["ms"] or 0, 1), "查询数": summary["queries"],
+         "SQL耗时(ms)": round(summary["sql_ms"], 1), "行数": summary["rows"]}
+        for summary in (span.summary() for span in records)
+    ]), hide_index=True)
+    for span in records[:10]:
+        summary = span.summary()
+        started = time.strftime("%H:%M:%S", time.localtime(summary["started"]))
+        with st.expander(f"{span.name} {started}：{summary['queries']} 条查询，{summary['sql_ms']:.1f} ms"):
+            if span.calls:
+                st.dataframe(pd.DataFrame([
+                    {"辅助函数": name, "调用次数": count, "耗时(ms)": round(ms, 2)}
+                    for name, (count, ms) in sorted(span.calls.items(), key=lambda item: -item[1][1])
+                ]), hide_index=True)
+            if span.queries:
+                st.dataframe(queries_frame(span.queries), hide_index=True)
+            if span.dropped:
+                st.caption(f"另有 {span.dropped} 条查询超出记录上限，未列出")
+
+
+def slow_queries():
+    st.subheader(f"慢查询（≥ {data_trace.SLOW_MS:g} ms，保留最近 {data_trace.SLOW_LOG_SIZE} 条）")
+    records = data_trace.slow_queries()
+    if not records:
+        st.info("暂无慢查询")
+        return
+    for query in records:
+        logged = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(query["logged"]))
+        with st.expander(f"{query['ms']:.1f} ms  {query['page']} / {query['helper']}  {logged}"):
+            st.code(query["sql"], language="sql")
+            st.caption(f"参数：{query['params'] or '无'}，行数：{query['rows']}")
+            if query["error"]:
+                st.error(query["error"])
+            if query["plan"]:
+                st.code("\n".join(query["plan"]), language="text")
+
+
+def main():
+    settings()
+    spans()
+    slow_queries()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import importlib
+
+import streamlit as st
+from my_model.all_user.admin import administrator
+from my_model.by_file import page_config
+
+# 页面由 pages_config.json 在内存中生成（st.navigation + st.Page），不再依赖 pages 目录下的文件：
+# 启用、禁用页面只改配置，不触发 Streamlit 对页面目录的重新扫描和文件监听重载。
+HOME_TITLE = "首页"
+HOME_ICON = "🏥"
+
+
+def _file_parts(page) -> tuple:
+    """页面文件名拆分为 (编号, 图标, 名称)，例如 01_🌱_强化沟通信息记录.py -> ("01", "🌱", "强化沟通信息记录")"""
+    stem = page["file"].removesuffix(".py")
+    parts = stem.split("_", 2)
+    if len(parts) == 3:
+        return tuple(parts)
+    return parts[0], None, stem
+
+
+def module_name(page) -> str:
+    """页面对应的模块，例如 my_page.page01.main"""
+    return f"my_page.page{_file_parts(page)[0]}.main"
+
+
+def url_path(page) -> str:
+    """页面的 URL 路径，与原 pages 目录下同名文件生成的路径一致"""
+    return _file_parts(page)[2]
+
+
+def _loader(module):
+    """返回页面入口：首次访问时才导入页面模块，之后直接使用已导入的模块"""
+    def run():
+        try:
+            main = importlib.import_module(module).main
+        except (ImportError, AttributeError) as e:
+            st.error(f"页面加载失败: {module}")
+            print(f"页面加载失败: {module}: {e}")
+            return
+        main()
+    return run
+
+
+def visible_pages() -> list:
+    """
+    当前用户可以访问的页面配置（已启用且满足 access 权限），附带页面序号 ordinal
+
+    序号按配置中的顺序从 1 开始（包括已禁用的页面），与 doctor_info.state 的权限位对应。
+    """
+    result = []
+    for ordinal, page in enumerate(page_config.load_pages(), 1):
+        if page["enabled"] and administrator(ordinal, page["access"]):
+            page["ordinal"] = ordinal
+            result.append(page)
+    return result
+
+
+def make_page(page):
+    """由页面配置生成 st.Page，页面模块在首次访问时才导入"""
+    return st.Page(_loader(module_name(page)), title=page["name"], icon=_file_parts(page)[1], url_path=url_path(page))
+
+
+def navigation(home):
+    """
+    按页面配置和当前用户的权限生成导航，返回 st.navigation 选中的页面（调用 run() 执行）
+
+    参数:
+        home: 首页函数
+    """
+    pages = [st.Page(home, title=HOME_TITLE, icon=HOME_ICON, default=True)]
+    pages += [make_page(page) for page in visible_pages()]
+    return st.navigation(pages)
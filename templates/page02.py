@@ -1,5 +0,0 @@
-import streamlit as st
-from my_page.page02.main import main
-
-if __name__ == '__main__':
-    main()
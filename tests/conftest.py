@@ -0,0 +1,11 @@
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def shipped_db():
+    """仓库中 doctor_info.db 的路径，测试只能使用它的副本"""
+    return os.path.join(ROOT, "doctor_info.db")
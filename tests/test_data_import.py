@@ -0,0 +1,77 @@
+import io
+import shutil
+import sqlite3
+
+import pytest
+
+from my_data.user_data import hospital_basic
+from my_model.all_user import credential
+from my_model.db_sqlite import data_connect, data_import, data_writer
+
+SECTION = hospital_basic.section[0]
+
+
+@pytest.fixture
+def database(tmp_path, shipped_db):
+    """仓库中 doctor_info.db 的副本"""
+    path = str(tmp_path / "doctor_info.db")
+    shutil.copyfile(shipped_db, path)
+    yield path
+    data_writer.stop_all()
+    data_connect.close_all()
+
+
+def _existing_number(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT number FROM doctor_info ORDER BY number LIMIT 1").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _roster(*lines):
+    source = io.StringIO("\n".join(["员工号,姓名,科室,密码", *lines]) + "\n")
+    source.name = "roster.csv"
+    return source
+
+
+def _statuses(result):
+    return dict(zip(result["report"]["number"].astype(str), result["report"]["status"]))
+
+
+def test_non_numeric_password_is_rejected(database):
+    result = data_import.import_roster(database, _roster(f"99901,张三,{SECTION},abc", f"99902,李四,{SECTION},123"))
+
+    assert _statuses(result) == {"99901": data_import.INVALID, "99902": data_import.INSERTED}
+    message = result["report"].set_index("row").loc[2, "message"]
+    assert message == "密码必须为数字"
+    with data_connect.connection(database) as conn:
+        stored = conn.execute("SELECT password FROM doctor_info WHERE number = 99902").fetchone()[0]
+        assert conn.execute("SELECT count(*) FROM doctor_info WHERE number = 99901").fetchone()[0] == 0
+    assert credential.check("123", stored)
+
+
+def test_only_new_staff_are_hashed(database, monkeypatch):
+    hashed = []
+    hash_password = credential.hash_password
+    monkeypatch.setattr(credential, "hash_password",
+                        lambda password: hashed.append(password) or hash_password(password))
+    number = _existing_number(database)
+
+    source = _roster(f"{number},改名,{SECTION},111", f"99903,王五,{SECTION},222")
+    result = data_import.import_roster(database, source)
+
+    assert _statuses(result) == {str(number): data_import.UPDATED, "99903": data_import.INSERTED}
+    assert hashed == ["222"]
+
+
+def test_dry_run_does_not_use_writer(database, monkeypatch):
+    def run(*args):
+        raise AssertionError("dry_run 不应进入写线程")
+
+    monkeypatch.setattr(data_writer, "run", run)
+    result = data_import.import_roster(database, _roster(f"99904,赵六,{SECTION},"), dry_run=True)
+
+    assert _statuses(result) == {"99904": data_import.INSERTED}
+    with data_connect.connection(database) as conn:
+        assert conn.execute("SELECT count(*) FROM doctor_info WHERE number = 99904").fetchone()[0] == 0
@@ -0,0 +1,40 @@
+import shutil
+
+import pytest
+
+from my_model.db_sqlite import data_connect, data_delete, data_insert, data_search, data_update, data_writer
+
+
+@pytest.fixture
+def database(tmp_path, shipped_db):
+    """仓库中 doctor_info.db 的副本"""
+    path = str(tmp_path / "doctor_info.db")
+    shutil.copyfile(shipped_db, path)
+    yield path
+    data_writer.stop_all()
+    data_connect.close_all()
+
+
+def _ids(database, text):
+    return set(data_search.search_forms(database, text, limit=1000)["id"])
+
+
+def test_short_terms_follow_writes(database):
+    row_id, _ = data_insert.insert_form(database, {"patient_name": "测试", "diagnosis": "疑似癫痫发作"})
+    assert row_id in _ids(database, "癫痫")
+
+    assert data_update.smart_update_record_by_id(database, "doctor_forms", row_id, {"diagnosis": "缺铁性贫血"})
+    assert row_id not in _ids(database, "癫痫")
+    assert row_id in _ids(database, "贫血")
+
+    assert data_update.update_many(database, "doctor_forms", [row_id], {"surgery": "肋骨骨折内固定术"})[row_id]
+    assert row_id in _ids(database, "贫血 骨折")
+
+    assert data_delete.delete_data(database, "doctor_forms", row_id)
+    assert row_id not in _ids(database, "贫血")
+
+
+def test_overlapping_terms_are_marked_once():
+    assert data_search._mark_terms("左侧骨折术后", ["骨", "折"]) == "左侧**骨折**术后"
+    assert data_search._mark_terms("手术术后", ["手术", "术后"]) == "**手术术后**"
+    assert data_search._mark_terms("无命中", ["骨折"]) == "无命中"
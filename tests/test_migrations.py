@@ -0,0 +1,84 @@
+import shutil
+import sqlite3
+
+import pytest
+
+from my_model.all_user import permission
+from my_model.db_sqlite.migrations import runner
+
+LATEST = runner.load_migrations()[-1][0]
+
+
+@pytest.fixture
+def shipped(tmp_path, shipped_db):
+    """仓库中 doctor_info.db 的副本"""
+    path = tmp_path / "doctor_info.db"
+    shutil.copyfile(shipped_db, path)
+    conn = sqlite3.connect(path, isolation_level=None)
+    yield conn
+    conn.close()
+
+
+def _count(conn, table):
+    return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+def _objects(conn):
+    return {name for (name,) in conn.execute("SELECT name FROM sqlite_master")}
+
+
+def test_migrate_shipped_database(shipped):
+    before = {table: _count(shipped, table) for table in ("doctor_info", "doctor_forms", "doctor_model")}
+
+    assert runner.migrate(shipped) == LATEST
+    assert runner.get_version(shipped) == LATEST
+
+    # 迁移不改变已有数据
+    assert {table: _count(shipped, table) for table in before} == before
+    assert shipped.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+    assert {"idx_doctor_info_name", "idx_doctor_forms_date", "doctor_forms_fts", "sequences",
+            "stat_counts", "doctor_info_stat_insert", "doctor_forms_chars"} <= _objects(shipped)
+    assert _count(shipped, "doctor_forms_fts") == before["doctor_forms"]
+    assert _count(shipped, "doctor_forms_chars") == before["doctor_forms"]
+
+
+def test_schema_has_no_app_functions(shipped):
+    runner.migrate(shipped)
+    # 触发器中不能调用应用注册的函数：普通连接也要能写入 doctor_forms
+    triggers = [sql for (sql,) in shipped.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger'")]
+    assert not any("fts_chars" in sql for sql in triggers)
+
+    plain = sqlite3.connect(shipped.execute("PRAGMA database_list").fetchone()[2], isolation_level=None)
+    try:
+        row_id = plain.execute("INSERT INTO doctor_forms (diagnosis) VALUES ('骨折')").lastrowid
+        plain.execute("UPDATE doctor_forms SET diagnosis = '贫血' WHERE id = ?", (row_id,))
+        plain.execute("DELETE FROM doctor_forms WHERE id = ?", (row_id,))
+    finally:
+        plain.close()
+
+
+def test_migrate_is_idempotent(shipped):
+    runner.migrate(shipped)
+    objects = _objects(shipped)
+    assert runner.migrate(shipped) == LATEST
+    assert _objects(shipped) == objects
+
+
+def test_stat_counts_match_data(shipped):
+    runner.migrate(shipped)
+    counts = dict(shipped.execute("SELECT key, value FROM stat_counts WHERE metric = 'staff_state'"))
+    pending, active = shipped.execute("SELECT sum(state < 0), sum(state >= 0) FROM doctor_info").fetchone()
+    assert counts.get("pending", 0) == pending
+    assert counts.get("active", 0) == active
+
+    bits = {int(key): value for key, value in
+            shipped.execute("SELECT key, value FROM stat_counts WHERE metric = 'state_bit'")}
+    states = [state for (state,) in shipped.execute("SELECT state FROM doctor_info")]
+    for ordinal in range(1, permission.width() + 1):
+        position = permission.bit(ordinal).bit_length() - 1
+        assert bits.get(position, 0) == int(permission.admins_mask(states, ordinal).sum())
+
+    # 触发器随写入维护计数
+    shipped.execute("UPDATE doctor_info SET state = -1 WHERE number = (SELECT min(number) FROM doctor_info)")
+    counts = dict(shipped.execute("SELECT key, value FROM stat_counts WHERE metric = 'staff_state'"))
+    assert counts["pending"] == pending + 1
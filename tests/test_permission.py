@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from my_model.all_user import permission
+
+WIDTH = permission.width()
+PENDING = -1
+
+
+def test_width_matches_pinned_pages():
+    assert WIDTH == 5
+
+
+def test_bit_is_msb_first():
+    assert permission.bit(1) == 0b10000
+    assert permission.bit(WIDTH) == 0b00001
+    assert [permission.bit(i) for i in range(1, WIDTH + 1)] == [16, 8, 4, 2, 1]
+
+
+@pytest.mark.parametrize("ordinal", [0, WIDTH + 1, -1])
+def test_bit_out_of_range(ordinal):
+    with pytest.raises(ValueError):
+        permission.bit(ordinal)
+
+
+def test_has():
+    # 17 = 0b10001：第 1 个和第 5 个页面的管理员
+    assert [permission.has(17, i) for i in range(1, WIDTH + 1)] == [True, False, False, False, True]
+    assert not any(permission.has(0, i) for i in range(1, WIDTH + 1))
+
+
+def test_pending_has_no_rights():
+    assert not any(permission.has(PENDING, i) for i in range(1, WIDTH + 1))
+    assert permission.to_list(PENDING) == [False] * WIDTH
+    assert permission.flags(PENDING) == permission.Page(0)
+
+
+@pytest.mark.parametrize("state", range(1 << WIDTH))
+def test_list_round_trip(state):
+    admins = permission.to_list(state)
+    assert admins == [permission.has(state, i) for i in range(1, WIDTH + 1)]
+    assert permission.from_list(admins) == state
+
+
+def test_flags():
+    assert permission.flags(17) == permission.Page.PAGE01 | permission.Page.PAGE99
+    assert int(permission.flags((1 << WIDTH) - 1)) == (1 << WIDTH) - 1
+
+
+def test_admins_mask_matches_has():
+    states = [PENDING, 0, 1, 16, 17, 30, 31]
+    for ordinal in range(1, WIDTH + 1):
+        expected = [permission.has(state, ordinal) for state in states]
+        assert permission.admins_mask(states, ordinal).tolist() == expected
+        assert permission.admins_mask(pd.Series(states), ordinal).tolist() == expected
+
+
+def test_admins_of():
+    staff = pd.DataFrame({"name": ["甲", "乙", "丙", "丁"], "state": [PENDING, 16, 17, 1]})
+    assert permission.admins_of(staff, 1)["name"].tolist() == ["乙", "丙"]
+    assert permission.admins_of(staff, WIDTH)["name"].tolist() == ["丙", "丁"]